@@ -0,0 +1,85 @@
+"""Parse time per 10k VMs for each xlsx reader engine.
+
+Scales sample_rvtools.xlsx up by repeating its vInfo/vPartition rows (with
+unique VM names) and hosts, then times parse_rvtools with every installed
+engine in both DataFrame and streaming mode.
+
+    python -m benchmarks.bench_reader --vms 10000 50000
+"""
+import argparse
+import os
+import tempfile
+import time
+from itertools import cycle, islice
+
+from openpyxl import Workbook, load_workbook
+
+from parser.reader import available_engines
+from parser.rvtools import parse_rvtools
+
+SAMPLE_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'sample_rvtools.xlsx')
+
+
+def scale_sample(n_vms, out_path, sample_path=SAMPLE_PATH):
+    """Write an RVTools workbook with n_vms VMs built by repeating the sample rows."""
+    src = load_workbook(sample_path, read_only=True)
+    sheets = {name: list(src[name].iter_rows(values_only=True)) for name in src.sheetnames}
+    src.close()
+
+    vm_per_host = max(1, (len(sheets['vInfo']) - 1) // max(len(sheets['vHost']) - 1, 1))
+    targets = {'vInfo': n_vms, 'vPartition': n_vms,
+               'vHost': max(n_vms // vm_per_host, 1), 'vCluster': len(sheets['vCluster']) - 1}
+
+    wb = Workbook(write_only=True)
+    for name, rows in sheets.items():
+        ws = wb.create_sheet(name)
+        header, body = rows[0], rows[1:]
+        ws.append(header)
+        for i, row in enumerate(islice(cycle(body), targets.get(name, len(body)))):
+            row = list(row)
+            # First column is the VM / host name — keep it unique
+            if name != 'vCluster' and i >= len(body):
+                row[0] = f"{row[0]}-{i // len(body)}"
+            ws.append(row)
+    wb.save(out_path)
+    return out_path
+
+
+def run(sizes, repeat=1):
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for n_vms in sizes:
+            path = scale_sample(n_vms, os.path.join(tmp, f"rvtools_{n_vms}.xlsx"))
+            for engine in available_engines():
+                for streaming in (False, True):
+                    best = None
+                    for _ in range(repeat):
+                        start = time.perf_counter()
+                        parsed = parse_rvtools(path, streaming=streaming, engine=engine)
+                        elapsed = time.perf_counter() - start
+                        best = elapsed if best is None else min(best, elapsed)
+                    if 'error' in parsed:
+                        raise RuntimeError(parsed['error'])
+                    results.append({
+                        'vms': n_vms,
+                        'engine': engine,
+                        'mode': 'streaming' if streaming else 'dataframe',
+                        'seconds': round(best, 3),
+                        'seconds_per_10k_vms': round(best / n_vms * 10000, 3),
+                    })
+    return results
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument('--vms', type=int, nargs='+', default=[10000, 50000])
+    ap.add_argument('--repeat', type=int, default=1)
+    args = ap.parse_args()
+
+    print(f"{'VMs':>8}  {'engine':<10} {'mode':<10} {'seconds':>9} {'s / 10k VMs':>12}")
+    for r in run(args.vms, args.repeat):
+        print(f"{r['vms']:>8}  {r['engine']:<10} {r['mode']:<10} {r['seconds']:>9} {r['seconds_per_10k_vms']:>12}")
+
+
+if __name__ == '__main__':
+    main()
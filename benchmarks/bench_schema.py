@@ -0,0 +1,100 @@
+"""How parser.schema.load_table reads a wide sheet, before and after.
+
+Writes a LiveOptics VMs sheet padded with unused columns, as real exports
+carry 80+. For every installed engine it then times three ways of loading
+the VMs table:
+- a full-sheet parse
+- a header-only read followed by a parse with usecols limited to the
+  matched columns (the earlier load_table)
+- load_table as it is now, which reads once and keeps the matched columns
+
+Peak memory counts traced Python allocations only. It covers the
+DataFrames built, but not calamine's own Rust-side buffers.
+
+    python -m benchmarks.bench_schema --vms 10000 --extra 70
+"""
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+
+from openpyxl import Workbook
+
+from benchmarks.synthetic import generate_estate, write_liveoptics
+from parser.reader import available_engines, open_excel
+from parser.schema import LIVEOPTICS_SCHEMA, load_table, resolve_column, resolve_sheet
+
+
+def widen(path, out_path, extra):
+    """Copy a LiveOptics workbook's VMs sheet with extra filler columns appended."""
+    xl = open_excel(path)
+    vms = xl.parse('VMs')
+    for i in range(extra):
+        vms[f"Unused Metric {i + 1:02d}"] = (vms.index % 97) * 1.5 if i % 2 else 'n/a'
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet('VMs')
+    ws.append(list(vms.columns))
+    for row in vms.itertuples(index=False):
+        ws.append(list(row))
+    wb.save(out_path)
+    return out_path
+
+
+def header_then_usecols(xl, table='vms', schema=LIVEOPTICS_SCHEMA):
+    """The earlier load_table read: header row first, then only the matched columns."""
+    spec = schema[table]
+    sheet = resolve_sheet(xl.sheet_names, spec['sheets'])
+    header_row = list(xl.parse(sheet, nrows=0).columns)
+    matched = [resolve_column(header_row, c['aliases']) for c in spec['columns'].values()]
+    usecols = list(dict.fromkeys([header_row[0]] + [h for h in matched if h is not None]))
+    return xl.parse(sheet, usecols=usecols)
+
+
+def _measure(func, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return round(best, 3), round(peak / 2**20, 1)
+
+
+def run(n_vms, extra, repeat=1):
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        base = write_liveoptics(os.path.join(tmp, 'base.xlsx'), generate_estate(n_vms))
+        path = widen(base, os.path.join(tmp, 'wide.xlsx'), extra)
+        for engine in available_engines():
+            cases = {
+                'full sheet': lambda: open_excel(path, engine).parse('VMs'),
+                'usecols': lambda: header_then_usecols(open_excel(path, engine)),
+                'load_table': lambda: load_table(open_excel(path, engine), 'vms'),
+            }
+            for mode, func in cases.items():
+                seconds, peak_mb = _measure(func, repeat)
+                results.append({'engine': engine, 'mode': mode, 'seconds': seconds, 'peak_mb': peak_mb})
+    return results
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument('--vms', type=int, default=10000)
+    ap.add_argument('--extra', type=int, default=70, help='unused columns appended to the VMs sheet')
+    ap.add_argument('--repeat', type=int, default=3)
+    args = ap.parse_args()
+
+    print(f"{args.vms} VMs, {args.extra} unused columns")
+    print(f"{'engine':<10} {'mode':<11} {'seconds':>9} {'peak MB':>9}")
+    for r in run(args.vms, args.extra, args.repeat):
+        print(f"{r['engine']:<10} {r['mode']:<11} {r['seconds']:>9} {r['peak_mb']:>9}")
+
+
+if __name__ == '__main__':
+    main()
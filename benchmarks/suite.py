@@ -0,0 +1,341 @@
+"""Benchmark suite for the parse, TCO, fit-scoring and export hot paths.
+
+Every case runs at each requested input tier and records best-of-N wall
+time plus peak traced memory. Results can be saved as the stored baseline
+(benchmarks/baseline.json) and later runs compared against it; any case
+slower or hungrier than baseline by more than --threshold is flagged and
+the run exits non-zero. Cases in BOUNDED_CASES also fail the run when their
+peak memory grows from one tier to the next.
+
+    python -m benchmarks.suite --tiers small medium
+    python -m benchmarks.suite --cases parse_rvtools_streaming --tiers medium large
+    python -m benchmarks.suite --tiers small --save-baseline
+    python -m benchmarks.suite --tiers small --compare --threshold 0.25
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+from benchmarks.synthetic import generate_rvtools, generate_liveoptics
+
+BENCH_DIR = os.path.dirname(__file__)
+DATA_DIR = os.path.join(BENCH_DIR, '.data')
+BASELINE_PATH = os.path.join(BENCH_DIR, 'baseline.json')
+
+TIERS = {
+    'small': 1000,
+    'medium': 10000,
+    'large': 100000,
+}
+
+# Calculations run in microseconds, so each timed sample loops them
+CALC_LOOPS = 1000
+
+# Changes smaller than these are timer/allocator noise, whatever the ratio
+NOISE_FLOOR = {'seconds': 0.02, 'peak_mb': 0.5}
+
+# Cases whose peak memory must stay flat as the input grows
+BOUNDED_CASES = ['parse_rvtools_streaming']
+
+PLATFORM_NAMES = ['VMware VCF', 'Nutanix', 'Red Hat OpenShift', 'Azure Stack HCI']
+
+
+def _workbook(kind, n_vms):
+    """Synthetic workbook for a tier, generated once and reused between runs."""
+    os.makedirs(DATA_DIR, exist_ok=True)
+    path = os.path.join(DATA_DIR, f"{kind}_{n_vms}.xlsx")
+    if not os.path.exists(path):
+        generate = generate_rvtools if kind == 'rvtools' else generate_liveoptics
+        generate(path, n_vms)
+    return path
+
+
+def _fit_funcs():
+    from calculator.platforms.vcf import get_vcf_tco
+    from calculator.platforms.nutanix import get_nutanix_tco
+    from calculator.platforms.openshift import get_openshift_tco
+    from calculator.platforms.azure_stack import get_azure_stack_tco
+    return {
+        'VMware VCF': get_vcf_tco,
+        'Nutanix': get_nutanix_tco,
+        'Red Hat OpenShift': get_openshift_tco,
+        'Azure Stack HCI': get_azure_stack_tco,
+    }
+
+
+def _scenario_results(parsed, current_tco):
+    """Same shape the Scenario Builder stores in session state."""
+    from calculator.tco import calculate_platform_tco, calculate_roi
+    from calculator.cashflow import cash_flow_analysis, cash_flow_summary
+    fit_funcs = _fit_funcs()
+    results = {}
+    for name in PLATFORM_NAMES:
+        tco = calculate_platform_tco(parsed, name)
+        results[name] = {**tco, **calculate_roi(current_tco, tco), 'fit': fit_funcs[name](parsed),
+                         'cash_flow': cash_flow_summary(cash_flow_analysis(parsed, name))}
+    return results
+
+
+# ── Cases ─────────────────────────────────────────────────────────
+# Each case takes the tier's VM count, does its (untimed) setup and returns
+# the zero-argument callable to measure.
+
+def case_parse_rvtools(n_vms):
+    from parser.rvtools import parse_rvtools
+    path = _workbook('rvtools', n_vms)
+    return lambda: parse_rvtools(path)
+
+
+def case_parse_rvtools_streaming(n_vms):
+    from parser.rvtools import parse_rvtools
+    path = _workbook('rvtools', n_vms)
+    return lambda: parse_rvtools(path, streaming=True)
+
+
+def case_parse_liveoptics(n_vms):
+    from parser.liveoptics import parse_liveoptics
+    path = _workbook('liveoptics', n_vms)
+    return lambda: parse_liveoptics(path)
+
+
+def _parsed(n_vms):
+    from parser.rvtools import parse_rvtools
+    return parse_rvtools(_workbook('rvtools', n_vms), streaming=True, inventory=True)
+
+
+def case_current_tco(n_vms):
+    from calculator.tco import calculate_current_tco
+    parsed = _parsed(n_vms)
+
+    def run():
+        for _ in range(CALC_LOOPS):
+            calculate_current_tco(parsed)
+    return run
+
+
+def case_platform_tco(n_vms):
+    from calculator.tco import calculate_current_tco, calculate_platform_tco, calculate_roi
+    parsed = _parsed(n_vms)
+    current = calculate_current_tco(parsed)
+
+    def run():
+        for _ in range(CALC_LOOPS):
+            for name in PLATFORM_NAMES:
+                calculate_roi(current, calculate_platform_tco(parsed, name))
+    return run
+
+
+def case_memoized_tco(n_vms):
+    from calculator.memo import cached_current_tco, cached_platform_tco, cached_roi, clear_cache
+    parsed = _parsed(n_vms)
+
+    def run():
+        # First pass misses, the rest are what a page rerun sees
+        clear_cache()
+        for _ in range(CALC_LOOPS):
+            current = cached_current_tco(parsed)
+            for name in PLATFORM_NAMES:
+                cached_roi(current, cached_platform_tco(parsed, name))
+    return run
+
+
+def case_batch_tco(n_vms):
+    import numpy as np
+    from calculator.batch import evaluate_grid
+    parsed = _parsed(n_vms)
+    # 10,080 scenarios per platform
+    axes = {
+        'fte_reduction': np.linspace(0, 0.6, 12),
+        'hardware_efficiency': np.linspace(0.6, 1.0, 10),
+        'price_factor': np.linspace(0.5, 1.5, 14),
+        'years': [1, 3, 5],
+        'avg_host_cost': [25000, 35000],
+    }
+    return lambda: evaluate_grid(parsed, **axes)
+
+
+def case_optimizer(n_vms):
+    from calculator.optimizer import best_case
+    parsed = _parsed(n_vms)
+
+    def run():
+        for _ in range(CALC_LOOPS):
+            best_case(parsed)
+    return run
+
+
+def case_grouped_tco(n_vms):
+    from calculator.breakdown import grouped_tco
+    parsed = _parsed(n_vms)
+    return lambda: grouped_tco(parsed)
+
+
+def case_consolidation(n_vms):
+    from calculator.consolidation import consolidate
+    inventory = _parsed(n_vms)['vm_inventory']
+    return lambda: consolidate(inventory)
+
+
+def case_fit_scores(n_vms):
+    parsed = _parsed(n_vms)
+    fit_funcs = list(_fit_funcs().values())
+
+    def run():
+        for _ in range(CALC_LOOPS):
+            for fit in fit_funcs:
+                fit(parsed)
+    return run
+
+
+def case_generate_pdf(n_vms):
+    from calculator.tco import calculate_current_tco
+    from exports.pdf_export import generate_pdf
+    parsed = _parsed(n_vms)
+    current = calculate_current_tco(parsed)
+    scenarios = _scenario_results(parsed, current)
+    return lambda: generate_pdf('Benchmark Co', 'Benchmark', parsed, current, scenarios,
+                                PLATFORM_NAMES, 'VMware VCF', 3, {})
+
+
+CASES = {
+    'parse_rvtools': case_parse_rvtools,
+    'parse_rvtools_streaming': case_parse_rvtools_streaming,
+    'parse_liveoptics': case_parse_liveoptics,
+    'current_tco': case_current_tco,
+    'platform_tco': case_platform_tco,
+    'memoized_tco': case_memoized_tco,
+    'batch_tco': case_batch_tco,
+    'grouped_tco': case_grouped_tco,
+    'optimizer': case_optimizer,
+    'consolidation': case_consolidation,
+    'fit_scores': case_fit_scores,
+    'generate_pdf': case_generate_pdf,
+}
+
+
+def measure(func, repeat=3):
+    """Best-of-repeat wall time, then one traced run for peak memory."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return best, peak
+
+
+def run(tiers, cases=None, repeat=3):
+    results = {}
+    for tier in tiers:
+        n_vms = TIERS[tier]
+        for name in cases or CASES:
+            try:
+                func = CASES[name](n_vms)
+            except ImportError as e:
+                print(f"  skip {name}: {e}", file=sys.stderr)
+                continue
+            seconds, peak = measure(func, repeat)
+            results[f"{name}[{tier}]"] = {
+                'seconds': round(seconds, 4),
+                'peak_mb': round(peak / 1024 / 1024, 2),
+            }
+            print(f"  {name}[{tier}]  {seconds:.4f}s  {peak / 1024 / 1024:.1f} MB", file=sys.stderr)
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Return a list of regressions beyond threshold (fractional, e.g. 0.2 = 20%)."""
+    regressions = []
+    for key, current in results.items():
+        base = baseline.get('results', {}).get(key)
+        if not base:
+            continue
+        for metric in ('seconds', 'peak_mb'):
+            grew = current[metric] - base[metric]
+            if base[metric] and grew > NOISE_FLOOR[metric] and current[metric] > base[metric] * (1 + threshold):
+                regressions.append({
+                    'case': key,
+                    'metric': metric,
+                    'baseline': base[metric],
+                    'current': current[metric],
+                    'change_pct': round((current[metric] / base[metric] - 1) * 100, 1),
+                })
+    return regressions
+
+
+def check_bounded(results, threshold):
+    """BOUNDED_CASES whose peak memory grew beyond threshold between consecutive tiers run."""
+    growth = []
+    for name in BOUNDED_CASES:
+        tiers = [tier for tier in TIERS if f"{name}[{tier}]" in results]
+        for smaller, larger in zip(tiers, tiers[1:]):
+            before = results[f"{name}[{smaller}]"]['peak_mb']
+            after = results[f"{name}[{larger}]"]['peak_mb']
+            if after - before > NOISE_FLOOR['peak_mb'] and after > before * (1 + threshold):
+                growth.append({'case': name, 'tiers': (smaller, larger), 'before': before, 'after': after})
+    return growth
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument('--tiers', nargs='+', choices=list(TIERS), default=['small'])
+    ap.add_argument('--cases', nargs='+', choices=list(CASES), default=None)
+    ap.add_argument('--repeat', type=int, default=3)
+    ap.add_argument('--threshold', type=float, default=0.20)
+    ap.add_argument('--save-baseline', action='store_true')
+    ap.add_argument('--compare', action='store_true')
+    ap.add_argument('--baseline', default=BASELINE_PATH)
+    args = ap.parse_args()
+
+    results = run(args.tiers, args.cases, args.repeat)
+    status = 0
+
+    growth = check_bounded(results, args.threshold)
+    for g in growth:
+        print(f"{g['case']} peak memory grew from {g['tiers'][0]} to {g['tiers'][1]}: "
+              f"{g['before']} -> {g['after']} MB")
+        status = 1
+
+    if args.save_baseline:
+        baseline = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline, 'r') as f:
+                baseline = json.load(f)
+        baseline.setdefault('results', {}).update(results)
+        baseline['machine'] = f"{platform.system()} {platform.machine()} / Python {platform.python_version()}"
+        baseline['saved_at'] = time.strftime('%Y-%m-%dT%H:%M:%S')
+        with open(args.baseline, 'w') as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+        print(f"Baseline saved to {args.baseline}")
+
+    if args.compare:
+        if not os.path.exists(args.baseline):
+            print(f"No baseline at {args.baseline} — run with --save-baseline first.")
+            return 2
+        with open(args.baseline, 'r') as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} regression(s) beyond {args.threshold:.0%}:")
+            for r in regressions:
+                print(f"  {r['case']} {r['metric']}: {r['baseline']} -> {r['current']} (+{r['change_pct']}%)")
+            return 1
+        print(f"No regressions beyond {args.threshold:.0%}.")
+    else:
+        print(json.dumps(results, indent=2))
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(main())
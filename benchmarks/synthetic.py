@@ -0,0 +1,226 @@
+"""Synthetic RVTools and LiveOptics workbooks for scale testing.
+
+Produces exports shaped like the real tools' output at any size, with
+realistic OS, power-state, vCPU and memory distributions. Generation is
+seeded, so the same arguments always give the same workbook.
+
+    python -m benchmarks.synthetic rvtools /tmp/rvtools_100k.xlsx --vms 100000
+    python -m benchmarks.synthetic liveoptics /tmp/lo_10k.xlsx --vms 10000 --hosts 400
+"""
+import argparse
+import uuid
+
+import numpy as np
+from openpyxl import Workbook
+
+# Guest OS mix seen across typical enterprise vCenters (RVTools spelling,
+# LiveOptics spelling, weight)
+OS_MIX = [
+    ('Microsoft Windows Server 2019 (64-bit)', 'Microsoft Windows Server 2019 (64-bit)', 0.22),
+    ('Microsoft Windows Server 2016 (64-bit)', 'Microsoft Windows Server 2016 (64-bit)', 0.15),
+    ('Microsoft Windows Server 2022 (64-bit)', 'Microsoft Windows Server 2022 (64-bit)', 0.12),
+    ('Microsoft Windows Server 2012 R2 (64-bit)', 'Microsoft Windows Server 2012 R2 (64-bit)', 0.07),
+    ('Microsoft Windows Server 2008 R2 (64-bit)', 'Microsoft Windows Server 2008 R2 (64-bit)', 0.02),
+    ('Microsoft Windows 10 (64-bit)', 'Microsoft Windows 10 (64-bit)', 0.02),
+    ('Red Hat Enterprise Linux 8 (64-bit)', 'Red Hat Enterprise Linux 8 (64-bit)', 0.10),
+    ('Red Hat Enterprise Linux 7 (64-bit)', 'Red Hat Enterprise Linux 7 (64-bit)', 0.07),
+    ('Red Hat Enterprise Linux 6 (64-bit)', 'Red Hat Enterprise Linux 6 (64-bit)', 0.01),
+    ('CentOS 7 (64-bit)', 'CentOS 7 (64-bit)', 0.06),
+    ('Ubuntu Linux (64-bit)', 'Ubuntu Linux (64-bit)', 0.09),
+    ('SUSE Linux Enterprise 15 (64-bit)', 'SUSE Linux Enterprise 15 (64-bit)', 0.03),
+    ('Other 3.x or later Linux (64-bit)', 'Other 3.x or later Linux (64-bit)', 0.02),
+    ('VMware Photon OS (64-bit)', 'VMware Photon OS (64-bit)', 0.02),
+]
+
+POWER_MIX = [('poweredOn', 'On', 0.85), ('poweredOff', 'Off', 0.13), ('suspended', 'Suspended', 0.02)]
+
+VCPU_CHOICES = ([1, 2, 4, 6, 8, 12, 16, 24, 32],
+                [0.06, 0.30, 0.32, 0.04, 0.15, 0.03, 0.06, 0.02, 0.02])
+GB_PER_VCPU_CHOICES = ([2, 4, 8], [0.25, 0.55, 0.20])
+
+HOST_CORES_PER_SOCKET = [16, 20, 24, 28, 32]
+HOST_MEMORY_GB = [384, 512, 768, 1024, 1536]
+HOSTS_PER_CLUSTER = 8
+
+
+def default_hosts(n_vms):
+    """Typical ~25 VMs per host, kept inside the 10–5,000 host range."""
+    return int(min(max(n_vms // 25, 10), 5000))
+
+
+def generate_estate(n_vms=1000, n_hosts=None, seed=0):
+    """Generate the per-VM and per-host arrays shared by both workbook writers."""
+    rng = np.random.default_rng(seed)
+    n_hosts = n_hosts or default_hosts(n_vms)
+    n_clusters = max(1, -(-n_hosts // HOSTS_PER_CLUSTER))
+
+    host_cluster = np.arange(n_hosts) % n_clusters
+    host_sockets = np.full(n_hosts, 2)
+    host_cores = host_sockets * rng.choice(HOST_CORES_PER_SOCKET, n_hosts)
+    host_memory_gb = rng.choice(HOST_MEMORY_GB, n_hosts)
+
+    os_weights = np.array([w for _, _, w in OS_MIX])
+    power_weights = np.array([w for _, _, w in POWER_MIX])
+    vm_os = rng.choice(len(OS_MIX), n_vms, p=os_weights / os_weights.sum())
+    vm_power = rng.choice(len(POWER_MIX), n_vms, p=power_weights / power_weights.sum())
+    vm_cpus = rng.choice(VCPU_CHOICES[0], n_vms, p=VCPU_CHOICES[1])
+    vm_memory_gb = vm_cpus * rng.choice(GB_PER_VCPU_CHOICES[0], n_vms, p=GB_PER_VCPU_CHOICES[1])
+    vm_host = rng.integers(0, n_hosts, n_vms)
+    vm_disk_gb = rng.choice([40, 60, 100, 200, 500, 1000], n_vms, p=[0.2, 0.25, 0.25, 0.15, 0.1, 0.05])
+    vm_used_ratio = rng.beta(4, 3, n_vms)
+
+    # Utilization — skewed low, as most VMs are oversized
+    cpu_avg = np.clip(rng.gamma(2.0, 7.0, n_vms), 0.5, 95)
+    cpu_peak = np.clip(cpu_avg * rng.uniform(1.5, 4.0, n_vms), cpu_avg, 100)
+    mem_avg = np.clip(rng.normal(45, 18, n_vms), 5, 95)
+    mem_peak = np.clip(mem_avg * rng.uniform(1.1, 1.8, n_vms), mem_avg, 100)
+    off = vm_power != 0
+    cpu_avg[off] = cpu_peak[off] = mem_avg[off] = mem_peak[off] = 0
+
+    return {
+        'seed': seed,
+        'n_vms': n_vms,
+        'n_hosts': n_hosts,
+        'n_clusters': n_clusters,
+        'host_cluster': host_cluster,
+        'host_sockets': host_sockets,
+        'host_cores': host_cores,
+        'host_memory_gb': host_memory_gb,
+        'vm_os': vm_os,
+        'vm_power': vm_power,
+        'vm_cpus': vm_cpus,
+        'vm_memory_gb': vm_memory_gb,
+        'vm_host': vm_host,
+        'vm_disk_gb': vm_disk_gb,
+        'vm_used_ratio': vm_used_ratio,
+        'vm_cpu_avg': cpu_avg.round(1),
+        'vm_cpu_peak': cpu_peak.round(1),
+        'vm_mem_avg': mem_avg.round(1),
+        'vm_mem_peak': mem_peak.round(1),
+    }
+
+
+def _vm_uuids(estate):
+    rng = np.random.default_rng(estate['seed'] + 1)
+    raw = rng.integers(0, 2 ** 63, size=(estate['n_vms'], 2), dtype=np.int64)
+    return [str(uuid.UUID(int=(int(a) << 64) | int(b))) for a, b in raw]
+
+
+def write_rvtools(path, estate):
+    """Write an RVTools-layout workbook (vInfo, vHost, vCluster, vPartition)."""
+    wb = Workbook(write_only=True)
+    cluster_names = [f"Cluster-{i + 1:03d}" for i in range(estate['n_clusters'])]
+    host_names = [f"esxi-{i + 1:05d}.corp.local" for i in range(estate['n_hosts'])]
+    host_cluster = estate['host_cluster'].tolist()
+
+    ws = wb.create_sheet('vInfo')
+    ws.append(['VM', 'Powerstate', 'CPUs', 'Memory', 'NICs', 'Disks', 'OS', 'Cluster', 'Host', 'VM UUID'])
+    uuids = _vm_uuids(estate)
+    rows = zip(estate['vm_power'].tolist(), estate['vm_cpus'].tolist(), estate['vm_memory_gb'].tolist(),
+               estate['vm_os'].tolist(), estate['vm_host'].tolist(), uuids)
+    for i, (power, cpus, mem_gb, os_idx, host, vm_uuid) in enumerate(rows):
+        ws.append([f"vm-{i + 1:06d}", POWER_MIX[power][0], cpus, mem_gb * 1024, 1, 1,
+                   OS_MIX[os_idx][0], cluster_names[host_cluster[host]], host_names[host], vm_uuid])
+
+    ws = wb.create_sheet('vHost')
+    ws.append(['Host', 'Cluster', '# CPU', '# Cores', 'CPU MHz', 'Memory', 'ESX Version'])
+    for i, (sockets, cores, mem_gb) in enumerate(zip(estate['host_sockets'].tolist(),
+                                                     estate['host_cores'].tolist(),
+                                                     estate['host_memory_gb'].tolist())):
+        ws.append([host_names[i], cluster_names[host_cluster[i]], sockets, cores, 2600, mem_gb * 1024, '8.0.2'])
+
+    ws = wb.create_sheet('vCluster')
+    ws.append(['Name', 'Num Hosts', 'Num VMs', 'Total CPU MHz', 'Total Memory'])
+    hosts_per_cluster = np.bincount(estate['host_cluster'], minlength=estate['n_clusters'])
+    vms_per_cluster = np.bincount(estate['host_cluster'][estate['vm_host']], minlength=estate['n_clusters'])
+    for i, name in enumerate(cluster_names):
+        ws.append([name, int(hosts_per_cluster[i]), int(vms_per_cluster[i]), None, None])
+
+    ws = wb.create_sheet('vPartition')
+    ws.append(['VM', 'Disk', 'Capacity MB', 'Consumed MB'])
+    for i, (disk_gb, used) in enumerate(zip(estate['vm_disk_gb'].tolist(), estate['vm_used_ratio'].tolist())):
+        ws.append([f"vm-{i + 1:06d}", 'Hard disk 1', disk_gb * 1024, round(disk_gb * 1024 * used)])
+
+    wb.save(path)
+    return path
+
+
+def write_liveoptics(path, estate):
+    """Write a LiveOptics-layout workbook (VMs, Hosts, Clusters, Datastores)."""
+    wb = Workbook(write_only=True)
+    cluster_names = [f"Cluster-{i + 1:03d}" for i in range(estate['n_clusters'])]
+    host_names = [f"esxi-{i + 1:05d}.corp.local" for i in range(estate['n_hosts'])]
+    host_cluster = estate['host_cluster'].tolist()
+
+    ws = wb.create_sheet('VMs')
+    ws.append(['VM Name', 'Power State', 'vCPUs', 'Memory (MB)', 'Provisioned Storage (GB)',
+               'Used Storage (GB)', 'Operating System', 'Cluster', 'Host', 'VM UUID',
+               'CPU Average (%)', 'CPU Peak (%)', 'Memory Average (%)', 'Memory Peak (%)'])
+    uuids = _vm_uuids(estate)
+    rows = zip(estate['vm_power'].tolist(), estate['vm_cpus'].tolist(), estate['vm_memory_gb'].tolist(),
+               estate['vm_disk_gb'].tolist(), estate['vm_used_ratio'].tolist(), estate['vm_os'].tolist(),
+               estate['vm_host'].tolist(), uuids, estate['vm_cpu_avg'].tolist(), estate['vm_cpu_peak'].tolist(),
+               estate['vm_mem_avg'].tolist(), estate['vm_mem_peak'].tolist())
+    for i, (power, cpus, mem_gb, disk_gb, used, os_idx, host, vm_uuid,
+            cpu_avg, cpu_peak, mem_avg, mem_peak) in enumerate(rows):
+        ws.append([f"vm-{i + 1:06d}", POWER_MIX[power][1], cpus, mem_gb * 1024, disk_gb,
+                   round(disk_gb * used, 1), OS_MIX[os_idx][1], cluster_names[host_cluster[host]],
+                   host_names[host], vm_uuid, cpu_avg, cpu_peak, mem_avg, mem_peak])
+
+    ws = wb.create_sheet('Hosts')
+    ws.append(['Host Name', 'Cluster', 'CPU Sockets', 'Cores Per Socket', 'Total Cores',
+               'Memory (GB)', 'ESXi Version', 'Number of VMs'])
+    vms_per_host = np.bincount(estate['vm_host'], minlength=estate['n_hosts']).tolist()
+    for i, (sockets, cores, mem_gb) in enumerate(zip(estate['host_sockets'].tolist(),
+                                                     estate['host_cores'].tolist(),
+                                                     estate['host_memory_gb'].tolist())):
+        ws.append([host_names[i], cluster_names[host_cluster[i]], sockets, cores // sockets, cores,
+                   mem_gb, '8.0.2', vms_per_host[i]])
+
+    ws = wb.create_sheet('Clusters')
+    ws.append(['Cluster Name', 'Number of Hosts', 'Total VMs'])
+    hosts_per_cluster = np.bincount(estate['host_cluster'], minlength=estate['n_clusters'])
+    vms_per_cluster = np.bincount(estate['host_cluster'][estate['vm_host']], minlength=estate['n_clusters'])
+    for i, name in enumerate(cluster_names):
+        ws.append([name, int(hosts_per_cluster[i]), int(vms_per_cluster[i])])
+
+    # One datastore per cluster, sized from the VM disks placed on it
+    ws = wb.create_sheet('Datastores')
+    ws.append(['Datastore Name', 'Type', 'Capacity (GB)', 'Used (GB)'])
+    vm_cluster = estate['host_cluster'][estate['vm_host']]
+    used = np.bincount(vm_cluster, weights=estate['vm_disk_gb'] * estate['vm_used_ratio'],
+                       minlength=estate['n_clusters'])
+    provisioned = np.bincount(vm_cluster, weights=estate['vm_disk_gb'], minlength=estate['n_clusters'])
+    for i, name in enumerate(cluster_names):
+        ws.append([f"{name}-VSAN", 'vSAN', round(float(provisioned[i]) * 1.3), round(float(used[i]))])
+
+    wb.save(path)
+    return path
+
+
+def generate_rvtools(path, n_vms=1000, n_hosts=None, seed=0):
+    """Write a synthetic RVTools export with n_vms VMs and return its path."""
+    return write_rvtools(path, generate_estate(n_vms, n_hosts, seed))
+
+
+def generate_liveoptics(path, n_vms=1000, n_hosts=None, seed=0):
+    """Write a synthetic LiveOptics export with n_vms VMs and return its path."""
+    return write_liveoptics(path, generate_estate(n_vms, n_hosts, seed))
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument('format', choices=['rvtools', 'liveoptics'])
+    ap.add_argument('path')
+    ap.add_argument('--vms', type=int, default=1000)
+    ap.add_argument('--hosts', type=int, default=None)
+    ap.add_argument('--seed', type=int, default=0)
+    args = ap.parse_args()
+
+    generate = generate_rvtools if args.format == 'rvtools' else generate_liveoptics
+    generate(args.path, args.vms, args.hosts, args.seed)
+    print(f"Wrote {args.path}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,209 @@
+"""Vectorized TCO math for evaluating many assumption sets at once.
+
+Mirrors calculate_current_tco / calculate_platform_tco / calculate_roi in
+calculator/tco.py, but every assumption may be a NumPy array. Arrays are
+broadcast against each other, so passing the flattened columns from
+scenario_grid() evaluates every combination in one pass. Values inside the
+'hardware', 'fte' and 'pricing' override dicts may be arrays as well, and so
+may total_hosts and total_physical_cores, which prices many clusters or
+sites at once (see calculator.breakdown).
+Results are left unrounded; the scalar functions remain the source of
+truth for display.
+"""
+import numpy as np
+import pandas as pd
+
+from pricing.defaults import HARDWARE, FTE, PLATFORMS
+
+COMPONENTS = ['licensing', 'support', 'hardware_refresh', 'facilities', 'fte', 'implementation']
+
+# Assumption axes accepted as scalars or arrays
+CURRENT_AXES = ['years', 'fte_count', 'avg_host_cost']
+PLATFORM_AXES = CURRENT_AXES + ['fte_reduction', 'hardware_efficiency', 'unit_price']
+
+
+def scenario_grid(**axes):
+    """Cartesian product of assumption axes as flat, equal-length arrays.
+
+    scenario_grid(fte_reduction=[0.2, 0.4], years=[3, 5]) returns
+    {'fte_reduction': array([0.2, 0.2, 0.4, 0.4]), 'years': array([3, 5, 3, 5])}.
+    """
+    names = list(axes)
+    values = [np.atleast_1d(np.asarray(axes[n], dtype='float64')) for n in names]
+    mesh = np.meshgrid(*values, indexing='ij')
+    return {name: m.ravel() for name, m in zip(names, mesh)}
+
+
+def _resolve(parsed_data, platform_name=None, overrides=None):
+    """Merged pricing dicts, following the same precedence as calculator.tco."""
+    h = HARDWARE.copy()
+    f = FTE.copy()
+    platform = PLATFORMS[platform_name].copy() if platform_name else None
+    if overrides:
+        h.update(overrides.get('hardware', {}))
+        f.update(overrides.get('fte', {}))
+        if platform is not None and 'pricing' in overrides:
+            platform.update(overrides['pricing'])
+    return h, f, platform
+
+
+def _axis(axes, name, overrides, default):
+    if name in axes:
+        return np.asarray(axes[name], dtype='float64')
+    return np.float64(overrides.get(name, default) if overrides else default)
+
+
+def _environment(parsed_data):
+    """Host and core counts as arrays."""
+    hosts = np.asarray(parsed_data.get('total_hosts', 0), dtype='float64')
+    cores = np.asarray(parsed_data.get('total_physical_cores', hosts * 20), dtype='float64')
+    return hosts, cores
+
+
+def batch_current_tco(parsed_data, overrides=None, **axes):
+    """Current-state TCO for every combination of years, fte_count and avg_host_cost."""
+    h, f, _ = _resolve(parsed_data, overrides=overrides)
+    hosts, cores = _environment(parsed_data)
+
+    years = _axis(axes, 'years', overrides, 3)
+    fte_count = _axis(axes, 'fte_count', overrides, 3)
+    host_cost = np.asarray(axes.get('avg_host_cost', h['avg_host_cost']), dtype='float64')
+    years, fte_count, host_cost = np.broadcast_arrays(years, fte_count, host_cost)
+
+    hardware_refresh = hosts * host_cost * (years / h['refresh_cycle_years'])
+    facilities = hosts * (h['power_per_host_kw'] * 8760 * h['power_cost_per_kwh']
+                          + h['datacenter_cost_per_host']) * years
+    fte = fte_count * f['avg_fully_loaded_cost'] * years
+    licensing = cores * 50 * years
+    support = hosts * host_cost * 0.20 * years
+    total = hardware_refresh + facilities + fte + licensing + support
+
+    return {
+        'hardware_refresh': hardware_refresh,
+        'facilities': facilities,
+        'fte': fte,
+        'licensing': licensing,
+        'support': support,
+        'total': total,
+        'years': years,
+        'annual_average': total / years,
+    }
+
+
+def batch_platform_tco(parsed_data, platform_name, overrides=None, **axes):
+    """Platform TCO for every combination of the PLATFORM_AXES passed as arrays.
+
+    unit_price is the platform's cost per core or per node per year,
+    depending on its licensing model. Anything not passed as an axis falls
+    back to overrides and then to pricing defaults, as in calculate_platform_tco.
+    An effective_hosts array replaces the efficiency-derived host count.
+    """
+    h, f, platform = _resolve(parsed_data, platform_name, overrides)
+    hosts, cores = _environment(parsed_data)
+
+    if platform['model'] == 'per_core':
+        license_units = np.maximum(cores, platform.get('min_cores', 0))
+        default_price = platform['cost_per_core_per_year']
+    else:
+        license_units = np.maximum(hosts, platform.get('min_nodes', 0))
+        default_price = platform['cost_per_node_per_year']
+
+    arrays = np.broadcast_arrays(
+        _axis(axes, 'years', overrides, 3),
+        _axis(axes, 'fte_count', overrides, 3),
+        _axis(axes, 'fte_reduction', overrides, 0.40),
+        _axis(axes, 'hardware_efficiency', overrides, 0.80),
+        np.asarray(axes.get('unit_price', default_price), dtype='float64'),
+        np.asarray(axes.get('avg_host_cost', h['avg_host_cost']), dtype='float64'),
+        hosts,
+    )
+    years, fte_count, fte_reduction, efficiency, unit_price, host_cost, hosts = arrays
+
+    licensing = license_units * unit_price * years
+    support = licensing * platform['support_percentage']
+
+    if 'effective_hosts' in axes:
+        effective_hosts = np.broadcast_to(np.asarray(axes['effective_hosts'], dtype='float64'), efficiency.shape)
+    elif overrides and overrides.get('effective_hosts'):
+        effective_hosts = np.full_like(efficiency, overrides['effective_hosts'])
+    else:
+        # np.rint rounds half to even, matching Python's round()
+        effective_hosts = np.maximum(np.rint(hosts * efficiency), 3)
+    hardware_refresh = effective_hosts * host_cost * (years / h['refresh_cycle_years'])
+    facilities = effective_hosts * (h['power_per_host_kw'] * 8760 * h['power_cost_per_kwh']
+                                    + h['datacenter_cost_per_host']) * years
+    fte = fte_count * (1 - fte_reduction) * f['avg_fully_loaded_cost'] * years
+    implementation = hosts * 2500
+
+    total = licensing + support + hardware_refresh + facilities + fte + implementation
+
+    return {
+        'licensing': licensing,
+        'support': support,
+        'hardware_refresh': hardware_refresh,
+        'facilities': facilities,
+        'fte': fte,
+        'implementation': implementation,
+        'total': total,
+        'years': years,
+        'annual_average': total / years,
+        'effective_hosts': effective_hosts.astype('int64'),
+    }
+
+
+def batch_roi(current_tco, platform_tco):
+    """Vectorized calculate_roi over batch (or scalar) TCO dicts."""
+    current_total = np.asarray(current_tco['total'], dtype='float64')
+    platform_total = np.asarray(platform_tco['total'], dtype='float64')
+    savings = current_total - platform_total
+    roi_pct = savings / np.maximum(platform_total, 1) * 100
+
+    monthly_savings = savings / np.maximum(np.asarray(current_tco['years']) * 12, 1)
+    implementation = np.asarray(platform_tco['implementation'], dtype='float64')
+    payback_months = np.where(monthly_savings > 0,
+                              implementation / np.maximum(monthly_savings, 1), 999.0)
+
+    return {
+        'savings': savings,
+        'roi_pct': roi_pct,
+        'payback_months': payback_months,
+        'is_positive': savings > 0,
+    }
+
+
+def evaluate_grid(parsed_data, platform_names=None, overrides=None, **axes):
+    """Evaluate every platform over the full grid of the given axes.
+
+    Axes are combined with scenario_grid(). Besides PLATFORM_AXES,
+    price_factor scales each platform's own list price, which keeps one
+    grid meaningful across per-core and per-node platforms. Returns a long
+    DataFrame with one row per (platform, scenario).
+    """
+    platform_names = platform_names or list(PLATFORMS)
+    grid = scenario_grid(**axes) if axes else {}
+    price_factor = grid.pop('price_factor', None)
+    current = batch_current_tco(parsed_data, overrides, **{k: v for k, v in grid.items() if k in CURRENT_AXES})
+
+    frames = []
+    for name in platform_names:
+        platform_axes = dict(grid)
+        if price_factor is not None:
+            _, _, platform = _resolve(parsed_data, name, overrides)
+            key = 'cost_per_core_per_year' if platform['model'] == 'per_core' else 'cost_per_node_per_year'
+            platform_axes['unit_price'] = platform[key] * price_factor
+        tco = batch_platform_tco(parsed_data, name, overrides, **platform_axes)
+        roi = batch_roi(current, tco)
+
+        columns = {**grid, 'price_factor': price_factor} if price_factor is not None else dict(grid)
+        columns.update({key: tco[key] for key in COMPONENTS + ['total', 'effective_hosts']})
+        columns['current_total'] = current['total']
+        columns.update(roi)
+        n = np.size(tco['total'])
+        frame = pd.DataFrame({key: np.broadcast_to(values, n) for key, values in columns.items()})
+        frame.insert(0, 'platform', name)
+        frames.append(frame)
+
+    result = pd.concat(frames, ignore_index=True)
+    result['platform'] = result['platform'].astype('category')
+    return result
+
@@ -0,0 +1,122 @@
+"""Per-cluster and per-site TCO for phased migrations.
+
+Groups the host inventory by source cluster or by site (vCenter
+datacenter) and prices every group at once: the per-group host and core
+counts are passed as arrays to the vectorized math in calculator.batch,
+so the cost of a breakdown does not grow with a loop over clusters.
+
+Each group is priced as a standalone migration — the platform's minimum
+core or node count and the 3-host minimum apply per group. FTE cost is
+shared by the estate and is allocated by each group's share of hosts, so
+it sums back to the estate total. A bin-packed effective_hosts override
+is split the same way and then raised to MIN_GROUP_HOSTS, so small
+groups can add up to more hosts than the estate-wide figure.
+"""
+import numpy as np
+import pandas as pd
+
+from calculator.batch import COMPONENTS, batch_current_tco, batch_platform_tco, batch_roi
+from pricing.defaults import PLATFORMS
+
+# Grouping name -> host_inventory column
+GROUP_COLUMNS = {
+    'cluster': 'cluster',
+    'site': 'datacenter',
+}
+
+UNASSIGNED = '(none)'
+
+# Fewest hosts a group migrated on its own is sized with, as in calculator.tco
+MIN_GROUP_HOSTS = 3
+
+
+def group_sizes(parsed_data, by='cluster'):
+    """Hosts, cores and VMs per cluster or site, from the parsed inventories.
+
+    VMs are counted by their own cluster column, or for sites through the
+    host they run on. Hosts without a cluster or site are grouped under
+    UNASSIGNED.
+    """
+    column = GROUP_COLUMNS[by]
+    hosts = parsed_data.get('host_inventory')
+    if hosts is None or not len(hosts):
+        return pd.DataFrame(columns=['group', 'hosts', 'cores', 'vms'])
+
+    if column in hosts:
+        keys = hosts[column].astype(object).fillna(UNASSIGNED)
+    else:
+        keys = pd.Series(UNASSIGNED, index=hosts.index)
+    sizes = pd.DataFrame({'group': keys, 'cores': hosts['cores'].astype('int64')}).groupby(
+        'group', sort=True).agg(hosts=('cores', 'size'), cores=('cores', 'sum'))
+
+    vms = parsed_data.get('vm_inventory')
+    if vms is not None and len(vms):
+        if column in vms:
+            vm_keys = vms[column].astype(object).fillna(UNASSIGNED)
+        else:
+            host_group = pd.Series(keys.values, index=hosts['host'].astype(object)).groupby(level=0).first()
+            vm_keys = vms['host'].astype(object).map(host_group).fillna(UNASSIGNED)
+        sizes['vms'] = vm_keys.value_counts().reindex(sizes.index, fill_value=0)
+    else:
+        sizes['vms'] = 0
+    return sizes.reset_index()
+
+
+def allocate(total, weights):
+    """Split an integer total across weights by largest remainder."""
+    weights = np.asarray(weights, dtype='float64')
+    if not weights.sum():
+        return np.zeros(len(weights), dtype='int64')
+    exact = total * weights / weights.sum()
+    shares = np.floor(exact).astype('int64')
+    remainder = int(round(total - shares.sum()))
+    shares[np.argsort(-(exact - shares), kind='stable')[:remainder]] += 1
+    return shares
+
+
+def grouped_tco(parsed_data, platform_names=None, overrides=None, pricing=None, by='cluster'):
+    """Current and platform TCO for every cluster or site in one pass per platform.
+
+    overrides and pricing follow calculator.sensitivity.tornado. Returns a
+    long DataFrame with one row per (group, platform): the group's hosts,
+    cores and VMs, its current total, the platform components and total,
+    and savings, ROI and payback for migrating that group alone.
+    """
+    platform_names = platform_names or list(PLATFORMS)
+    overrides = overrides or {}
+    pricing = pricing or {}
+
+    sizes = group_sizes(parsed_data, by)
+    if not len(sizes):
+        return pd.DataFrame()
+    hosts = sizes['hosts'].to_numpy(dtype='float64')
+    cores = sizes['cores'].to_numpy(dtype='float64')
+    environment = {'total_hosts': hosts, 'total_physical_cores': cores}
+
+    # Estate-wide quantities split by host share
+    share = hosts / hosts.sum()
+    fte_count = overrides.get('fte_count', 3) * share
+    axes = {'fte_count': fte_count}
+    if overrides.get('effective_hosts'):
+        axes['effective_hosts'] = np.maximum(allocate(overrides['effective_hosts'], hosts), MIN_GROUP_HOSTS)
+
+    current = batch_current_tco(environment, overrides, fte_count=fte_count)
+
+    frames = []
+    for name in platform_names:
+        platform_overrides = {**overrides, 'pricing': pricing[name]} if name in pricing else overrides
+        tco = batch_platform_tco(environment, name, platform_overrides, **axes)
+        roi = batch_roi(current, tco)
+
+        frame = sizes.rename(columns={'group': by}).copy()
+        frame.insert(1, 'platform', name)
+        frame['current_total'] = current['total']
+        for key in COMPONENTS + ['total', 'effective_hosts']:
+            frame[key] = tco[key]
+        for key in ('savings', 'roi_pct', 'payback_months'):
+            frame[key] = roi[key]
+        frames.append(frame)
+
+    result = pd.concat(frames, ignore_index=True)
+    result['platform'] = result['platform'].astype('category')
+    return result
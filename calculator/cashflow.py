@@ -0,0 +1,160 @@
+"""Time-phased cash flows with NPV, IRR and discounted payback.
+
+calculate_current_tco / calculate_platform_tco give totals over the
+analysis period. This module spreads the same components across months:
+licensing and support follow FINANCE['billing'], hardware is refreshed in
+annual tranches, facilities and labor accrue monthly, and implementation
+lands up front or across the migration. Period totals therefore match
+the TCO functions exactly. Flows are NumPy arrays with months on the
+last axis, so npv() also works on a stack of scenarios.
+"""
+import numpy as np
+
+from calculator.tco import current_cost_components, platform_cost_components
+from pricing.defaults import FINANCE
+
+BILLED_LINES = ['licensing', 'support']
+TRANCHE_LINES = ['hardware_refresh']
+MONTHLY_LINES = ['facilities', 'fte']
+LINES = ['licensing', 'support', 'hardware_refresh', 'facilities', 'fte', 'implementation']
+
+
+def _schedule(total, months, billing):
+    """Spread a period total over months — evenly, or as annual in-advance tranches."""
+    flows = np.zeros(months)
+    if billing == 'monthly':
+        flows[:] = total / months
+        return flows
+    starts = np.arange(0, months, 12)
+    # A partial final year pays a pro-rated tranche
+    flows[starts] = total * np.minimum(12, months - starts) / months
+    return flows
+
+
+def spread(components, years, billing=None, implementation_months=0):
+    """Monthly flows per cost line, plus 'total', from unrounded TCO components."""
+    billing = billing or FINANCE['billing']
+    months = max(int(round(years * 12)), 1)
+    flows = {}
+    for line in LINES:
+        if line not in components:
+            continue
+        total = components[line]
+        if line in BILLED_LINES:
+            flows[line] = _schedule(total, months, billing)
+        elif line in TRANCHE_LINES:
+            flows[line] = _schedule(total, months, 'annual')
+        elif line in MONTHLY_LINES:
+            flows[line] = _schedule(total, months, 'monthly')
+        else:
+            span = min(max(int(implementation_months), 1), months)
+            flows[line] = np.zeros(months)
+            flows[line][:span] = total / span
+    flows['total'] = np.sum([flows[line] for line in LINES if line in flows], axis=0)
+    return flows
+
+
+def cumulative(flows):
+    """Running total with a leading zero — value at month m is the spend through m months."""
+    flows = np.asarray(flows, dtype='float64')
+    zero = np.zeros(flows.shape[:-1] + (1,))
+    return np.concatenate([zero, np.cumsum(flows, axis=-1)], axis=-1)
+
+
+def discount_factors(months, rate):
+    """Present-value factor for each month at an annual discount rate."""
+    return (1 + rate) ** (-np.arange(months) / 12)
+
+
+def npv(flows, rate=None):
+    """Net present value of monthly flows (months on the last axis)."""
+    rate = FINANCE['discount_rate'] if rate is None else rate
+    flows = np.asarray(flows, dtype='float64')
+    return flows @ discount_factors(flows.shape[-1], rate)
+
+
+def irr(flows, tol=1e-9, max_iter=200):
+    """Annual internal rate of return of monthly flows, or None without a sign change."""
+    flows = np.asarray(flows, dtype='float64')
+    if not (flows < 0).any() or not (flows > 0).any():
+        return None
+
+    # Bracket on a grid in one vectorized pass, then bisect
+    grid = np.concatenate([np.linspace(-0.99, 1.0, 200), np.geomspace(1.05, 1000, 120)])
+    values = (1 + grid[:, None]) ** (-np.arange(len(flows)) / 12) @ flows
+    crossings = np.nonzero(np.sign(values[:-1]) != np.sign(values[1:]))[0]
+    if not len(crossings):
+        return None
+    lo, hi = grid[crossings[0]], grid[crossings[0] + 1]
+    f_lo = npv(flows, lo)
+    for _ in range(max_iter):
+        mid = (lo + hi) / 2
+        f_mid = npv(flows, mid)
+        if abs(hi - lo) < tol or f_mid == 0:
+            break
+        if np.sign(f_mid) == np.sign(f_lo):
+            lo, f_lo = mid, f_mid
+        else:
+            hi = mid
+    return float((lo + hi) / 2)
+
+
+def discounted_payback(flows, rate=None):
+    """Months until cumulative discounted flows turn non-negative, or None within the period.
+
+    Pass rate=0 for simple payback. Interpolates within the crossing month.
+    """
+    rate = FINANCE['discount_rate'] if rate is None else rate
+    discounted = np.asarray(flows, dtype='float64') * discount_factors(len(flows), rate)
+    running = np.cumsum(discounted)
+    if running[0] >= 0:
+        return 0.0
+    recovered = np.nonzero(running >= 0)[0]
+    if not len(recovered):
+        return None
+    month = recovered[0]
+    return float(month - 1 + (-running[month - 1]) / discounted[month])
+
+
+def cash_flow_analysis(parsed_data, platform_name, overrides=None, discount_rate=None,
+                       billing=None, implementation_months=0):
+    """Month-by-month current vs platform flows and the investment metrics on their difference."""
+    rate = FINANCE['discount_rate'] if discount_rate is None else discount_rate
+    years = overrides.get('years', 3) if overrides else 3
+
+    current = spread(current_cost_components(parsed_data, overrides), years, billing)
+    platform = spread(platform_cost_components(parsed_data, platform_name, overrides), years,
+                      billing, implementation_months)
+    net = current['total'] - platform['total']
+
+    return {
+        'platform': platform_name,
+        'months': len(net),
+        'discount_rate': rate,
+        'current': current,
+        'platform_flows': platform,
+        'net': net,
+        'cumulative_net': cumulative(net),
+        'npv': float(npv(net, rate)),
+        'irr': irr(net),
+        'payback_months': discounted_payback(net, 0),
+        'discounted_payback_months': discounted_payback(net, rate),
+    }
+
+
+def cash_flow_summary(analysis):
+    """JSON-safe summary of cash_flow_analysis() for session state and exports."""
+    net = analysis['net']
+    annual_net = [round(float(net[start:start + 12].sum()), 2) for start in range(0, len(net), 12)]
+
+    def rounded(value, digits):
+        return None if value is None else round(value, digits)
+
+    return {
+        'npv': round(analysis['npv'], 2),
+        'irr_pct': rounded(analysis['irr'] * 100 if analysis['irr'] is not None else None, 1),
+        'payback_months': rounded(analysis['payback_months'], 1),
+        'discounted_payback_months': rounded(analysis['discounted_payback_months'], 1),
+        'discount_rate': analysis['discount_rate'],
+        'annual_net': annual_net,
+    }
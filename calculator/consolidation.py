@@ -0,0 +1,139 @@
+"""Bin-packing host consolidation from the per-VM inventory.
+
+Packs each VM's vCPU and vRAM onto a target host spec (pricing.defaults
+TARGET_HOST) with first-fit decreasing, then adds HA failover hosts per
+cluster. The result's 'hosts' replaces the flat hardware_efficiency
+factor when passed to calculate_platform_tco as overrides['effective_hosts'].
+
+VMs are grouped by identical (vCPU, vRAM) shape before packing. Placing
+identical items first-fit fills each open host to its limit in order, so
+a whole group is placed with a few array operations over the open hosts —
+exactly what item-by-item FFD would do, in time proportional to the number
+of distinct shapes rather than VMs.
+"""
+import math
+
+import numpy as np
+import pandas as pd
+
+from pricing.defaults import TARGET_HOST
+
+# vRAM is rounded up to this step before grouping, which bounds the number of shapes
+MEMORY_STEP_GB = 0.5
+
+
+def host_capacity(spec=None):
+    """Usable (vCPU, vRAM GB) per target host."""
+    s = {**TARGET_HOST, **(spec or {})}
+    vcpu = s['cores'] * s['vcpu_per_core'] * s['max_utilization']
+    memory = s['memory_gb'] * s['memory_overcommit'] * s['max_utilization']
+    return vcpu, memory
+
+
+def pack(cpus, memory_gb, capacity):
+    """First-fit decreasing vector bin packing.
+
+    Returns (used_cpu, used_mem, oversized) where the arrays hold the load on
+    each packed host and oversized counts VMs larger than a whole host (each
+    is given a dedicated host).
+    """
+    cap_cpu, cap_mem = capacity
+    cpus = np.asarray(cpus, dtype='float64')
+    memory = np.ceil(np.asarray(memory_gb, dtype='float64') / MEMORY_STEP_GB) * MEMORY_STEP_GB
+
+    shapes, counts = np.unique(np.column_stack([cpus, memory]), axis=0, return_counts=True)
+    # Largest dominant share first
+    order = np.argsort(-np.maximum(shapes[:, 0] / cap_cpu, shapes[:, 1] / cap_mem), kind='stable')
+
+    used_cpu = np.empty(0)
+    used_mem = np.empty(0)
+    oversized = 0
+
+    for (c, m), n in zip(shapes[order], counts[order]):
+        if c <= 0 and m <= 0:
+            continue
+        if c > cap_cpu or m > cap_mem:
+            oversized += int(n)
+            used_cpu = np.concatenate([used_cpu, np.full(n, c)])
+            used_mem = np.concatenate([used_mem, np.full(n, m)])
+            continue
+
+        # How many more of this shape each open host can take
+        with np.errstate(divide='ignore', invalid='ignore'):
+            fit_cpu = np.floor((cap_cpu - used_cpu) / c) if c > 0 else np.full(len(used_cpu), np.inf)
+            fit_mem = np.floor((cap_mem - used_mem) / m) if m > 0 else np.full(len(used_mem), np.inf)
+        fit = np.maximum(np.minimum(fit_cpu, fit_mem), 0)
+
+        # First-fit: fill open hosts in order until the group is placed
+        before = np.cumsum(fit) - fit
+        placed = np.clip(n - before, 0, fit)
+        used_cpu = used_cpu + placed * c
+        used_mem = used_mem + placed * m
+        remaining = int(n - placed.sum())
+
+        if remaining:
+            per_host = int(min(cap_cpu // c if c > 0 else math.inf, cap_mem // m if m > 0 else math.inf))
+            full, last = divmod(remaining, per_host)
+            loads = np.full(full + (1 if last else 0), per_host, dtype='float64')
+            if last:
+                loads[-1] = last
+            used_cpu = np.concatenate([used_cpu, loads * c])
+            used_mem = np.concatenate([used_mem, loads * m])
+
+    return used_cpu, used_mem, oversized
+
+
+def consolidate(vm_inventory, spec=None, by_cluster=False, include_powered_off=False):
+    """Size the target platform from per-VM demand.
+
+    With by_cluster, each source cluster is packed and given HA hosts on its
+    own; otherwise the estate is packed as a whole and split into target
+    clusters of at most max_cluster_hosts. Returns host counts, average
+    utilization of the packed hosts and the limiting resource.
+    """
+    s = {**TARGET_HOST, **(spec or {})}
+    capacity = host_capacity(s)
+
+    vms = vm_inventory
+    if not include_powered_off and 'power_state' in vms:
+        vms = vms[vms['power_state'] == 'poweredOn']
+    cpus = vms['cpus'].to_numpy(dtype='float64', na_value=0)
+    memory = vms['memory_gb'].to_numpy(dtype='float64', na_value=0)
+
+    if by_cluster and 'cluster' in vms:
+        codes = pd.Categorical(vms['cluster']).codes
+        order = np.argsort(codes, kind='stable')
+        groups = np.split(order, np.nonzero(np.diff(codes[order]))[0] + 1)
+    else:
+        groups = [np.arange(len(vms))]
+
+    packed_hosts = ha_hosts = clusters = oversized = 0
+    load_cpu = load_mem = 0.0
+    for idx in groups:
+        used_cpu, used_mem, group_oversized = pack(cpus[idx], memory[idx], capacity)
+        if not len(used_cpu):
+            continue
+        group_clusters = math.ceil(len(used_cpu) / max(s['max_cluster_hosts'] - s['ha_hosts_per_cluster'], 1))
+        packed_hosts += len(used_cpu)
+        ha_hosts += group_clusters * s['ha_hosts_per_cluster']
+        clusters += group_clusters
+        oversized += group_oversized
+        load_cpu += used_cpu.sum()
+        load_mem += used_mem.sum()
+
+    hosts = max(packed_hosts + ha_hosts, 3)
+    cpu_util = load_cpu / (packed_hosts * capacity[0]) if packed_hosts else 0
+    mem_util = load_mem / (packed_hosts * capacity[1]) if packed_hosts else 0
+
+    return {
+        'hosts': hosts,
+        'packed_hosts': packed_hosts,
+        'ha_hosts': ha_hosts,
+        'clusters': clusters,
+        'vms_placed': int(len(vms)),
+        'oversized_vms': oversized,
+        'cpu_utilization': round(float(cpu_util) * 100, 1),
+        'memory_utilization': round(float(mem_util) * 100, 1),
+        'limiting_resource': 'cpu' if cpu_util >= mem_util else 'memory',
+        'host_spec': s,
+    }
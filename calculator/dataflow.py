@@ -0,0 +1,203 @@
+"""Dependency-tracked recomputation of the analysis results.
+
+The pages each own a piece of the input — the parsed export (Environment),
+the current-state assumptions (Current TCO), scenario settings and pricing
+(Scenarios), discovery fit adjustments (Discovery) — and all of them read
+the derived results. Graph records which nodes each node read while it was
+computed, so changing an input only invalidates what actually depends on
+it, and the next read recomputes just those nodes:
+
+    parsed ──┬──────────────────────────► fit:<p> ───────────┐
+             ├─► current_tco ──────────┐                      │
+             └─► platform_tco:<p> ──► roi:<p> ─► scenario_results ─► recommendation
+    assumptions, scenario, pricing:<p> ──► overrides:<p> ─► cash_flow:<p>
+
+Node functions go through calculator.memo, so a recomputed node whose
+inputs match an earlier run is still served from the shared cache.
+"""
+from calculator.cashflow import cash_flow_summary
+from calculator.memo import (cached_cash_flow, cached_current_tco, cached_fit,
+                             cached_platform_tco, cached_roi, input_hash)
+from pricing.defaults import PLATFORMS
+
+# Session-state key holding each session's graph
+SESSION_KEY = 'analysis_graph'
+
+# Weighting of the combined recommendation score
+FIT_WEIGHT = 0.6
+ROI_WEIGHT = 0.4
+
+
+class MissingInput(KeyError):
+    """A node needs an input no page has provided yet."""
+
+
+class Graph:
+    """Inputs plus lazily computed nodes with dynamically recorded dependencies."""
+
+    def __init__(self):
+        self._funcs = {}
+        self._inputs = {}
+        self._input_hashes = {}
+        self._values = {}
+        self._dependents = {}
+        self._stack = []
+        self.recomputed = {}
+
+    def node(self, name, func):
+        """Register a derived node; func(graph) computes it via graph.get()."""
+        self._funcs[name] = func
+
+    def set_input(self, name, value):
+        """Set an input, invalidating its dependents only if the value changed."""
+        if name in self._inputs:
+            if self._inputs[name] is value:
+                return False
+            digest = input_hash(value)
+            if digest == self._input_hashes[name]:
+                self._inputs[name] = value
+                return False
+        else:
+            digest = input_hash(value)
+        self._inputs[name] = value
+        self._input_hashes[name] = digest
+        self._invalidate(name)
+        return True
+
+    def has_input(self, name):
+        return name in self._inputs
+
+    def get(self, name):
+        """Value of an input or node, recomputing the node if it is stale."""
+        if self._stack:
+            self._dependents.setdefault(name, set()).add(self._stack[-1])
+        if name in self._inputs:
+            return self._inputs[name]
+        if name not in self._funcs:
+            raise MissingInput(name)
+        if name not in self._values:
+            self._stack.append(name)
+            try:
+                self._values[name] = self._funcs[name](self)
+            finally:
+                self._stack.pop()
+            self.recomputed[name] = self.recomputed.get(name, 0) + 1
+        return self._values[name]
+
+    def _invalidate(self, name):
+        pending = [name]
+        while pending:
+            for dependent in self._dependents.pop(pending.pop(), ()):
+                if dependent in self._values:
+                    del self._values[dependent]
+                    pending.append(dependent)
+
+    def stale(self):
+        """Registered nodes without a current value."""
+        return [name for name in self._funcs if name not in self._values]
+
+
+def recommend(scenario_results):
+    """(recommended platform, combined scores) from fit score and ROI.
+
+    The ROI contribution is capped at 50 points.
+    """
+    scores = {}
+    for platform, r in scenario_results.items():
+        roi_score = min(r['roi_pct'] / 2, 50)
+        scores[platform] = round(r['fit']['fit_score'] * FIT_WEIGHT + roi_score * ROI_WEIGHT, 1)
+    return max(scores, key=scores.get), scores
+
+
+def _platform_overrides(graph, platform):
+    assumptions = graph.get('assumptions')
+    scenario = graph.get('scenario')
+    return {
+        'hardware': assumptions.get('hardware', {}),
+        'fte': assumptions.get('fte', {}),
+        'fte_count': assumptions.get('fte_count', 3),
+        'fte_reduction': scenario.get('fte_reduction', 0.40),
+        'hardware_efficiency': scenario.get('hardware_efficiency', 0.80),
+        'effective_hosts': scenario.get('effective_hosts'),
+        'years': assumptions.get('years', 3),
+        'pricing': graph.get(f'pricing:{platform}'),
+    }
+
+
+def _fit(graph, platform):
+    fit = cached_fit[platform](graph.get('parsed'))
+    adjustment = graph.get('fit_adjustments').get(platform)
+    if adjustment:
+        fit['fit_score'] = max(0, min(fit['fit_score'] + adjustment, 100))
+        if adjustment > 0:
+            fit['fit_reasons'].append(f"Discovery responses added +{adjustment} points")
+        else:
+            fit['fit_reasons'].append(f"Discovery responses adjusted {adjustment} points")
+    return fit
+
+
+def _scenario_results(graph):
+    results = {}
+    for platform in graph.get('selected_platforms'):
+        tco = graph.get(f'platform_tco:{platform}')
+        results[platform] = {
+            **tco,
+            **graph.get(f'roi:{platform}'),
+            'fit': graph.get(f'fit:{platform}'),
+            'cash_flow': cash_flow_summary(graph.get(f'cash_flow:{platform}')),
+        }
+    return results
+
+
+def build_graph():
+    """Graph of the analysis results for every known platform."""
+    graph = Graph()
+    graph.node('current_tco', lambda g: cached_current_tco(g.get('parsed'), g.get('assumptions')))
+    for platform in PLATFORMS:
+        graph.node(f'overrides:{platform}', lambda g, p=platform: _platform_overrides(g, p))
+        graph.node(f'platform_tco:{platform}',
+                   lambda g, p=platform: cached_platform_tco(g.get('parsed'), p, g.get(f'overrides:{p}')))
+        graph.node(f'roi:{platform}',
+                   lambda g, p=platform: cached_roi(g.get('current_tco'), g.get(f'platform_tco:{p}')))
+        graph.node(f'fit:{platform}', lambda g, p=platform: _fit(g, p))
+        graph.node(f'cash_flow:{platform}',
+                   lambda g, p=platform: cached_cash_flow(g.get('parsed'), p, g.get(f'overrides:{p}')))
+    graph.node('scenario_results', _scenario_results)
+    graph.node('recommendation', lambda g: recommend(g.get('scenario_results')))
+    return graph
+
+
+def session_graph(state):
+    """The graph stored in a session state mapping, created on first use."""
+    if state.get(SESSION_KEY) is None:
+        state[SESSION_KEY] = build_graph()
+    return state[SESSION_KEY]
+
+
+def session_recommendation(state):
+    """recommend() for the session's scenario results, from the graph when it has them."""
+    graph = session_graph(state)
+    if graph.has_input('scenario') and graph.has_input('selected_platforms'):
+        return graph.get('recommendation')
+    return recommend(state['scenario_results'])
+
+
+def sync_session(state):
+    """Feed the session's inputs to its graph and write back current results.
+
+    Reads parsed_data, assumptions and discovery from state and refreshes
+    current_tco and scenario_results there, recomputing only what changed.
+    scenario_results is left as it is until the Scenarios page has
+    provided its inputs, e.g. right after a saved session was loaded.
+    Returns the graph.
+    """
+    graph = session_graph(state)
+    if not state.get('parsed_data') or not state.get('assumptions'):
+        return graph
+    graph.set_input('parsed', state['parsed_data'])
+    graph.set_input('assumptions', state['assumptions'])
+    graph.set_input('fit_adjustments', (state.get('discovery') or {}).get('fit_adjustments', {}))
+    state['current_tco'] = graph.get('current_tco')
+    if graph.has_input('scenario') and graph.has_input('selected_platforms'):
+        state['scenario_results'] = graph.get('scenario_results')
+    return graph
@@ -0,0 +1,182 @@
+"""Goal seek — solve for the input value that hits a TCO or ROI target.
+
+Inputs use the same keys as calculator.sensitivity ('pricing.unit_price',
+'hardware.avg_host_cost', 'fte_reduction', ...) plus 'parsed.total_hosts'
+and 'parsed.total_physical_cores' for environment size.
+
+Most inputs enter the cost model linearly, and savings, total and ROI
+targets all reduce to an affine equation in them, so two evaluations give
+the exact answer. Inputs behind rounding or min/max steps (consolidation,
+host and core counts) and payback targets fall back to bracketing:
+a coarse scan for a sign change, then Illinois-variant regula falsi.
+"""
+import math
+
+from calculator.sensitivity import _base_value, _perturb
+from calculator.tco import (CURRENT_COMPONENTS, PLATFORM_COMPONENTS,
+                            current_cost_components, platform_cost_components)
+from pricing.defaults import PLATFORMS
+
+# Inputs the platform and current-state totals are affine in
+LINEAR_INPUTS = {
+    'hardware.avg_host_cost',
+    'hardware.power_cost_per_kwh',
+    'hardware.datacenter_cost_per_host',
+    'fte.avg_fully_loaded_cost',
+    'pricing.unit_price',
+    'pricing.support_percentage',
+    'fte_reduction',
+    'fte_count',
+    'years',
+}
+
+INTEGER_INPUTS = {'parsed.total_hosts', 'parsed.total_physical_cores'}
+
+DEFAULT_BOUNDS = {
+    'fte_reduction': (0.0, 1.0),
+    'hardware_efficiency': (0.01, 1.0),
+    'pricing.support_percentage': (0.0, 1.0),
+    'years': (1, 10),
+}
+
+METRICS = ['savings', 'roi_pct', 'total', 'payback_months']
+
+
+def _apply(parsed_data, key, value, overrides, platform):
+    """(parsed_data, overrides) with one input set to value."""
+    if key.startswith('parsed.'):
+        return {**parsed_data, key.partition('.')[2]: value}, overrides
+    if key == 'years':
+        return parsed_data, {**overrides, 'years': value}
+    return parsed_data, _perturb(key, value, overrides, platform)
+
+
+def _totals(parsed_data, platform_name, overrides, compare_to, compare_overrides):
+    """Unrounded (reference total, platform total, implementation, years)."""
+    c = platform_cost_components(parsed_data, platform_name, overrides)
+    if compare_to:
+        ref = platform_cost_components(parsed_data, compare_to, compare_overrides)
+        reference = sum(ref[k] for k in PLATFORM_COMPONENTS)
+    else:
+        cur = current_cost_components(parsed_data, overrides)
+        reference = sum(cur[k] for k in CURRENT_COMPONENTS)
+    return reference, sum(c[k] for k in PLATFORM_COMPONENTS), c['implementation'], overrides.get('years', 3)
+
+
+def _residual(metric, target, reference, total, implementation, years):
+    """Distance from target; affine in any LINEAR_INPUTS for all but payback."""
+    if metric == 'total':
+        return total - target
+    if metric == 'savings':
+        return (reference - total) - target
+    if metric == 'roi_pct':
+        # savings / total * 100 = target  <=>  reference - (1 + target/100) * total = 0
+        return reference - (1 + target / 100) * total
+    if metric == 'payback_months':
+        monthly = (reference - total) / max(years * 12, 1)
+        return (implementation / monthly if monthly > 0 else math.inf) - target
+    raise ValueError(f"Unknown metric: {metric}")
+
+
+def goal_seek(parsed_data, platform_name, input_key, metric='savings', target=0.0,
+              overrides=None, pricing=None, compare_to=None, bounds=None, tol=1e-6, max_iter=100):
+    """Find the value of input_key that brings metric to target for platform_name.
+
+    Savings, ROI and payback are measured against the current state, or
+    against another platform when compare_to is given — e.g. the VCF price
+    at which VCF costs the same as Nutanix is
+    goal_seek(parsed, 'VMware VCF', 'pricing.unit_price', compare_to='Nutanix').
+
+    overrides and pricing follow calculator.sensitivity.tornado. Returns a
+    dict with the solved value, the method used, the iteration count and
+    'feasible' — False when no value within bounds reaches the target.
+    """
+    overrides = overrides or {}
+    pricing = pricing or {}
+    subject_overrides = {**overrides, 'pricing': pricing[platform_name]} if platform_name in pricing else overrides
+    compare_overrides = {**overrides, 'pricing': pricing[compare_to]} if compare_to in pricing else overrides
+    platform = {**PLATFORMS[platform_name], **subject_overrides.get('pricing', {})}
+
+    if input_key.startswith('parsed.'):
+        name = input_key.partition('.')[2]
+        base = parsed_data.get(name) or (parsed_data.get('total_hosts', 0) * 20 if name == 'total_physical_cores' else 0)
+    elif input_key == 'years':
+        base = overrides.get('years', 3)
+    else:
+        base = _base_value(input_key, subject_overrides, platform)
+
+    def g(x):
+        data, ov = _apply(parsed_data, input_key, x, subject_overrides, platform)
+        if input_key.startswith('pricing.'):
+            cmp_ov = compare_overrides
+        else:
+            _, cmp_ov = _apply(parsed_data, input_key, x, compare_overrides, platform)
+        return _residual(metric, target, *_totals(data, platform_name, ov, compare_to, cmp_ov))
+
+    result = {'input': input_key, 'platform': platform_name, 'metric': metric, 'target': target,
+              'base_value': base, 'compare_to': compare_to}
+
+    # ── Closed form ──────────────────────────────────────────────
+    if input_key in LINEAR_INPUTS and metric != 'payback_months':
+        x0 = float(base)
+        x1 = x0 + (abs(x0) * 0.1 or 1.0)
+        g0, g1 = g(x0), g(x1)
+        if g1 == g0:
+            return {**result, 'value': None, 'method': 'closed_form', 'iterations': 2, 'feasible': False}
+        value = x0 - g0 * (x1 - x0) / (g1 - g0)
+        lo, hi = bounds or DEFAULT_BOUNDS.get(input_key, (0, math.inf))
+        return {**result, 'value': value, 'method': 'closed_form', 'iterations': 2,
+                'feasible': lo <= value <= hi}
+
+    # ── Bracketing ───────────────────────────────────────────────
+    lo, hi = bounds or DEFAULT_BOUNDS.get(input_key, (0, max(float(base), 1.0) * 10))
+    bracket, evaluations = _find_bracket(g, lo, hi)
+    if bracket is None:
+        return {**result, 'value': None, 'method': 'bracket', 'iterations': evaluations, 'feasible': False}
+
+    value, iterations = _regula_falsi(g, *bracket, tol=tol, max_iter=max_iter)
+    if input_key in INTEGER_INPUTS:
+        candidates = [math.floor(value), math.ceil(value)]
+        value = min(candidates, key=lambda x: abs(g(x)))
+    return {**result, 'value': value, 'method': 'bracket', 'iterations': evaluations + iterations,
+            'feasible': True}
+
+
+def _find_bracket(g, lo, hi, steps=32):
+    """Scan [lo, hi] for the first sign change; returns ((a, ga, b, gb), evaluations)."""
+    prev_x, prev_g = lo, g(lo)
+    if prev_g == 0:
+        return (lo, prev_g, lo, prev_g), 1
+    for i in range(1, steps + 1):
+        x = lo + (hi - lo) * i / steps
+        gx = g(x)
+        if gx == 0 or (gx > 0) != (prev_g > 0):
+            return (prev_x, prev_g, x, gx), i + 1
+        prev_x, prev_g = x, gx
+    return None, steps + 1
+
+
+def _regula_falsi(g, a, ga, b, gb, tol=1e-6, max_iter=100):
+    """Illinois regula falsi on a bracket, bisecting while either end is infinite."""
+    if ga == 0:
+        return a, 0
+    side = 0
+    for i in range(1, max_iter + 1):
+        if math.isinf(ga) or math.isinf(gb) or ga == gb:
+            x = (a + b) / 2
+        else:
+            x = (a * gb - b * ga) / (gb - ga)
+        gx = g(x)
+        if gx == 0 or abs(b - a) < tol * max(1.0, abs(x)):
+            return x, i
+        if (gx > 0) == (gb > 0):
+            b, gb = x, gx
+            if side == -1:
+                ga /= 2
+            side = -1
+        else:
+            a, ga = x, gx
+            if side == 1:
+                gb /= 2
+            side = 1
+    return (a + b) / 2, max_iter
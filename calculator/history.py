@@ -0,0 +1,112 @@
+"""Deltas and structured diffs between saved versions of a customer analysis.
+
+Every save of a customer is a version; calculator.sessions numbers them
+in save order. A changed JSON section is stored as a delta against the
+same section of the previous version — the leaf values set and the keys
+removed — and rebuilt by applying the delta chain to the nearest full
+copy. diff_sessions reports the same kind of changes for display, with
+old and new values side by side.
+
+Paths are lists of dict keys. Lists are compared as whole values, and a
+dict whose key order changed is replaced outright, so applying a delta
+reproduces the new value exactly, key order included.
+"""
+
+# Sections compared on the Customer Manager page
+DIFF_SECTIONS = ['assumptions', 'quotes', 'scenario_results']
+
+
+def _same(a, b):
+    """Equal with the same types and dict key order all the way down (== ignores both)."""
+    if type(a) is not type(b) or a != b:
+        return False
+    if isinstance(a, dict):
+        return list(a) == list(b) and all(_same(a[k], b[k]) for k in a)
+    if isinstance(a, list):
+        return all(_same(x, y) for x, y in zip(a, b))
+    return True
+
+
+def json_delta(old, new):
+    """{'set': [[path, value], ...], 'unset': [path, ...]} turning old into new."""
+    delta = {'set': [], 'unset': []}
+    _delta(old, new, [], delta)
+    return delta
+
+
+def _delta(old, new, path, delta):
+    if _same(old, new):
+        return
+    if not (isinstance(old, dict) and isinstance(new, dict)):
+        delta['set'].append([path, new])
+        return
+    kept = [k for k in old if k in new]
+    if list(new)[:len(kept)] != kept:
+        delta['set'].append([path, new])
+        return
+    for key in old:
+        if key not in new:
+            delta['unset'].append(path + [key])
+    for key, value in new.items():
+        if key in old:
+            _delta(old[key], value, path + [key], delta)
+        else:
+            delta['set'].append([path + [key], value])
+
+
+def apply_delta(value, delta):
+    """Value produced by applying a json_delta to value, which is modified in place."""
+    for path in delta['unset']:
+        parent = value
+        for key in path[:-1]:
+            parent = parent[key]
+        del parent[path[-1]]
+    for path, new in delta['set']:
+        if not path:
+            value = new
+            continue
+        parent = value
+        for key in path[:-1]:
+            parent = parent[key]
+        parent[path[-1]] = new
+    return value
+
+
+def flatten(value, path=()):
+    """{path tuple: leaf} for the nested dicts in value."""
+    if not isinstance(value, dict) or not value:
+        return {path: value}
+    leaves = {}
+    for key, item in value.items():
+        leaves.update(flatten(item, path + (str(key),)))
+    return leaves
+
+
+def diff_sessions(old, new, sections=None):
+    """Changes from one loaded session to another.
+
+    Returns a list of {'section', 'path', 'change', 'old', 'new'} rows, where
+    path is the dotted key within the section and change is 'added',
+    'removed' or 'changed'. Missing and None sections count as empty.
+    """
+    changes = []
+    for section in sections or DIFF_SECTIONS:
+        before = flatten(old.get(section)) if old.get(section) else {}
+        after = flatten(new.get(section)) if new.get(section) else {}
+        for path in list(before) + [p for p in after if p not in before]:
+            if path not in after:
+                change = 'removed'
+            elif path not in before:
+                change = 'added'
+            elif _same(before[path], after[path]):
+                continue
+            else:
+                change = 'changed'
+            changes.append({
+                'section': section,
+                'path': '.'.join(path),
+                'change': change,
+                'old': before.get(path),
+                'new': after.get(path),
+            })
+    return changes
@@ -0,0 +1,190 @@
+"""Memoized calculations shared across sessions.
+
+Streamlit reruns a page on every widget interaction, so the same TCO,
+ROI, fit and cash-flow calls are repeated with identical inputs. Each
+call here is keyed by a SHA-256 of its canonicalized arguments — the
+parsed summary plus overrides — and served from a bounded in-process LRU,
+so every session in the server shares one cache.
+
+Tabular members of the parsed data (vm_inventory, host_inventory) are
+left out of the key: the summary fields already derived from them are
+what these calculations read. Parsed data is never modified after
+parsing, so its digest is computed once per object and reused for every
+call on a rerun. Results are deep-copied on the way in and out because
+pages adjust fit scores and reasons in place.
+"""
+import copy
+import functools
+import hashlib
+import json
+import math
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from calculator.cashflow import cash_flow_analysis
+from calculator.platforms.azure_stack import get_azure_stack_tco
+from calculator.platforms.nutanix import get_nutanix_tco
+from calculator.platforms.openshift import get_openshift_tco
+from calculator.platforms.vcf import get_vcf_tco
+from calculator.tco import calculate_current_tco, calculate_platform_tco, calculate_roi
+
+MAX_ENTRIES = 4096
+
+# Parsed-data objects whose digest is remembered by identity
+MAX_DIGESTS = 64
+
+TABULAR = (pd.DataFrame, pd.Series, np.ndarray)
+
+
+def canonical(value):
+    """JSON-ready form of value that is identical for equal inputs.
+
+    Dict keys are stringified and sorted, tuples become lists, NumPy
+    scalars become Python numbers and integral floats become ints, so
+    3 and 3.0 (or np.float64(3)) hash alike. DataFrames, Series and
+    arrays are dropped.
+    """
+    if isinstance(value, dict):
+        return {str(k): canonical(v) for k, v in value.items() if not isinstance(v, TABULAR)}
+    if isinstance(value, (list, tuple)):
+        return [canonical(v) for v in value]
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float):
+        if math.isfinite(value) and value.is_integer():
+            return int(value)
+        return repr(value)
+    return value
+
+
+def input_hash(*parts):
+    """SHA-256 hex digest of the canonical form of parts."""
+    payload = json.dumps(canonical(parts), sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+_digests = OrderedDict()
+_digests_lock = threading.Lock()
+
+
+def _argument_key(value):
+    """Stand-in for an argument in the cache key.
+
+    Parsed data (a dict carrying inventory frames) is replaced by its digest,
+    remembered by object identity so the summary is only hashed once. The
+    object itself is held alongside so its id cannot be reused while cached.
+    """
+    if not isinstance(value, dict) or not any(isinstance(v, TABULAR) for v in value.values()):
+        return value
+    with _digests_lock:
+        entry = _digests.get(id(value))
+        if entry is not None and entry[0] is value:
+            _digests.move_to_end(id(value))
+            return entry[1]
+    digest = input_hash(value)
+    with _digests_lock:
+        _digests[id(value)] = (value, digest)
+        while len(_digests) > MAX_DIGESTS:
+            _digests.popitem(last=False)
+    return digest
+
+
+class LRUCache:
+    """Thread-safe bounded LRU with hit, miss and eviction counters."""
+
+    def __init__(self, max_entries=MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.evictions = 0
+        self.by_function = {}
+
+    def _count(self, name, outcome):
+        counts = self.by_function.setdefault(name, {'hits': 0, 'misses': 0})
+        counts[outcome] += 1
+
+    def get(self, key, name=None):
+        """(True, value) on a hit, (False, None) on a miss."""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                self._count(name, 'hits')
+                return True, self._entries[key]
+            self.misses += 1
+            self._count(name, 'misses')
+            return False, None
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """Drop every entry and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+            self.by_function = {}
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+                'by_function': {name: dict(counts) for name, counts in self.by_function.items()},
+            }
+
+
+CACHE = LRUCache()
+
+
+def memoize(func, cache=CACHE):
+    """Wrap func so equal arguments are served from cache."""
+    name = f"{func.__module__}.{func.__qualname__}"
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        key = input_hash(name, [_argument_key(a) for a in args],
+                         {k: _argument_key(v) for k, v in kwargs.items()})
+        hit, value = cache.get(key, name)
+        if hit:
+            return copy.deepcopy(value)
+        value = func(*args, **kwargs)
+        cache.put(key, copy.deepcopy(value))
+        return value
+    return wrapper
+
+
+cached_current_tco = memoize(calculate_current_tco)
+cached_platform_tco = memoize(calculate_platform_tco)
+cached_roi = memoize(calculate_roi)
+cached_cash_flow = memoize(cash_flow_analysis)
+
+# Platform fit and notes, keyed like pages/5_scenarios.py platform_fit_funcs
+cached_fit = {
+    'VMware VCF': memoize(get_vcf_tco),
+    'Nutanix': memoize(get_nutanix_tco),
+    'Red Hat OpenShift': memoize(get_openshift_tco),
+    'Azure Stack HCI': memoize(get_azure_stack_tco),
+}
+
+
+def cache_stats():
+    """Hit/miss counters and occupancy of the shared calculation cache."""
+    return CACHE.stats()
+
+
+def clear_cache():
+    CACHE.clear()
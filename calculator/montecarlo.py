@@ -0,0 +1,99 @@
+"""Monte Carlo ranges for TCO and ROI.
+
+Each input listed in pricing.defaults.UNCERTAINTY is drawn as a multiplier
+on its point estimate (the default, or the caller's override), and the
+draws are run through the vectorized math in calculator.batch. Current
+state and every platform share the same hardware and labor draws, so the
+savings spread reflects the platform choice rather than sampling noise.
+"""
+import numpy as np
+
+from calculator.batch import _resolve, batch_current_tco, batch_platform_tco, batch_roi
+from pricing.defaults import PLATFORMS, UNCERTAINTY
+
+PERCENTILES = (5, 10, 50, 90, 95)
+METRICS = ['savings', 'roi_pct', 'payback_months', 'total']
+
+
+def sample_multipliers(draws, seed=None, uncertainty=None):
+    """Draw a multiplier array per UNCERTAINTY key from triangular(low, 1, high)."""
+    rng = np.random.default_rng(seed)
+    uncertainty = UNCERTAINTY if uncertainty is None else uncertainty
+    samples = {}
+    # Sorted so a given seed yields the same draws regardless of dict order
+    for key in sorted(uncertainty):
+        low, high = uncertainty[key]
+        if low == high:
+            samples[key] = np.full(draws, float(low))
+        else:
+            samples[key] = rng.triangular(min(low, 1.0), 1.0, max(high, 1.0), draws)
+    return samples
+
+
+def _scaled(base, prefix, samples):
+    """Apply the '<prefix>.<key>' multipliers to a pricing dict."""
+    scaled = dict(base)
+    for key, mult in samples.items():
+        section, _, name = key.partition('.')
+        if section == prefix and name in scaled:
+            scaled[name] = scaled[name] * mult
+    return scaled
+
+
+def simulate(parsed_data, platform_names=None, overrides=None, draws=100000, seed=None,
+             uncertainty=None, percentiles=PERCENTILES):
+    """Run draws Monte Carlo trials and summarize each platform.
+
+    Returns {'draws', 'seed', 'current_total', 'platforms'} where platforms
+    maps each name to {metric: {'p5': ..., 'p50': ..., 'mean': ...}} for
+    metric in METRICS, plus 'prob_positive'. Pass seed for reproducible results.
+    """
+    platform_names = platform_names or list(PLATFORMS)
+    overrides = overrides or {}
+    samples = sample_multipliers(draws, seed, uncertainty)
+    ones = np.ones(draws)
+
+    h, f, _ = _resolve(parsed_data, overrides=overrides)
+    trial_overrides = {
+        **overrides,
+        'hardware': _scaled(h, 'hardware', samples),
+        'fte': _scaled(f, 'fte', samples),
+    }
+    current = batch_current_tco(parsed_data, trial_overrides)
+
+    fte_reduction = np.clip(overrides.get('fte_reduction', 0.40) * samples.get('fte_reduction', ones), 0, 1)
+    efficiency = np.clip(overrides.get('hardware_efficiency', 0.80) * samples.get('hardware_efficiency', ones), 0.01, 1)
+
+    results = {}
+    for name in platform_names:
+        _, _, platform = _resolve(parsed_data, name, overrides)
+        price_key = 'cost_per_core_per_year' if platform['model'] == 'per_core' else 'cost_per_node_per_year'
+        unit_price = platform[price_key] * samples.get('pricing.unit_price', ones)
+        support_pct = platform['support_percentage'] * samples.get('pricing.support_percentage', ones)
+
+        platform_overrides = {
+            **trial_overrides,
+            'pricing': {**overrides.get('pricing', {}), 'support_percentage': support_pct},
+        }
+        tco = batch_platform_tco(parsed_data, name, platform_overrides, unit_price=unit_price,
+                                 fte_reduction=fte_reduction, hardware_efficiency=efficiency)
+        outcome = {**batch_roi(current, tco), 'total': tco['total']}
+
+        summary = {metric: summarize(outcome[metric], percentiles) for metric in METRICS}
+        summary['prob_positive'] = round(float(outcome['is_positive'].mean()), 4)
+        results[name] = summary
+
+    return {
+        'draws': draws,
+        'seed': seed,
+        'current_total': summarize(current['total'], percentiles),
+        'platforms': results,
+    }
+
+
+def summarize(values, percentiles=PERCENTILES):
+    """Percentiles and mean of a draw array, keyed 'p5', 'p50', ..., 'mean'."""
+    points = np.percentile(values, percentiles)
+    summary = {f"p{p:g}": round(float(v), 2) for p, v in zip(percentiles, points)}
+    summary['mean'] = round(float(np.mean(values)), 2)
+    return summary
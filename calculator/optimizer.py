@@ -0,0 +1,101 @@
+"""Best case per platform and the Pareto frontier of TCO versus fit.
+
+Fit scores do not depend on pricing, consolidation or FTE reduction, and
+platform TCO only rises with price and consolidation efficiency and only
+falls with FTE reduction. Within any ranges of those, a platform's
+cheapest scenario is therefore the corner at the lowest price, the lowest
+efficiency and the highest FTE reduction. best_case evaluates that one
+point per platform instead of searching a grid, and the frontier is taken
+over the best cases: a platform is on it unless a better- or equally-
+fitting platform is cheaper still.
+"""
+import numpy as np
+
+from calculator.batch import batch_current_tco, batch_platform_tco, batch_roi
+from calculator.memo import cached_fit
+from pricing.defaults import PLATFORMS
+
+# (low, high) of each scenario setting searched for the best case
+DEFAULT_RANGES = {
+    'price_factor': (0.5, 1.5),
+    'hardware_efficiency': (0.6, 1.0),
+    'fte_reduction': (0.0, 0.6),
+}
+
+
+def pareto_front(costs, scores):
+    """Indices of the points no other point beats on both lower cost and higher score.
+
+    Ties go to the first point, so duplicates appear once. Indices are
+    returned from best to worst score.
+    """
+    costs = np.asarray(costs, dtype='float64')
+    scores = np.asarray(scores, dtype='float64')
+    if not len(costs):
+        return np.empty(0, dtype='int64')
+    order = np.lexsort((np.arange(len(costs)), costs, -scores))
+    ordered = costs[order]
+    cheapest_before = np.concatenate([[np.inf], np.minimum.accumulate(ordered)[:-1]])
+    return order[ordered < cheapest_before]
+
+
+def _unit_price_key(platform):
+    return 'cost_per_core_per_year' if platform['model'] == 'per_core' else 'cost_per_node_per_year'
+
+
+def best_case(parsed_data, platform_names=None, overrides=None, pricing=None, fits=None, ranges=None):
+    """Each platform's cheapest scenario within ranges, and the TCO-vs-fit frontier.
+
+    overrides and pricing follow calculator.sensitivity.tornado; ranges
+    bound fte_reduction, hardware_efficiency and price_factor (a multiple
+    of each platform's own unit price), defaulting to DEFAULT_RANGES. A
+    bin-packed effective_hosts override is ignored because consolidation
+    is one of the ranges. fits maps platforms to fit scores, by default the
+    platform fit functions.
+
+    Returns {'frontier': [...], 'candidates': [...]}. candidates holds
+    every platform's best case, best fit first, with an 'on_frontier' flag.
+    """
+    platform_names = platform_names or list(PLATFORMS)
+    overrides = {k: v for k, v in (overrides or {}).items() if k != 'effective_hosts'}
+    pricing = pricing or {}
+    ranges = {**DEFAULT_RANGES, **(ranges or {})}
+    if fits is None:
+        fits = {name: cached_fit[name](parsed_data)['fit_score'] for name in platform_names}
+
+    # The cheapest corner of the ranges
+    price_factor = min(ranges['price_factor'])
+    efficiency = min(ranges['hardware_efficiency'])
+    reduction = max(ranges['fte_reduction'])
+
+    current = batch_current_tco(parsed_data, overrides)
+    candidates = []
+    for name in sorted(platform_names, key=lambda n: -fits[n]):
+        platform_overrides = {**overrides, 'pricing': pricing[name]} if name in pricing else overrides
+        platform = {**PLATFORMS[name], **platform_overrides.get('pricing', {})}
+        unit_price = price_factor * platform[_unit_price_key(platform)]
+        tco = batch_platform_tco(parsed_data, name, platform_overrides, unit_price=unit_price,
+                                 hardware_efficiency=efficiency, fte_reduction=reduction)
+        roi = batch_roi(current, tco)
+        candidates.append({
+            'platform': name,
+            'fit_score': fits[name],
+            'total': float(tco['total']),
+            'savings': float(roi['savings']),
+            'roi_pct': round(float(roi['roi_pct']), 1),
+            'payback_months': round(float(roi['payback_months']), 1),
+            'price_factor': round(float(price_factor), 4),
+            'unit_price': round(float(unit_price), 2),
+            'hardware_efficiency': round(float(efficiency), 4),
+            'fte_reduction': round(float(reduction), 4),
+            'effective_hosts': int(tco['effective_hosts']),
+        })
+
+    on_frontier = set(pareto_front([c['total'] for c in candidates], [c['fit_score'] for c in candidates]))
+    for i, c in enumerate(candidates):
+        c['on_frontier'] = i in on_frontier
+
+    return {
+        'frontier': [c for c in candidates if c['on_frontier']],
+        'candidates': candidates,
+    }
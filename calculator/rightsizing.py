@@ -0,0 +1,115 @@
+"""Right-size VMs from per-VM utilization.
+
+Uses the utilization columns LiveOptics exports carry (peak and average
+CPU and memory percent, see parser.inventory.UTILIZATION_COLUMNS). Each
+powered-on VM with utilization data is resized so its peak (or average)
+demand would sit at the RIGHTSIZING target percentage; VMs without data
+keep their allocation. Sizes only ever shrink. All math is column-wise
+over the inventory, so 100k+ VM estates take milliseconds.
+"""
+import numpy as np
+import pandas as pd
+
+from pricing.defaults import RIGHTSIZING
+
+BASIS_COLUMNS = {
+    'peak': ('cpu_peak_pct', 'mem_peak_pct'),
+    'average': ('cpu_avg_pct', 'mem_avg_pct'),
+}
+
+
+def has_utilization(vm_inventory, settings=None):
+    """True when the inventory carries the utilization columns the basis needs."""
+    s = {**RIGHTSIZING, **(settings or {})}
+    return vm_inventory is not None and any(c in vm_inventory for c in BASIS_COLUMNS[s['basis']])
+
+
+def rightsize(vm_inventory, settings=None):
+    """Per-VM recommended vCPU and vRAM.
+
+    Returns a frame with vm, cluster, cpus, memory_gb, rec_cpus,
+    rec_memory_gb, reclaim_vcpu and reclaim_memory_gb, aligned to the
+    inventory's index.
+    """
+    s = {**RIGHTSIZING, **(settings or {})}
+    cpu_col, mem_col = BASIS_COLUMNS[s['basis']]
+
+    cpus = vm_inventory['cpus'].to_numpy(dtype='float64', na_value=0)
+    memory = vm_inventory['memory_gb'].to_numpy(dtype='float64', na_value=0)
+    powered_on = (vm_inventory['power_state'] == 'poweredOn').to_numpy(dtype=bool, na_value=False)
+
+    def utilization(column):
+        if column not in vm_inventory:
+            return np.full(len(vm_inventory), np.nan)
+        return np.clip(vm_inventory[column].to_numpy(dtype='float64', na_value=np.nan), 0, 100)
+
+    cpu_util = utilization(cpu_col)
+    mem_util = utilization(mem_col)
+
+    # Demand at the basis utilization, resized to land at the target level
+    rec_cpus = np.ceil(cpus * cpu_util / s['cpu_target_pct'])
+    rec_cpus = np.clip(rec_cpus, s['min_vcpu'], None)
+    step = s['memory_step_gb']
+    rec_memory = np.ceil(memory * mem_util / s['mem_target_pct'] / step) * step
+    rec_memory = np.clip(rec_memory, s['min_memory_gb'], None)
+
+    # Never grow a VM, and leave VMs without data (or not running) as they are
+    rec_cpus = np.where(powered_on & ~np.isnan(cpu_util), np.minimum(rec_cpus, cpus), cpus)
+    rec_memory = np.where(powered_on & ~np.isnan(mem_util), np.minimum(rec_memory, memory), memory)
+
+    return pd.DataFrame({
+        'vm': vm_inventory['vm'],
+        'cluster': vm_inventory['cluster'],
+        'cpus': cpus.astype('int32'),
+        'memory_gb': memory.astype('float32'),
+        'rec_cpus': rec_cpus.astype('int32'),
+        'rec_memory_gb': rec_memory.astype('float32'),
+        'reclaim_vcpu': (cpus - rec_cpus).astype('int32'),
+        'reclaim_memory_gb': (memory - rec_memory).astype('float32'),
+    }, index=vm_inventory.index)
+
+
+def reclaim_by_cluster(rightsized):
+    """Allocated, recommended and reclaimable capacity per source cluster."""
+    resized = (rightsized['reclaim_vcpu'] > 0) | (rightsized['reclaim_memory_gb'] > 0)
+    by_cluster = rightsized.assign(resized_vms=resized, vms=1).groupby('cluster', observed=True).agg(
+        vms=('vms', 'sum'),
+        resized_vms=('resized_vms', 'sum'),
+        vcpu=('cpus', 'sum'),
+        rec_vcpu=('rec_cpus', 'sum'),
+        reclaim_vcpu=('reclaim_vcpu', 'sum'),
+        memory_gb=('memory_gb', 'sum'),
+        rec_memory_gb=('rec_memory_gb', 'sum'),
+        reclaim_memory_gb=('reclaim_memory_gb', 'sum'),
+    )
+    by_cluster['reclaim_vcpu_pct'] = (by_cluster['reclaim_vcpu'] / by_cluster['vcpu'].clip(lower=1) * 100).round(1)
+    by_cluster['reclaim_memory_pct'] = (by_cluster['reclaim_memory_gb'].astype('float64')
+                                        / by_cluster['memory_gb'].clip(lower=1) * 100).round(1)
+    return by_cluster.sort_values('reclaim_vcpu', ascending=False).reset_index()
+
+
+def rightsizing_summary(rightsized):
+    """Estate-wide totals from rightsize()."""
+    vcpu = int(rightsized['cpus'].sum())
+    memory = float(rightsized['memory_gb'].astype('float64').sum())
+    reclaim_vcpu = int(rightsized['reclaim_vcpu'].sum())
+    reclaim_memory = float(rightsized['reclaim_memory_gb'].astype('float64').sum())
+    return {
+        'resized_vms': int(((rightsized['reclaim_vcpu'] > 0) | (rightsized['reclaim_memory_gb'] > 0)).sum()),
+        'total_vcpu': vcpu,
+        'reclaim_vcpu': reclaim_vcpu,
+        'reclaim_vcpu_pct': round(reclaim_vcpu / max(vcpu, 1) * 100, 1),
+        'total_vram_gb': round(memory, 2),
+        'reclaim_memory_gb': round(reclaim_memory, 2),
+        'reclaim_memory_pct': round(reclaim_memory / max(memory, 1) * 100, 1),
+    }
+
+
+def rightsized_inventory(vm_inventory, settings=None):
+    """Copy of the inventory with cpus and memory_gb replaced by the recommendations.
+
+    Pass the result to calculator.consolidation.consolidate to size hosts
+    for the reduced demand.
+    """
+    rightsized = rightsize(vm_inventory, settings)
+    return vm_inventory.assign(cpus=rightsized['rec_cpus'], memory_gb=rightsized['rec_memory_gb'])
@@ -0,0 +1,148 @@
+"""One-at-a-time sensitivity analysis for tornado charts.
+
+Each input is moved to the low and high end of its range while everything
+else stays at the base case. Every input only feeds a few cost
+components (INPUT_COMPONENTS), so the base components are computed once
+and only the affected ones are recomputed for each perturbation.
+"""
+from calculator.tco import (CURRENT_COMPONENTS, PLATFORM_COMPONENTS, calculate_roi,
+                            current_cost_components, platform_cost_components)
+from pricing.defaults import HARDWARE, FTE, PLATFORMS, UNCERTAINTY
+
+INPUT_LABELS = {
+    'hardware.avg_host_cost': 'Host Cost',
+    'hardware.power_cost_per_kwh': 'Power Cost ($/kWh)',
+    'hardware.datacenter_cost_per_host': 'Datacenter Cost per Host',
+    'fte.avg_fully_loaded_cost': 'FTE Fully Loaded Cost',
+    'pricing.unit_price': 'Platform License Price',
+    'pricing.support_percentage': 'Platform Support %',
+    'fte_reduction': 'FTE Reduction',
+    'hardware_efficiency': 'Hardware Consolidation',
+    'fte_count': 'FTE Count',
+}
+
+# Cost components each input feeds, for current state and for the platform
+INPUT_COMPONENTS = {
+    'hardware.avg_host_cost': (['hardware_refresh', 'support'], ['hardware_refresh']),
+    'hardware.power_cost_per_kwh': (['facilities'], ['facilities']),
+    'hardware.datacenter_cost_per_host': (['facilities'], ['facilities']),
+    'fte.avg_fully_loaded_cost': (['fte'], ['fte']),
+    'pricing.unit_price': ([], ['licensing', 'support']),
+    'pricing.support_percentage': ([], ['support']),
+    'fte_reduction': ([], ['fte']),
+    'hardware_efficiency': ([], ['hardware_refresh', 'facilities']),
+    'fte_count': (['fte'], ['fte']),
+}
+
+DEFAULT_RANGES = {**UNCERTAINTY, 'fte_count': (0.67, 1.33)}
+
+
+def _price_key(platform):
+    return 'cost_per_core_per_year' if platform['model'] == 'per_core' else 'cost_per_node_per_year'
+
+
+def _base_value(key, overrides, platform):
+    """Point estimate of an input under the given overrides."""
+    section, _, name = key.partition('.')
+    if section == 'hardware':
+        return overrides.get('hardware', {}).get(name, HARDWARE[name])
+    if section == 'fte':
+        return overrides.get('fte', {}).get(name, FTE[name])
+    if section == 'pricing':
+        name = _price_key(platform) if name == 'unit_price' else name
+        return overrides.get('pricing', {}).get(name, platform[name])
+    return overrides.get(key, {'fte_reduction': 0.40, 'hardware_efficiency': 0.80, 'fte_count': 3}[key])
+
+
+def _perturb(key, value, overrides, platform):
+    """Copy of overrides with one input set to value."""
+    perturbed = dict(overrides)
+    section, _, name = key.partition('.')
+    if section in ('hardware', 'fte', 'pricing'):
+        if section == 'pricing' and name == 'unit_price':
+            name = _price_key(platform)
+        perturbed[section] = {**overrides.get(section, {}), name: value}
+    else:
+        perturbed[key] = value
+    return perturbed
+
+
+def _clamp(key, value):
+    if key in ('fte_reduction', 'hardware_efficiency'):
+        return min(max(value, 0.0), 1.0)
+    return value
+
+
+def tornado(parsed_data, platform_names=None, overrides=None, pricing=None, ranges=None, metric='savings'):
+    """Tornado-chart data for every platform in one call.
+
+    overrides are the shared assumptions (hardware, fte, fte_count, years,
+    fte_reduction, hardware_efficiency); pricing optionally maps platform
+    names to their pricing overrides. ranges maps input keys to (low, high)
+    multipliers on the base value. metric is 'savings', 'roi_pct' or
+    'payback_months'.
+
+    Returns {platform: {'base': value, 'bars': [...]}} with bars sorted by
+    swing, largest first.
+    """
+    platform_names = platform_names or list(PLATFORMS)
+    overrides = overrides or {}
+    pricing = pricing or {}
+    ranges = DEFAULT_RANGES if ranges is None else ranges
+    years = overrides.get('years', 3)
+
+    base_current = current_cost_components(parsed_data, overrides)
+    current_cache = {}
+
+    def current_total(key, value):
+        # Current state does not depend on platform pricing — share it across platforms
+        if (key, value) not in current_cache:
+            changed = INPUT_COMPONENTS[key][0]
+            components = dict(base_current)
+            if changed:
+                perturbed = _perturb(key, value, overrides, None)
+                components.update(current_cost_components(parsed_data, perturbed, changed))
+            current_cache[(key, value)] = sum(components[c] for c in CURRENT_COMPONENTS)
+        return current_cache[(key, value)]
+
+    def outcome(cur_total, components):
+        platform_tco = {'total': sum(components[c] for c in PLATFORM_COMPONENTS),
+                        'implementation': components['implementation']}
+        return calculate_roi({'total': cur_total, 'years': years}, platform_tco)[metric]
+
+    results = {}
+    for name in platform_names:
+        platform_overrides = {**overrides, 'pricing': pricing[name]} if name in pricing else overrides
+        platform = {**PLATFORMS[name], **platform_overrides.get('pricing', {})}
+        base = platform_cost_components(parsed_data, name, platform_overrides)
+        base_metric = outcome(sum(base_current[c] for c in CURRENT_COMPONENTS), base)
+
+        bars = []
+        for key, (low_mult, high_mult) in ranges.items():
+            if key not in INPUT_COMPONENTS:
+                continue
+            base_value = _base_value(key, platform_overrides, platform)
+            point = {}
+            for end, mult in (('low', low_mult), ('high', high_mult)):
+                value = _clamp(key, base_value * mult)
+                changed = INPUT_COMPONENTS[key][1]
+                components = dict(base)
+                perturbed = _perturb(key, value, platform_overrides, platform)
+                components.update(platform_cost_components(parsed_data, name, perturbed, changed))
+                point[end] = (value, outcome(current_total(key, value), components))
+
+            bars.append({
+                'input': key,
+                'label': INPUT_LABELS.get(key, key),
+                'base_value': base_value,
+                'low_value': round(point['low'][0], 4),
+                'high_value': round(point['high'][0], 4),
+                'low': point['low'][1],
+                'high': point['high'][1],
+                'swing': round(abs(point['high'][1] - point['low'][1]), 2),
+            })
+
+        bars.sort(key=lambda b: b['swing'], reverse=True)
+        results[name] = {'base': base_metric, 'bars': bars}
+
+    return results
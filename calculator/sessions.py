@@ -1,24 +1,115 @@
+import hashlib
+import io
 import json
 import os
+import sqlite3
+import threading
+from collections.abc import Mapping
+from contextlib import closing
+import zlib
 from datetime import datetime
 
+from calculator.history import apply_delta, json_delta
+from parser.inventory import save_inventory, load_inventory
+
 SESSIONS_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'sessions')
 
 def ensure_sessions_dir():
     os.makedirs(SESSIONS_DIR, exist_ok=True)
 
-def save_session(customer_name, session_data):
-    """Save a customer session to disk."""
+# Columnar inventories in parsed_data are stored next to the session JSON as Parquet
+INVENTORY_SIDECARS = {
+    'vm_inventory': 'vms',
+    'host_inventory': 'hosts',
+}
+
+# Session sections, each saved and loaded independently by the SQLite backend
+SECTIONS = ['parsed_data', 'current_tco', 'scenario_results', 'selected_platforms', 'assumptions',
+            'discovery', 'renewal_data', 'recommendation_override', 'quotes']
+
+# Where new sessions are saved: 'sqlite' (a row per section in the session
+# database, read lazily) or 'json' (a file per session). Both load.
+SESSION_BACKEND = 'sqlite'
+
+# Suffixed ids tried when a save's timestamped id is already taken
+MAX_ID_ATTEMPTS = 100
+
+# zlib level for JSON section blobs
+COMPRESSION_LEVEL = 6
+
+# Deltas allowed between a section and its last full copy, bounding the work to rebuild any version
+MAX_DELTA_CHAIN = 16
+
+# Summary row per saved session, so listing never opens the session files,
+# plus the sections of SQLite-backed sessions. Section contents live in
+# session_blobs keyed by SHA-256, so a section that is unchanged between
+# saves (typically the inventories and parsed summary) is stored once, and
+# a changed JSON section may be stored as a delta against the previous
+# version's (see calculator.history).
+INDEX_PATH = os.path.join(SESSIONS_DIR, 'index.sqlite3')
+
+INDEX_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    filename TEXT PRIMARY KEY,
+    customer_name TEXT NOT NULL,
+    saved_at TEXT NOT NULL,
+    recommendation TEXT NOT NULL,
+    total_vms INTEGER NOT NULL,
+    backend TEXT NOT NULL DEFAULT 'json'
+);
+CREATE INDEX IF NOT EXISTS sessions_saved_at ON sessions (saved_at);
+CREATE INDEX IF NOT EXISTS sessions_customer ON sessions (customer_name COLLATE NOCASE);
+CREATE TABLE IF NOT EXISTS session_sections (
+    session_id TEXT NOT NULL,
+    section TEXT NOT NULL,
+    digest TEXT NOT NULL,
+    PRIMARY KEY (session_id, section)
+);
+CREATE INDEX IF NOT EXISTS session_sections_digest ON session_sections (digest);
+CREATE TABLE IF NOT EXISTS session_blobs (
+    digest TEXT PRIMARY KEY,
+    encoding TEXT NOT NULL,
+    data BLOB NOT NULL,
+    base TEXT,
+    depth INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS session_blobs_base ON session_blobs (base);
+"""
+
+
+def _inventory_path(filename, key):
+    return os.path.join(SESSIONS_DIR, f"{filename[:-len('.json')]}.{INVENTORY_SIDECARS[key]}.parquet")
+
+
+def _is_json(session_id):
+    return session_id.endswith('.json')
+
+
+def save_session(customer_name, session_data, backend=None):
+    """Save a customer session and return its id.
+
+    JSON sessions are ids ending in .json; SQLite sessions have no suffix.
+    Ids carry a microsecond timestamp, and an id that is already taken gets
+    a numbered suffix instead of replacing the earlier save.
+    """
     ensure_sessions_dir()
+    backend = backend or SESSION_BACKEND
     safe_name = customer_name.replace(' ', '_').replace('/', '_').lower()
-    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-    filename = f"{safe_name}_{timestamp}.json"
-    filepath = os.path.join(SESSIONS_DIR, filename)
+    now = datetime.now()
+    base_id = f"{safe_name}_{now.strftime('%Y%m%d_%H%M%S_%f')}"
+
+    parsed_data = session_data.get('parsed_data')
+    inventories = {}
+    if parsed_data:
+        parsed_data = dict(parsed_data)
+        for key in INVENTORY_SIDECARS:
+            if parsed_data.get(key) is not None:
+                inventories[key] = parsed_data.pop(key)
 
     save_data = {
         'customer_name': customer_name,
-        'saved_at': datetime.now().isoformat(),
-        'parsed_data': session_data.get('parsed_data'),
+        'saved_at': now.isoformat(),
+        'parsed_data': parsed_data,
         'current_tco': session_data.get('current_tco'),
         'scenario_results': session_data.get('scenario_results'),
         'selected_platforms': session_data.get('selected_platforms'),
@@ -29,50 +120,346 @@ def save_session(customer_name, session_data):
         'quotes': session_data.get('quotes'),
     }
 
-    with open(filepath, 'w') as f:
-        json.dump(save_data, f, indent=2, default=str)
+    for attempt in range(MAX_ID_ATTEMPTS):
+        session_id = f"{base_id}_{attempt}" if attempt else base_id
+        try:
+            if backend == 'json':
+                filename = f"{session_id}.json"
+                # 'x' refuses to overwrite an existing session file
+                with open(os.path.join(SESSIONS_DIR, filename), 'x') as f:
+                    json.dump(save_data, f, indent=2, default=str)
+                for key, inventory in inventories.items():
+                    save_inventory(inventory, _inventory_path(filename, key))
+                _index_put(_summarize(filename, save_data))
+                return filename
+            _store_sections(session_id, save_data, inventories)
+            return session_id
+        except (FileExistsError, sqlite3.IntegrityError):
+            continue
+    raise FileExistsError(f"No free session id for {base_id} after {MAX_ID_ATTEMPTS} attempts")
+
 
-    return filename
+def load_session(filename, sections=()):
+    """Load a customer session, or None if it does not exist.
 
+    SQLite sessions come back as a SavedSession mapping that reads each
+    section on first access; sections are read up front, in one query.
+    JSON sessions are always read whole.
+    """
+    if not _is_json(filename):
+        with closing(_connect()) as conn:
+            row = conn.execute("SELECT customer_name, saved_at FROM sessions WHERE filename = ? AND backend = 'sqlite'",
+                               (filename,)).fetchone()
+            if row is None:
+                return None
+            session = SavedSession(filename, dict(row))
+            session._loaded.update(_read_sections(conn, filename, sections))
+        return session
 
-def load_session(filename):
-    """Load a customer session from disk."""
     filepath = os.path.join(SESSIONS_DIR, filename)
     if not os.path.exists(filepath):
         return None
     with open(filepath, 'r') as f:
-        return json.load(f)
+        data = json.load(f)
+
+    if data.get('parsed_data'):
+        for key in INVENTORY_SIDECARS:
+            inventory_path = _inventory_path(filename, key)
+            if os.path.exists(inventory_path):
+                data['parsed_data'][key] = load_inventory(inventory_path)
+    return data
+
+
+class SavedSession(Mapping):
+    """A SQLite-backed session whose sections are read on first access.
+
+    Only the sections actually used are read; parsed_data pulls its
+    inventories in the same query.
+    """
+
+    def __init__(self, session_id, header):
+        self.session_id = session_id
+        self._loaded = dict(header)
+
+    def __getitem__(self, key):
+        if key not in self._loaded and key in SECTIONS:
+            with closing(_connect()) as conn:
+                self._loaded.update(_read_sections(conn, self.session_id, [key]))
+        return self._loaded[key]
+
+    def __iter__(self):
+        return iter(['customer_name', 'saved_at'] + SECTIONS)
+
+    def __len__(self):
+        return 2 + len(SECTIONS)
+
+
+def _json_blob(value):
+    payload = json.dumps(value, separators=(',', ':'), default=str).encode()
+    return hashlib.sha256(payload).hexdigest(), 'json+zlib', payload
+
+
+def _inventory_blob(inventory):
+    buffer = io.BytesIO()
+    save_inventory(inventory, buffer)
+    payload = buffer.getvalue()
+    return hashlib.sha256(payload).hexdigest(), 'parquet', payload
+
+
+def _put_blobs(conn, blobs):
+    """Store the blobs not already present.
+
+    blobs holds ((digest, encoding, payload), base) pairs, where base is the
+    digest of the same section in the previous version, or None.
+    """
+    digests = list({blob[0] for blob, _ in blobs})
+    stored = set()
+    for i in range(0, len(digests), 500):
+        chunk = digests[i:i + 500]
+        stored.update(row['digest'] for row in conn.execute(
+            f"SELECT digest FROM session_blobs WHERE digest IN ({','.join('?' * len(chunk))})", chunk))
+    for (digest, encoding, payload), base in blobs:
+        if digest in stored:
+            continue
+        # Parquet is already compressed
+        row = (digest, encoding, payload, None, 0)
+        if encoding == 'json+zlib':
+            row = _delta_row(conn, digest, payload, base) or (
+                digest, encoding, zlib.compress(payload, COMPRESSION_LEVEL), None, 0)
+        conn.execute("INSERT INTO session_blobs VALUES (?, ?, ?, ?, ?)", row)
+        stored.add(digest)
+
+
+def _delta_row(conn, digest, payload, base):
+    """session_blobs row storing payload as a delta against base, or None if a full copy is better."""
+    if base is None or base == digest:
+        return None
+    row = conn.execute("SELECT encoding, data, base, depth FROM session_blobs WHERE digest = ?", (base,)).fetchone()
+    if row is None or row['encoding'] == 'parquet' or row['depth'] >= MAX_DELTA_CHAIN:
+        return None
+    delta = json.dumps(json_delta(_blob_value(conn, row), json.loads(payload)), separators=(',', ':')).encode()
+    if len(delta) * 2 > len(payload):
+        return None
+    return digest, 'delta+zlib', zlib.compress(delta, COMPRESSION_LEVEL), base, row['depth'] + 1
+
+
+def _blob_value(conn, row):
+    """Decoded value of a session_blobs row, applying a delta to its rebuilt base."""
+    if row['encoding'] == 'parquet':
+        return load_inventory(io.BytesIO(row['data']))
+    value = json.loads(zlib.decompress(row['data']))
+    if row['encoding'] == 'delta+zlib':
+        base = conn.execute("SELECT encoding, data, base FROM session_blobs WHERE digest = ?",
+                            (row['base'],)).fetchone()
+        return apply_delta(_blob_value(conn, base), value)
+    return value
+
+
+def _collect_garbage(conn):
+    """Drop blobs no saved session or stored delta refers to any more."""
+    while conn.execute(
+            "DELETE FROM session_blobs WHERE NOT EXISTS "
+            "(SELECT 1 FROM session_sections WHERE session_sections.digest = session_blobs.digest) "
+            "AND NOT EXISTS (SELECT 1 FROM session_blobs AS delta WHERE delta.base = session_blobs.digest)").rowcount:
+        pass
+
+
+def _store_sections(session_id, save_data, inventories):
+    blobs = {section: _json_blob(save_data[section]) for section in SECTIONS}
+    for key, inventory in inventories.items():
+        blobs[f"parsed_data.{key}"] = _inventory_blob(inventory)
+
+    summary = {**_summarize(session_id, save_data), 'backend': 'sqlite'}
+    # One transaction, so readers never see a partly written session
+    with closing(_connect()) as conn, conn:
+        previous = dict(conn.execute(
+            "SELECT section, digest FROM session_sections WHERE session_id = "
+            "(SELECT filename FROM sessions WHERE customer_name = ? COLLATE NOCASE AND backend = 'sqlite' "
+            "AND filename != ? ORDER BY saved_at DESC LIMIT 1)",
+            (save_data['customer_name'], session_id)).fetchall())
+        # A plain INSERT, so an existing session with this id raises IntegrityError and is left intact
+        conn.execute(
+            "INSERT INTO sessions VALUES "
+            "(:filename, :customer_name, :saved_at, :recommendation, :total_vms, :backend)", summary)
+        _put_blobs(conn, [(blob, previous.get(section)) for section, blob in blobs.items()])
+        conn.executemany("INSERT INTO session_sections VALUES (?, ?, ?)",
+                         [(session_id, section, blob[0]) for section, blob in blobs.items()])
 
 
-def list_sessions():
-    """List all saved sessions."""
+def _read_sections(conn, session_id, sections):
+    """{section: value} for the stored sections among sections, with parsed_data's inventories attached."""
+    names = [s for s in sections if s in SECTIONS]
+    if 'parsed_data' in names:
+        names += [f"parsed_data.{key}" for key in INVENTORY_SIDECARS]
+    if not names:
+        return {}
+    rows = conn.execute(
+        "SELECT section, encoding, data, base FROM session_sections JOIN session_blobs USING (digest) "
+        f"WHERE session_id = ? AND section IN ({','.join('?' * len(names))})", [session_id] + names).fetchall()
+    values = {row['section']: _blob_value(conn, row) for row in rows}
+    for key in INVENTORY_SIDECARS:
+        inventory = values.pop(f"parsed_data.{key}", None)
+        if inventory is not None and isinstance(values.get('parsed_data'), dict):
+            values['parsed_data'][key] = inventory
+    return values
+
+
+def _summarize(filename, data):
+    """Index row for a session's saved data."""
+    scenario_results = data.get('scenario_results') or {}
+    recommendation = (max(scenario_results.items(), key=lambda x: x[1].get('fit', {}).get('fit_score', 0))[0]
+                      if scenario_results else 'N/A')
+    return {
+        'filename': filename,
+        'customer_name': data.get('customer_name', 'Unknown'),
+        'saved_at': data.get('saved_at', ''),
+        'recommendation': recommendation,
+        'total_vms': (data.get('parsed_data') or {}).get('total_vms', 0),
+    }
+
+
+# Databases whose schema is already current in this process
+_ready = set()
+_ready_lock = threading.Lock()
+
+
+def _connect():
+    """Open the session database, building the index from JSON files the first time.
+
+    The schema is checked once per process. WAL journaling (a persistent
+    database setting) lets any number of readers load sessions while one
+    writer saves.
+    """
     ensure_sessions_dir()
-    sessions = []
+    exists = os.path.exists(INDEX_PATH)
+    conn = sqlite3.connect(INDEX_PATH, timeout=30)
+    conn.row_factory = sqlite3.Row
+    with _ready_lock:
+        if not exists or INDEX_PATH not in _ready:
+            conn.execute("PRAGMA journal_mode=WAL")
+            _migrate(conn)
+            if not exists:
+                _rebuild(conn)
+            _ready.add(INDEX_PATH)
+    return conn
+
+
+def _columns(conn, table):
+    return {row['name'] for row in conn.execute(f"PRAGMA table_info({table})")}
+
+
+def _migrate(conn):
+    """Create the schema, upgrading tables written by earlier versions."""
+    # Indexes created before SQLite sessions existed lack the backend column
+    columns = _columns(conn, 'sessions')
+    if columns and 'backend' not in columns:
+        conn.execute("ALTER TABLE sessions ADD COLUMN backend TEXT NOT NULL DEFAULT 'json'")
+    # Blobs written before deltas lack the base and depth columns
+    columns = _columns(conn, 'session_blobs')
+    if columns and 'depth' not in columns:
+        conn.execute("ALTER TABLE session_blobs ADD COLUMN base TEXT")
+        conn.execute("ALTER TABLE session_blobs ADD COLUMN depth INTEGER NOT NULL DEFAULT 0")
+    # Sections used to be stored inline, one copy per session
+    inline = 'data' in _columns(conn, 'session_sections')
+    if inline:
+        conn.execute("ALTER TABLE session_sections RENAME TO session_sections_inline")
+    conn.executescript(INDEX_SCHEMA)
+    if inline:
+        with conn:
+            rows = conn.execute("SELECT session_id, section, encoding, data FROM session_sections_inline").fetchall()
+            blobs = [(row['session_id'], row['section'],
+                      _json_blob(json.loads(row['data'])) if row['encoding'] == 'json'
+                      else (hashlib.sha256(row['data']).hexdigest(), 'parquet', row['data']))
+                     for row in rows]
+            _put_blobs(conn, [(blob, None) for _, _, blob in blobs])
+            conn.executemany("INSERT INTO session_sections VALUES (?, ?, ?)",
+                             [(session_id, section, blob[0]) for session_id, section, blob in blobs])
+            conn.execute("DROP TABLE session_sections_inline")
+
+
+def _rebuild(conn):
+    rows = []
     for filename in os.listdir(SESSIONS_DIR):
         if filename.endswith('.json'):
-            filepath = os.path.join(SESSIONS_DIR, filename)
             try:
-                with open(filepath, 'r') as f:
-                    data = json.load(f)
-                sessions.append({
-                    'filename': filename,
-                    'customer_name': data.get('customer_name', 'Unknown'),
-                    'saved_at': data.get('saved_at', ''),
-                    'recommendation': data.get('scenario_results', {}) and
-                        max(data.get('scenario_results', {}).items(),
-                            key=lambda x: x[1].get('fit', {}).get('fit_score', 0))[0]
-                        if data.get('scenario_results') else 'N/A',
-                    'total_vms': data.get('parsed_data', {}).get('total_vms', 0),
-                })
-            except:
+                with open(os.path.join(SESSIONS_DIR, filename), 'r') as f:
+                    rows.append(_summarize(filename, json.load(f)))
+            except (OSError, ValueError):
                 pass
-    return sorted(sessions, key=lambda x: x['saved_at'], reverse=True)
+    # SQLite sessions live in the database itself and are kept
+    with conn:
+        conn.execute("DELETE FROM sessions WHERE backend = 'json'")
+        conn.executemany(
+            "INSERT OR REPLACE INTO sessions VALUES "
+            "(:filename, :customer_name, :saved_at, :recommendation, :total_vms, 'json')", rows)
+
+
+def rebuild_index():
+    """Rebuild the index from the session files, e.g. after copying sessions in by hand."""
+    with closing(_connect()) as conn:
+        _rebuild(conn)
+
+
+def _index_put(row):
+    with closing(_connect()) as conn, conn:
+        conn.execute(
+            "INSERT OR REPLACE INTO sessions VALUES "
+            "(:filename, :customer_name, :saved_at, :recommendation, :total_vms, 'json')", row)
+
+
+def list_sessions(search=None, limit=None, offset=0):
+    """List saved sessions, newest first, from the index.
+
+    search filters on customer name (case-insensitive substring); limit and
+    offset page through the results.
+    """
+    query = "SELECT filename, customer_name, saved_at, recommendation, total_vms FROM sessions"
+    params = []
+    if search:
+        escaped = search.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+        query += " WHERE customer_name LIKE ? ESCAPE '\\'"
+        params.append(f"%{escaped}%")
+    query += " ORDER BY saved_at DESC"
+    if limit is not None:
+        query += " LIMIT ? OFFSET ?"
+        params += [limit, offset]
+    with closing(_connect()) as conn:
+        return [dict(row) for row in conn.execute(query, params)]
+
+
+def session_history(customer_name):
+    """Saved versions of a customer, oldest first, numbered from 1 in save order."""
+    with closing(_connect()) as conn:
+        rows = conn.execute(
+            "SELECT filename, customer_name, saved_at, recommendation, total_vms FROM sessions "
+            "WHERE customer_name = ? COLLATE NOCASE ORDER BY saved_at, rowid", (customer_name,)).fetchall()
+    return [{'version': version, **dict(row)} for version, row in enumerate(rows, 1)]
+
+
+def restore_version(filename):
+    """Save an earlier version again as the customer's latest; returns the new session id."""
+    data = load_session(filename, sections=SECTIONS)
+    if data is None:
+        return None
+    return save_session(data['customer_name'], data)
 
 
 def delete_session(filename):
     """Delete a saved session."""
+    # Drop the index row (and any stored sections) even if the file is already gone
+    with closing(_connect()) as conn, conn:
+        deleted = conn.execute("DELETE FROM session_sections WHERE session_id = ?", (filename,)).rowcount
+        conn.execute("DELETE FROM sessions WHERE filename = ?", (filename,))
+        _collect_garbage(conn)
+    if not _is_json(filename):
+        return deleted > 0
+
     filepath = os.path.join(SESSIONS_DIR, filename)
     if os.path.exists(filepath):
         os.remove(filepath)
+        for key in INVENTORY_SIDECARS:
+            inventory_path = _inventory_path(filename, key)
+            if os.path.exists(inventory_path):
+                os.remove(inventory_path)
         return True
-    return False
\ No newline at end of file
+    return False
@@ -1,7 +1,17 @@
 from pricing.defaults import HARDWARE, FTE, PLATFORMS
 
-def calculate_current_tco(parsed_data, overrides=None):
-    """Calculate current state TCO based on parsed RVTools data."""
+# Component keys in summation order
+CURRENT_COMPONENTS = ['hardware_refresh', 'facilities', 'fte', 'licensing', 'support']
+PLATFORM_COMPONENTS = ['licensing', 'support', 'hardware_refresh', 'facilities', 'fte', 'implementation']
+
+
+def current_cost_components(parsed_data, overrides=None, components=None):
+    """Unrounded current-state cost components.
+
+    Only the components named in components are computed (all by default),
+    so callers that change one input can recompute just what it affects.
+    """
+    want = set(components or CURRENT_COMPONENTS)
 
     h = HARDWARE.copy()
     f = FTE.copy()
@@ -10,45 +20,64 @@ def calculate_current_tco(parsed_data, overrides=None):
         f.update(overrides.get('fte', {}))
 
     hosts = parsed_data.get('total_hosts', 0)
-    total_vms = parsed_data.get('total_vms', 0)
     years = overrides.get('years', 3) if overrides else 3
     fte_count = overrides.get('fte_count', 3) if overrides else 3
 
+    result = {}
+
     # Hardware costs
-    hardware_refresh = hosts * h['avg_host_cost'] * (years / h['refresh_cycle_years'])
+    if 'hardware_refresh' in want:
+        result['hardware_refresh'] = hosts * h['avg_host_cost'] * (years / h['refresh_cycle_years'])
 
     # Power and datacenter
-    power_annual = hosts * h['power_per_host_kw'] * 8760 * h['power_cost_per_kwh']
-    datacenter_annual = hosts * h['datacenter_cost_per_host']
-    facilities_total = (power_annual + datacenter_annual) * years
+    if 'facilities' in want:
+        power_annual = hosts * h['power_per_host_kw'] * 8760 * h['power_cost_per_kwh']
+        datacenter_annual = hosts * h['datacenter_cost_per_host']
+        result['facilities'] = (power_annual + datacenter_annual) * years
 
     # FTE costs
-    fte_total = fte_count * f['avg_fully_loaded_cost'] * years
+    if 'fte' in want:
+        result['fte'] = fte_count * f['avg_fully_loaded_cost'] * years
 
     # Existing licensing (VMware vSphere assumed)
-    vsphere_per_core_per_year = 50
-    cores = parsed_data.get('total_physical_cores', hosts * 20)
-    licensing_total = cores * vsphere_per_core_per_year * years
+    if 'licensing' in want:
+        vsphere_per_core_per_year = 50
+        cores = parsed_data.get('total_physical_cores', hosts * 20)
+        result['licensing'] = cores * vsphere_per_core_per_year * years
 
     # Support and maintenance (20% of hardware annually)
-    support_total = hosts * h['avg_host_cost'] * 0.20 * years
+    if 'support' in want:
+        result['support'] = hosts * h['avg_host_cost'] * 0.20 * years
 
-    total = hardware_refresh + facilities_total + fte_total + licensing_total + support_total
+    return result
+
+
+def calculate_current_tco(parsed_data, overrides=None):
+    """Calculate current state TCO based on parsed RVTools data."""
+
+    years = overrides.get('years', 3) if overrides else 3
+    c = current_cost_components(parsed_data, overrides)
+    total = c['hardware_refresh'] + c['facilities'] + c['fte'] + c['licensing'] + c['support']
 
     return {
-        'hardware_refresh': round(hardware_refresh, 2),
-        'facilities': round(facilities_total, 2),
-        'fte': round(fte_total, 2),
-        'licensing': round(licensing_total, 2),
-        'support': round(support_total, 2),
+        'hardware_refresh': round(c['hardware_refresh'], 2),
+        'facilities': round(c['facilities'], 2),
+        'fte': round(c['fte'], 2),
+        'licensing': round(c['licensing'], 2),
+        'support': round(c['support'], 2),
         'total': round(total, 2),
         'years': years,
         'annual_average': round(total / years, 2),
     }
 
 
-def calculate_platform_tco(parsed_data, platform_name, overrides=None):
-    """Calculate TCO for a given private cloud platform."""
+def platform_cost_components(parsed_data, platform_name, overrides=None, components=None):
+    """Unrounded platform cost components plus effective_hosts.
+
+    Only the components named in components are computed (all by default);
+    support is derived from licensing, so asking for it computes both.
+    """
+    want = set(components or PLATFORM_COMPONENTS)
 
     platform = PLATFORMS[platform_name].copy()
     h = HARDWARE.copy()
@@ -66,47 +95,67 @@ def calculate_platform_tco(parsed_data, platform_name, overrides=None):
     fte_count = overrides.get('fte_count', 3) if overrides else 3
     fte_reduction = overrides.get('fte_reduction', 0.40) if overrides else 0.40
 
-    # Platform licensing
-    if platform['model'] == 'per_core':
-        license_units = max(cores, platform.get('min_cores', 0))
-        licensing = license_units * platform['cost_per_core_per_year'] * years
-    elif platform['model'] == 'per_node':
-        license_units = max(hosts, platform.get('min_nodes', 0))
-        licensing = license_units * platform['cost_per_node_per_year'] * years
+    # Hardware - private cloud typically improves density 20-30%; a bin-packed
+    # host count from calculator.consolidation replaces the flat factor
+    hardware_efficiency = overrides.get('hardware_efficiency', 0.80) if overrides else 0.80
+    if overrides and overrides.get('effective_hosts'):
+        effective_hosts = overrides['effective_hosts']
+    else:
+        effective_hosts = max(round(hosts * hardware_efficiency), 3)
 
-    support = licensing * platform['support_percentage']
+    result = {'effective_hosts': effective_hosts}
 
-    # Hardware - private cloud typically improves density 20-30%
-    hardware_efficiency = overrides.get('hardware_efficiency', 0.80) if overrides else 0.80
-    effective_hosts = max(round(hosts * hardware_efficiency), 3)
-    hardware_refresh = effective_hosts * h['avg_host_cost'] * (years / h['refresh_cycle_years'])
+    # Platform licensing
+    if want & {'licensing', 'support'}:
+        if platform['model'] == 'per_core':
+            license_units = max(cores, platform.get('min_cores', 0))
+            licensing = license_units * platform['cost_per_core_per_year'] * years
+        elif platform['model'] == 'per_node':
+            license_units = max(hosts, platform.get('min_nodes', 0))
+            licensing = license_units * platform['cost_per_node_per_year'] * years
+        result['licensing'] = licensing
+        result['support'] = licensing * platform['support_percentage']
+
+    if 'hardware_refresh' in want:
+        result['hardware_refresh'] = effective_hosts * h['avg_host_cost'] * (years / h['refresh_cycle_years'])
 
     # Power and datacenter (scaled to effective hosts)
-    power_annual = effective_hosts * h['power_per_host_kw'] * 8760 * h['power_cost_per_kwh']
-    datacenter_annual = effective_hosts * h['datacenter_cost_per_host']
-    facilities_total = (power_annual + datacenter_annual) * years
+    if 'facilities' in want:
+        power_annual = effective_hosts * h['power_per_host_kw'] * 8760 * h['power_cost_per_kwh']
+        datacenter_annual = effective_hosts * h['datacenter_cost_per_host']
+        result['facilities'] = (power_annual + datacenter_annual) * years
 
     # FTE - reduced by automation
-    effective_fte = fte_count * (1 - fte_reduction)
-    fte_total = effective_fte * f['avg_fully_loaded_cost'] * years
+    if 'fte' in want:
+        effective_fte = fte_count * (1 - fte_reduction)
+        result['fte'] = effective_fte * f['avg_fully_loaded_cost'] * years
 
     # Implementation/migration one-time cost
-    implementation = hosts * 2500
+    if 'implementation' in want:
+        result['implementation'] = hosts * 2500
 
-    total = licensing + support + hardware_refresh + facilities_total + fte_total + implementation
+    return result
+
+
+def calculate_platform_tco(parsed_data, platform_name, overrides=None):
+    """Calculate TCO for a given private cloud platform."""
+
+    years = overrides.get('years', 3) if overrides else 3
+    c = platform_cost_components(parsed_data, platform_name, overrides)
+    total = c['licensing'] + c['support'] + c['hardware_refresh'] + c['facilities'] + c['fte'] + c['implementation']
 
     return {
         'platform': platform_name,
-        'licensing': round(licensing, 2),
-        'support': round(support, 2),
-        'hardware_refresh': round(hardware_refresh, 2),
-        'facilities': round(facilities_total, 2),
-        'fte': round(fte_total, 2),
-        'implementation': round(implementation, 2),
+        'licensing': round(c['licensing'], 2),
+        'support': round(c['support'], 2),
+        'hardware_refresh': round(c['hardware_refresh'], 2),
+        'facilities': round(c['facilities'], 2),
+        'fte': round(c['fte'], 2),
+        'implementation': round(c['implementation'], 2),
         'total': round(total, 2),
         'years': years,
         'annual_average': round(total / years, 2),
-        'effective_hosts': effective_hosts,
+        'effective_hosts': c['effective_hosts'],
     }
 
 
@@ -26,6 +26,9 @@ BLACK = black
 
 LOGO_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'assets', 'Insight.png')
 
+# Keys read from scenario_results[platform]['cash_flow'] (calculator.cashflow.cash_flow_summary)
+CASH_FLOW_KEYS = ('npv', 'irr_pct', 'discounted_payback_months')
+
 
 def get_styles():
     styles = getSampleStyleSheet()
@@ -497,15 +500,25 @@ def build_tco_section(elements, styles, current_tco, scenario_results,
         ('ROI %', 'roi_pct'),
         ('Payback (months)', 'payback_months'),
     ]
+    # Time-phased metrics — only present for scenarios run with the cash-flow engine
+    if all('cash_flow' in scenario_results[p] for p in selected_platforms):
+        discount_rate = scenario_results[selected_platforms[0]]['cash_flow']['discount_rate']
+        rows += [
+            (f'NPV of Savings ({discount_rate:.0%})', 'npv'),
+            ('IRR', 'irr_pct'),
+            ('Discounted Payback', 'discounted_payback_months'),
+        ]
 
     for label, key in rows:
         row = [label]
         for platform in selected_platforms:
             r = scenario_results[platform]
-            val = r.get(key, 0)
-            if key == 'roi_pct':
+            val = r['cash_flow'].get(key) if key in CASH_FLOW_KEYS else r.get(key, 0)
+            if val is None:
+                row.append('—' if key == 'irr_pct' else 'Beyond term')
+            elif key in ('roi_pct', 'irr_pct'):
                 row.append(f"{val}%")
-            elif key == 'payback_months':
+            elif key in ('payback_months', 'discounted_payback_months'):
                 row.append(f"{val} mo")
             else:
                 row.append(f"${val:,.0f}")
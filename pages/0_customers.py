@@ -1,6 +1,8 @@
 import streamlit as st
 from datetime import datetime
-from calculator.sessions import save_session, load_session, list_sessions, delete_session
+from calculator.history import DIFF_SECTIONS, diff_sessions
+from calculator.sessions import (SECTIONS, save_session, load_session, list_sessions, delete_session,
+                                 session_history, restore_version)
 
 st.set_page_config(page_title="Customer Manager", layout="wide")
 st.title("👥 Customer Manager")
@@ -64,7 +66,7 @@ else:
     # Search
     search = st.text_input("🔍 Search customers", placeholder="Type to filter...")
     if search:
-        sessions = [s for s in sessions if search.lower() in s['customer_name'].lower()]
+        sessions = list_sessions(search=search)
 
     for session in sessions:
         with st.container():
@@ -88,7 +90,8 @@ else:
 
             with col4:
                 if st.button("📂 Load", key=f"load_{session['filename']}"):
-                    data = load_session(session['filename'])
+                    # Every section is restored, so read them all in one pass
+                    data = load_session(session['filename'], sections=SECTIONS)
                     if data:
                         st.session_state.parsed_data = data.get('parsed_data')
                         st.session_state.current_tco = data.get('current_tco')
@@ -100,6 +103,8 @@ else:
                         st.session_state.recommendation_override = data.get('recommendation_override')
                         st.session_state.quotes = data.get('quotes', {})
                         st.session_state.customer_name = data.get('customer_name', '')
+                        # Results come from the file until the pages rebuild them
+                        st.session_state.analysis_graph = None
                         st.success(f"✅ Loaded {data.get('customer_name')}!")
                         st.rerun()
                     else:
@@ -113,6 +118,56 @@ else:
 
             st.divider()
 
+    # ── Version History ───────────────────────────────────────────
+    st.subheader("🕘 Version History")
+    customers = sorted({s['customer_name'] for s in sessions}, key=str.lower)
+    history_customer = st.selectbox("Customer", customers, key="history_customer")
+    versions = session_history(history_customer)
+
+    st.dataframe([{
+        'Version': f"v{v['version']}",
+        'Saved': v['saved_at'][:16].replace('T', ' ') if v['saved_at'] else 'Unknown',
+        'Recommendation': v['recommendation'],
+        'VMs': v['total_vms'],
+    } for v in reversed(versions)], use_container_width=True, hide_index=True)
+
+    if len(versions) < 2:
+        st.caption("Save this customer again to compare versions.")
+    else:
+        labels = {f"v{v['version']} — {v['saved_at'][:16].replace('T', ' ')}": v for v in versions}
+        col_from, col_to = st.columns(2)
+        with col_from:
+            from_label = st.selectbox("Compare from", list(labels), index=len(labels) - 2, key="history_from")
+        with col_to:
+            to_label = st.selectbox("To", list(labels), index=len(labels) - 1, key="history_to")
+
+        old_data = load_session(labels[from_label]['filename'], sections=DIFF_SECTIONS)
+        new_data = load_session(labels[to_label]['filename'], sections=DIFF_SECTIONS)
+        if old_data is None or new_data is None:
+            st.error("Could not load one of the selected versions.")
+        else:
+            changes = diff_sessions(old_data, new_data)
+            if not changes:
+                st.success("No changes to assumptions, quotes or results between these versions.")
+            for section, title in [('assumptions', 'Assumptions'), ('quotes', 'Quotes'),
+                                   ('scenario_results', 'Results')]:
+                rows = [c for c in changes if c['section'] == section]
+                if rows:
+                    st.markdown(f"**{title}** — {len(rows)} change{'s' if len(rows) != 1 else ''}")
+                    st.dataframe([{
+                        'Field': c['path'],
+                        'Change': c['change'].title(),
+                        'From': '' if c['change'] == 'added' else str(c['old']),
+                        'To': '' if c['change'] == 'removed' else str(c['new']),
+                    } for c in rows], use_container_width=True, hide_index=True)
+
+            if st.button(f"↩️ Restore {from_label.split(' — ')[0]} as latest", key="history_restore"):
+                if restore_version(labels[from_label]['filename']):
+                    st.success(f"✅ Restored {from_label.split(' — ')[0]} as the latest version of {history_customer}.")
+                    st.rerun()
+                else:
+                    st.error("Could not restore that version.")
+
 st.divider()
 
 # ── Start New Analysis ────────────────────────────────────────────
@@ -120,7 +175,8 @@ st.subheader("🆕 Start New Analysis")
 st.caption("This will clear the current session and start fresh.")
 if st.button("Clear Session & Start New", type="secondary"):
     for key in ['parsed_data', 'current_tco', 'scenario_results', 'selected_platforms',
-                'assumptions', 'discovery', 'renewal_data', 'recommendation_override', 'quotes']:
+                'assumptions', 'discovery', 'renewal_data', 'recommendation_override', 'quotes',
+                'analysis_graph']:
         if key in st.session_state:
             del st.session_state[key]
     st.success("Session cleared! Go to Environment Analysis to upload a new RVTools file.")
@@ -1,9 +1,12 @@
 import streamlit as st
-import tempfile
-import os
+import hashlib
 from parser.rvtools import parse_rvtools
+from parser.reader import prefers_streaming
 from parser.liveoptics import parse_liveoptics
+from parser.multi import parse_rvtools_many
+from parser.cache import cached_parse
 from calculator.validation import validate_parsed_data
+from calculator.rightsizing import has_utilization, rightsize, reclaim_by_cluster, rightsizing_summary
 
 st.set_page_config(page_title="Environment Analysis", layout="wide")
 st.title("📊 Environment Analysis")
@@ -16,10 +19,12 @@ source_type = st.radio(
 )
 
 if source_type == "RVTools":
-    uploaded_file = st.file_uploader(
-        "Upload RVTools Excel Export (.xlsx)",
+    uploaded_files = st.file_uploader(
+        "Upload RVTools Excel Export(s) (.xlsx)",
         type=["xlsx"],
-        help="Export from RVTools — typically named RVTools_export_YYYY-MM-DD.xlsx"
+        accept_multiple_files=True,
+        help="Export from RVTools — typically named RVTools_export_YYYY-MM-DD.xlsx. "
+             "Select one export per vCenter to merge a multi-vCenter estate."
     )
 else:
     uploaded_file = st.file_uploader(
@@ -27,18 +32,27 @@ else:
         type=["xlsx"],
         help="Export from LiveOptics — download from the LiveOptics portal after collection"
     )
+    uploaded_files = [uploaded_file] if uploaded_file else []
 
-if uploaded_file:
-    with st.spinner("Parsing data..."):
-        import tempfile, os
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".xlsx") as tmp:
-            tmp.write(uploaded_file.getbuffer())
-            tmp_path = tmp.name
+if uploaded_files:
+    def _parse_upload(_):
+        # Parsed straight from the upload buffer — no temp files
         if source_type == "RVTools":
-            parsed = parse_rvtools(tmp_path)
+            # Calamine's DataFrame path when installed, openpyxl streaming otherwise
+            return parse_rvtools(uploaded_files[0], streaming=prefers_streaming(), inventory=True)
+        return parse_liveoptics(uploaded_files[0])
+
+    def _parse_many(_):
+        return parse_rvtools_many([(f.name, f.getvalue()) for f in uploaded_files])
+
+    with st.spinner("Parsing data..."):
+        # Reruns and re-uploads of the same export are served from the parse cache
+        if len(uploaded_files) > 1:
+            # Multi-vCenter key is the ordered list of per-file digests
+            digests = b''.join(hashlib.sha256(f.getvalue()).digest() for f in uploaded_files)
+            parsed = cached_parse(digests, "RVTools-multi", _parse_many)
         else:
-            parsed = parse_liveoptics(tmp_path)
-        os.unlink(tmp_path)
+            parsed = cached_parse(uploaded_files[0].getbuffer(), source_type, _parse_upload)
 
     if "error" in parsed:
         st.error(f"Error parsing file: {parsed['error']}")
@@ -50,6 +64,15 @@ if uploaded_file:
         else:
             st.session_state.parsed_data = parsed
             st.success("✅ RVTools file parsed successfully!")
+            if parsed.get('sources'):
+                import pandas as pd
+                st.caption(f"Merged {len(parsed['sources'])} exports. Counted once: VMs with the same UUID, hosts "
+                           "with the same name, and those VMs' storage (disks matching no VM are added per export).")
+                if parsed.get('vms_merged_by_name'):
+                    st.warning(f"⚠️ {parsed['vms_merged_by_name']} VMs without a UUID were merged with a same-named "
+                               "VM from an earlier export. Check vms_merged_by_name below if those are "
+                               "different VMs.")
+                st.dataframe(pd.DataFrame(parsed['sources']), hide_index=True, use_container_width=True)
             if warnings:
                 for warning in warnings:
                     st.warning(f"⚠️ {warning}")
@@ -142,5 +165,20 @@ if st.session_state.get('parsed_data'):
             os_df = os_df.sort_values('Count', ascending=False).head(10)
             st.dataframe(os_df, hide_index=True, use_container_width=True)
 
+    # Right-sizing from utilization (LiveOptics exports carry per-VM peaks)
+    vm_inventory = parsed.get('vm_inventory')
+    if has_utilization(vm_inventory):
+        st.divider()
+        st.subheader("Right-Sizing Opportunity")
+        st.caption("Recommended sizes put each powered-on VM's peak utilization at the target level. VMs are only ever shrunk.")
+        rightsized = rightsize(vm_inventory)
+        summary = rightsizing_summary(rightsized)
+        r1, r2, r3 = st.columns(3)
+        r1.metric("VMs to Resize", summary['resized_vms'])
+        r2.metric("Reclaimable vCPU", summary['reclaim_vcpu'], delta=f"{summary['reclaim_vcpu_pct']}% of allocated", delta_color="off")
+        r3.metric("Reclaimable vRAM (GB)", round(summary['reclaim_memory_gb']), delta=f"{summary['reclaim_memory_pct']}% of allocated", delta_color="off")
+        with st.expander("Reclaim by cluster"):
+            st.dataframe(reclaim_by_cluster(rightsized), hide_index=True, use_container_width=True)
+
     st.divider()
     st.info("👈 Continue to **Current State TCO** in the sidebar to model your existing costs.")
@@ -1,6 +1,9 @@
 import streamlit as st
+import numpy as np
 import plotly.graph_objects as go
 from datetime import date, datetime
+from calculator.cashflow import cumulative, npv, discounted_payback
+from pricing.defaults import FINANCE
 
 st.set_page_config(page_title="VMware Renewal Analyzer", layout="wide")
 st.title("⏰ VMware Renewal Analyzer")
@@ -70,34 +73,32 @@ monthly_vmware_cost = increased_annual_spend / 12
 migration_months = int(migration_timeline.split()[0])
 
 # Crossover analysis — month by month
-months_range = list(range(0, (contract_years * 12) + 1))
+term_months = contract_years * 12
+months_range = list(range(0, term_months + 1))
 
 # Renew path: pay increased rate for full term
-renew_cumulative = [increased_annual_spend / 12 * m for m in months_range]
+renew_flows = np.full(term_months, increased_annual_spend / 12)
 
 # Migrate path: pay current rate during migration, then private cloud cost
 # Assume private cloud is 20% less than current VMware annually
 private_cloud_annual = current_annual_spend * 0.80
 private_cloud_monthly = private_cloud_annual / 12
 
-migrate_cumulative = []
-for m in months_range:
-    if m <= migration_months:
-        # During migration still paying VMware
-        cost = (current_annual_spend / 12 * m) + (migration_cost * min(m / migration_months, 1))
-    else:
-        # After migration paying private cloud rate
-        migration_period_cost = current_annual_spend / 12 * migration_months + migration_cost
-        post_migration_cost = private_cloud_monthly * (m - migration_months)
-        cost = migration_period_cost + post_migration_cost
-    migrate_cumulative.append(cost)
+migrate_flows = np.full(term_months, private_cloud_monthly)
+# During migration still paying VMware, with migration cost spread evenly
+migrate_flows[:migration_months] = current_annual_spend / 12 + migration_cost / migration_months
+
+renew_cumulative = cumulative(renew_flows)
+migrate_cumulative = cumulative(migrate_flows)
 
 # Find crossover month
-crossover_month = None
-for i, (r, m) in enumerate(zip(renew_cumulative, migrate_cumulative)):
-    if m < r and i > migration_months:
-        crossover_month = i
-        break
+ahead = np.nonzero((migrate_cumulative < renew_cumulative) & (np.arange(term_months + 1) > migration_months))[0]
+crossover_month = int(ahead[0]) if len(ahead) else None
+
+# Time value of migrating instead of renewing
+discount_rate = FINANCE['discount_rate']
+migration_npv = float(npv(renew_flows - migrate_flows, discount_rate))
+discounted_break_even = discounted_payback(renew_flows - migrate_flows, discount_rate)
 
 # Cost of waiting — each month delayed adds to renewal exposure
 cost_per_month_delay = monthly_vmware_cost
@@ -238,6 +239,7 @@ with col_s3:
     st.markdown(f"**{contract_years}-Year Total:** ${migrate_3yr:,.0f}")
     st.markdown(f"**Savings vs Renewal:** ${savings_vs_renew:,.0f}")
     st.markdown(f"**Break-Even:** Month {crossover_month if crossover_month else 'within term'}")
+    st.markdown(f"**NPV vs Renewal ({discount_rate:.0%}):** ${migration_npv:,.0f}")
     st.markdown("**Strategic Value:** Modern platform, AI/ML ready, self-service")
     st.success("Recommended path")
 
@@ -256,6 +258,8 @@ renewal_data = {
     'migration_timeline': migration_timeline,
     'crossover_month': crossover_month,
     'cost_per_month_delay': cost_per_month_delay,
+    'migration_npv': round(migration_npv, 2),
+    'discounted_break_even_months': round(discounted_break_even, 1) if discounted_break_even is not None else None,
     'contract_years': contract_years,
 }
 st.session_state.renewal_data = renewal_data
@@ -1,6 +1,6 @@
 import streamlit as st
 import plotly.graph_objects as go
-from calculator.tco import calculate_current_tco
+from calculator.dataflow import sync_session
 from pricing.defaults import HARDWARE, FTE
 from calculator.validation import validate_tco_inputs
 
@@ -58,9 +58,10 @@ for warning in tco_warnings:
 if tco_errors:
     st.stop()
 
-results = calculate_current_tco(parsed, overrides)
-st.session_state.current_tco = results
+# Recomputes current state, and any scenarios already built, only when the inputs changed
 st.session_state.assumptions = overrides
+sync_session(st.session_state)
+results = st.session_state.current_tco
 
 st.divider()
 
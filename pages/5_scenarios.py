@@ -1,11 +1,12 @@
 import streamlit as st
 import plotly.graph_objects as go
-from calculator.tco import calculate_platform_tco, calculate_roi
-from calculator.platforms.vcf import get_vcf_tco
-from calculator.platforms.nutanix import get_nutanix_tco
-from calculator.platforms.openshift import get_openshift_tco
-from calculator.platforms.azure_stack import get_azure_stack_tco
-from pricing.defaults import PLATFORMS, HARDWARE, FTE
+from calculator.dataflow import session_graph, sync_session
+from calculator.sensitivity import tornado, INPUT_LABELS
+from calculator.goalseek import goal_seek
+from calculator.breakdown import grouped_tco
+from calculator.consolidation import consolidate
+from calculator.rightsizing import has_utilization, rightsized_inventory
+from pricing.defaults import PLATFORMS, HARDWARE, FTE, TARGET_HOST
 from calculator.validation import validate_quote_inputs, validate_discovery
 
 def _get_pricing_override(platform, manual_overrides, quotes, parsed):
@@ -173,6 +174,37 @@ with col_c:
     fte_count = st.session_state.assumptions.get('fte_count', 3)
     st.metric("FTEs (from TCO page)", fte_count)
 
+# Target host sizing — bin-pack the VM inventory instead of the flat factor
+effective_hosts = None
+vm_inventory = parsed.get('vm_inventory')
+sizing_options = ["Flat efficiency factor"] + (["Bin-pack VM inventory"] if vm_inventory is not None else [])
+host_sizing = st.radio("Target Host Sizing", sizing_options, horizontal=True,
+                       help="Bin-packing places every powered-on VM's vCPU and vRAM onto the target host spec below, with N+1 HA per cluster.")
+if host_sizing == "Bin-pack VM inventory":
+    h1, h2, h3, h4 = st.columns(4)
+    with h1:
+        target_cores = st.number_input("Cores per Host", value=TARGET_HOST['cores'], step=8)
+    with h2:
+        target_memory = st.number_input("Memory per Host (GB)", value=TARGET_HOST['memory_gb'], step=128)
+    with h3:
+        target_ratio = st.number_input("Target vCPU:pCPU", value=TARGET_HOST['vcpu_per_core'], step=0.5)
+    with h4:
+        keep_clusters = st.checkbox("Keep existing cluster boundaries", value=False)
+        rightsize_vms = has_utilization(vm_inventory) and st.checkbox(
+            "Right-size VMs from utilization", value=False,
+            help="Pack each VM at its recommended size from peak utilization instead of its allocation.")
+    demand = rightsized_inventory(vm_inventory) if rightsize_vms else vm_inventory
+    sizing = consolidate(demand, {'cores': target_cores, 'memory_gb': target_memory,
+                                        'vcpu_per_core': target_ratio}, by_cluster=keep_clusters)
+    effective_hosts = sizing['hosts']
+    s1, s2, s3, s4 = st.columns(4)
+    s1.metric("Target Hosts", effective_hosts, delta=f"{effective_hosts - parsed.get('total_hosts', 0)} vs current")
+    s2.metric("HA Hosts", sizing['ha_hosts'], delta=f"{sizing['clusters']} clusters", delta_color="off")
+    s3.metric("CPU Utilization", f"{sizing['cpu_utilization']}%")
+    s4.metric("Memory Utilization", f"{sizing['memory_utilization']}%")
+    if sizing['oversized_vms']:
+        st.warning(f"⚠️ {sizing['oversized_vms']} VMs are larger than one target host and were given dedicated hosts.")
+
 st.divider()
 
 # Per-platform pricing overrides
@@ -208,47 +240,25 @@ st.divider()
 # Calculate scenarios
 st.subheader("Scenario Results")
 
-scenario_results = {}
-platform_fits = {}
-
-platform_fit_funcs = {
-    "VMware VCF": get_vcf_tco,
-    "Nutanix": get_nutanix_tco,
-    "Red Hat OpenShift": get_openshift_tco,
-    "Azure Stack HCI": get_azure_stack_tco,
-}
-
+# Scenario inputs feed the session's dataflow graph, which recomputes only
+# the platform results they invalidate and keeps every page consistent
+graph = session_graph(st.session_state)
+graph.set_input('scenario', {
+    'fte_reduction': fte_reduction / 100,
+    'hardware_efficiency': hardware_efficiency / 100,
+    'effective_hosts': effective_hosts,
+})
 for platform in selected_platforms:
-    overrides = {
-        'hardware': st.session_state.assumptions.get('hardware', {}),
-        'fte': st.session_state.assumptions.get('fte', {}),
-        'fte_count': fte_count,
-        'fte_reduction': fte_reduction / 100,
-        'hardware_efficiency': hardware_efficiency / 100,
-        'years': years,
-        'pricing': _get_pricing_override(platform, platform_overrides,
-                                          st.session_state.get('quotes', {}),
-                                          parsed),
-    }
-    tco = calculate_platform_tco(parsed, platform, overrides)
-    roi = calculate_roi(current_tco, tco)
-    fit = platform_fit_funcs[platform](parsed)
-
-    # Apply discovery fit adjustments if available
-    discovery = st.session_state.get('discovery', {})
-    fit_adjustments = discovery.get('fit_adjustments', {})
-    if platform in fit_adjustments:
-        raw_score = fit['fit_score'] + fit_adjustments[platform]
-        fit['fit_score'] = max(0, min(raw_score, 100))
-        if fit_adjustments[platform] > 0:
-            fit['fit_reasons'].append(f"Discovery responses added +{fit_adjustments[platform]} points")
-        elif fit_adjustments[platform] < 0:
-            fit['fit_reasons'].append(f"Discovery responses adjusted {fit_adjustments[platform]} points")
-
-    scenario_results[platform] = {**tco, **roi, 'fit': fit}
-    platform_fits[platform] = fit
-
-st.session_state.scenario_results = scenario_results
+    graph.set_input(f'pricing:{platform}', _get_pricing_override(platform, platform_overrides,
+                                                                 st.session_state.get('quotes', {}),
+                                                                 parsed))
+graph.set_input('selected_platforms', list(selected_platforms))
+sync_session(st.session_state)
+
+current_tco = st.session_state.current_tco
+scenario_results = st.session_state.scenario_results
+platform_fits = {p: scenario_results[p]['fit'] for p in selected_platforms}
+cash_flows = {p: graph.get(f'cash_flow:{p}') for p in selected_platforms}
 
 # Results metrics
 result_cols = st.columns(len(selected_platforms))
@@ -260,6 +270,7 @@ for i, platform in enumerate(selected_platforms):
         savings_color = "normal" if r['savings'] > 0 else "inverse"
         st.metric("Savings vs Current", f"${r['savings']:,.0f}", delta=f"{r['roi_pct']}% ROI")
         st.metric("Payback Period", f"{r['payback_months']} months")
+        st.metric(f"NPV of Savings ({r['cash_flow']['discount_rate']:.0%})", f"${r['cash_flow']['npv']:,.0f}")
         st.metric("Fit Score", f"{r['fit']['fit_score']}/100")
 
 st.divider()
@@ -289,6 +300,150 @@ fig.update_layout(
 )
 st.plotly_chart(fig, use_container_width=True)
 
+# Cash flow — cumulative net savings month by month
+with st.expander("💵 Cash Flow — cumulative savings by month"):
+    cfig = go.Figure()
+    for platform in selected_platforms:
+        cf = cash_flows[platform]
+        cfig.add_trace(go.Scatter(
+            x=list(range(cf['months'] + 1)),
+            y=cf['cumulative_net'],
+            mode='lines',
+            name=platform,
+        ))
+    cfig.add_hline(y=0, line_dash="dash", line_color="gray")
+    cfig.update_layout(
+        title="Cumulative Net Savings vs Current State",
+        xaxis_title="Months",
+        yaxis_title="Cumulative Savings ($)",
+        height=400,
+        legend=dict(orientation="h", yanchor="bottom", y=1.02),
+        hovermode='x unified',
+    )
+    st.plotly_chart(cfig, use_container_width=True)
+    st.caption("Licensing and support are invoiced annually in advance and hardware is refreshed in annual tranches, so savings arrive in steps.")
+
+    cf_rows = []
+    for platform in selected_platforms:
+        summary = scenario_results[platform]['cash_flow']
+        cf_rows.append({
+            'Platform': platform,
+            'NPV of Savings': f"${summary['npv']:,.0f}",
+            'IRR': f"{summary['irr_pct']}%" if summary['irr_pct'] is not None else "n/a",
+            'Discounted Payback': (f"{summary['discounted_payback_months']} months"
+                                   if summary['discounted_payback_months'] is not None else "Beyond term"),
+        })
+    st.dataframe(cf_rows, use_container_width=True, hide_index=True)
+
+# Sensitivity — which assumption moves savings most
+with st.expander("📐 Sensitivity Analysis — which assumptions matter most?"):
+    st.caption("Each bar moves one assumption across its plausible range with everything else held at the values above.")
+    shared_overrides = {
+        'hardware': st.session_state.assumptions.get('hardware', {}),
+        'fte': st.session_state.assumptions.get('fte', {}),
+        'fte_count': fte_count,
+        'fte_reduction': fte_reduction / 100,
+        'hardware_efficiency': hardware_efficiency / 100,
+        'effective_hosts': effective_hosts,
+        'years': years,
+    }
+    platform_pricing = {
+        p: _get_pricing_override(p, platform_overrides, st.session_state.get('quotes', {}), parsed)
+        for p in selected_platforms
+    }
+    sensitivity = tornado(parsed, selected_platforms, shared_overrides, platform_pricing)
+
+    tornado_platform = st.selectbox("Platform", selected_platforms, key="tornado_platform")
+    result = sensitivity[tornado_platform]
+    bars = list(reversed(result['bars']))
+    labels = [b['label'] for b in bars]
+
+    tfig = go.Figure()
+    tfig.add_trace(go.Bar(
+        name='Low end of range', y=labels, orientation='h',
+        x=[b['low'] - result['base'] for b in bars], base=result['base'],
+        marker_color='#d62728',
+        customdata=[[b['low_value'], b['low']] for b in bars],
+        hovertemplate="Input: %{customdata[0]}<br>Savings: $%{customdata[1]:,.0f}<extra></extra>",
+    ))
+    tfig.add_trace(go.Bar(
+        name='High end of range', y=labels, orientation='h',
+        x=[b['high'] - result['base'] for b in bars], base=result['base'],
+        marker_color='#2ca02c',
+        customdata=[[b['high_value'], b['high']] for b in bars],
+        hovertemplate="Input: %{customdata[0]}<br>Savings: $%{customdata[1]:,.0f}<extra></extra>",
+    ))
+    tfig.add_vline(x=result['base'], line_dash="dash", line_color="gray")
+    tfig.update_layout(
+        barmode='overlay',
+        title=f"{tornado_platform} — {years}-Year Savings Sensitivity",
+        xaxis_title="Savings vs Current ($)",
+        height=420,
+        legend=dict(orientation="h", yanchor="bottom", y=1.02)
+    )
+    st.plotly_chart(tfig, use_container_width=True)
+
+# Goal seek — break-even and target values
+with st.expander("🎯 Goal Seek — what would it take?"):
+    gs1, gs2, gs3 = st.columns(3)
+    seek_labels = {**INPUT_LABELS, 'parsed.total_hosts': 'Host Count'}
+    with gs1:
+        seek_platform = st.selectbox("Platform", selected_platforms, key="seek_platform")
+        seek_input = st.selectbox("Solve for", list(seek_labels), format_func=seek_labels.get,
+                                  index=list(seek_labels).index('pricing.unit_price'), key="seek_input")
+    with gs2:
+        seek_goal = st.radio("Goal", ["Break even vs current", "Match another platform", "Target ROI %"], key="seek_goal")
+    with gs3:
+        seek_compare = None
+        seek_metric, seek_target = 'savings', 0.0
+        if seek_goal == "Match another platform":
+            others = [p for p in selected_platforms if p != seek_platform]
+            seek_compare = st.selectbox("Match TCO of", others, key="seek_compare") if others else None
+        elif seek_goal == "Target ROI %":
+            seek_metric = 'roi_pct'
+            seek_target = float(st.number_input("Target ROI (%)", value=30.0, step=5.0, key="seek_target"))
+
+    if seek_goal == "Match another platform" and not seek_compare:
+        st.info("Select at least two platforms to compare them.")
+    else:
+        solved = goal_seek(parsed, seek_platform, seek_input, metric=seek_metric, target=seek_target,
+                           overrides=shared_overrides, pricing=platform_pricing, compare_to=seek_compare)
+        if solved['feasible']:
+            st.metric(f"{seek_labels[seek_input]} needed", f"{solved['value']:,.2f}",
+                      delta=f"{solved['value'] - solved['base_value']:+,.2f} vs current assumption")
+        else:
+            st.warning(f"No achievable {seek_labels[seek_input]} reaches this goal for {seek_platform}.")
+
+# Breakdown — price each cluster or site as its own migration wave
+if parsed.get('host_inventory') is not None:
+    with st.expander("🗺️ Cluster & Site Breakdown — plan a phased migration"):
+        st.caption("Each cluster or site is priced as a standalone migration. FTE cost is shared out by host count.")
+        bd1, bd2 = st.columns(2)
+        with bd1:
+            group_by = st.radio("Group by", ["cluster", "site"], horizontal=True, key="breakdown_by",
+                                format_func=str.title)
+        with bd2:
+            breakdown_platform = st.selectbox("Platform", selected_platforms, key="breakdown_platform")
+        breakdown = grouped_tco(parsed, [breakdown_platform], shared_overrides, platform_pricing, by=group_by)
+        if breakdown.empty:
+            st.info("No host inventory to break down.")
+        else:
+            breakdown_rows = []
+            for _, row in breakdown.sort_values('savings', ascending=False).iterrows():
+                breakdown_rows.append({
+                    group_by.title(): row[group_by],
+                    'Hosts': int(row['hosts']),
+                    'Cores': int(row['cores']),
+                    'VMs': int(row['vms']),
+                    'Current TCO': f"${row['current_total']:,.0f}",
+                    f'{breakdown_platform} TCO': f"${row['total']:,.0f}",
+                    'Savings': f"${row['savings']:,.0f}",
+                    'ROI': f"{row['roi_pct']:.1f}%",
+                    'Payback': f"{row['payback_months']:.1f} months",
+                })
+            st.dataframe(breakdown_rows, use_container_width=True, hide_index=True)
+            st.caption("Highest savings first — a natural order for migration waves.")
+
 st.divider()
 
 # Platform fit scores
@@ -2,6 +2,8 @@ import streamlit as st
 import plotly.graph_objects as go
 import plotly.express as px
 from calculator.roadmaps import get_roadmap
+from calculator.dataflow import session_recommendation, sync_session
+from calculator.optimizer import best_case, pareto_front
 
 st.set_page_config(page_title="Comparison & Recommendation", layout="wide")
 st.title("📊 Comparison & Recommendation")
@@ -15,6 +17,9 @@ if not st.session_state.get('scenario_results'):
     st.warning("Please complete the Scenario Builder page first.")
     st.stop()
 
+# Pick up any assumption changes made since the Scenario Builder last ran
+graph = sync_session(st.session_state)
+
 parsed = st.session_state.parsed_data
 current_tco = st.session_state.current_tco
 scenario_results = st.session_state.scenario_results
@@ -22,16 +27,7 @@ selected_platforms = st.session_state.selected_platforms
 years = st.session_state.assumptions.get('years', 3)
 
 # Determine recommended platform based on fit score + ROI
-def get_recommendation(scenario_results):
-    scores = {}
-    for platform, r in scenario_results.items():
-        fit_score = r['fit']['fit_score']
-        roi_score = min(r['roi_pct'] / 2, 50)  # Cap ROI contribution at 50 points
-        combined = (fit_score * 0.6) + (roi_score * 0.4)
-        scores[platform] = round(combined, 1)
-    return max(scores, key=scores.get), scores
-
-recommended, combined_scores = get_recommendation(scenario_results)
+recommended, combined_scores = session_recommendation(st.session_state)
 override = st.session_state.get('recommendation_override')
 final_recommendation = override if override else recommended
 
@@ -119,6 +115,70 @@ with col_savings:
 
 st.divider()
 
+# Cost vs fit — platforms another platform beats on both are dominated
+st.subheader("⚖️ Cost vs Fit Trade-off")
+st.caption("Platforms on the frontier are not beaten on both TCO and fit by any other option; "
+           "the combined score above picks one point on it with fixed 60/40 weights.")
+fit_scores = {p: scenario_results[p]['fit']['fit_score'] for p in selected_platforms}
+frontier = {selected_platforms[i] for i in pareto_front([scenario_results[p]['total'] for p in selected_platforms],
+                                                        [fit_scores[p] for p in selected_platforms])}
+fig_front = go.Figure(go.Scatter(
+    x=[scenario_results[p]['total'] for p in selected_platforms],
+    y=[fit_scores[p] for p in selected_platforms],
+    mode='markers+text',
+    text=selected_platforms,
+    textposition='top center',
+    marker=dict(size=14, color=['#2ca02c' if p in frontier else '#7f7f7f' for p in selected_platforms]),
+))
+fig_front.update_layout(
+    xaxis_title=f"{years}-Year TCO ($)",
+    yaxis_title="Fit Score",
+    yaxis_range=[0, 110],
+    height=380,
+    showlegend=False,
+)
+st.plotly_chart(fig_front, use_container_width=True)
+
+with st.expander("🔎 Best case per platform — pricing, consolidation and FTE reduction"):
+    st.caption("Fit does not change with these settings and TCO only falls toward the lowest price, "
+               "the lowest consolidation and the highest FTE reduction, so each platform's best case "
+               "is that corner of the ranges below.")
+    o1, o2, o3 = st.columns(3)
+    with o1:
+        price_range = st.slider("Price (% of list)", 30, 150, (50, 100), step=5)
+    with o2:
+        efficiency_range = st.slider("Hardware consolidation (%)", 50, 100, (60, 100), step=5)
+    with o3:
+        reduction_range = st.slider("FTE reduction (%)", 0, 80, (20, 50), step=5)
+
+    assumptions = st.session_state.assumptions
+    search = best_case(
+        parsed, selected_platforms,
+        overrides={k: assumptions[k] for k in ('hardware', 'fte', 'fte_count', 'years') if k in assumptions},
+        pricing={p: graph.get(f'pricing:{p}') for p in selected_platforms if graph.has_input(f'pricing:{p}')},
+        fits=fit_scores,
+        ranges={
+            'price_factor': (price_range[0] / 100, price_range[1] / 100),
+            'hardware_efficiency': (efficiency_range[0] / 100, efficiency_range[1] / 100),
+            'fte_reduction': (reduction_range[0] / 100, reduction_range[1] / 100),
+        },
+    )
+    st.dataframe([{
+        'Platform': c['platform'],
+        'On Frontier': "✅" if c['on_frontier'] else "",
+        'Fit Score': f"{c['fit_score']}/100",
+        f'Best-Case {years}-Year TCO': f"${c['total']:,.0f}",
+        'Savings': f"${c['savings']:,.0f}",
+        'Price': f"{c['price_factor']:.0%} of list",
+        'Consolidation': f"{c['hardware_efficiency']:.0%}",
+        'FTE Reduction': f"{c['fte_reduction']:.0%}",
+    } for c in search['candidates']], hide_index=True, use_container_width=True)
+    dominated = [c['platform'] for c in search['candidates'] if not c['on_frontier']]
+    if dominated:
+        st.caption(f"Dominated even at their best case: {', '.join(dominated)}.")
+
+st.divider()
+
 # Full side by side comparison table
 st.subheader("Full Side-by-Side Comparison")
 
@@ -5,6 +5,7 @@ from openpyxl import Workbook
 from openpyxl.styles import Font, PatternFill, Alignment
 from openpyxl.utils import get_column_letter
 from exports.pdf_export import generate_pdf
+from calculator.dataflow import session_recommendation, sync_session
 
 st.set_page_config(page_title="Export & Proposal", layout="wide")
 st.title("📤 Export & Proposal Generator")
@@ -18,6 +19,9 @@ if not st.session_state.get('scenario_results'):
     st.warning("Please complete the Scenario Builder before exporting.")
     st.stop()
 
+# Pick up any assumption changes made since the Scenario Builder last ran
+sync_session(st.session_state)
+
 parsed = st.session_state.parsed_data
 current_tco = st.session_state.current_tco
 scenario_results = st.session_state.scenario_results
@@ -31,12 +35,7 @@ override = st.session_state.get('recommendation_override')
 if override:
     final_recommendation = override
 else:
-    scores = {}
-    for platform, r in scenario_results.items():
-        fit_score = r['fit']['fit_score']
-        roi_score = min(r['roi_pct'] / 2, 50)
-        scores[platform] = (fit_score * 0.6) + (roi_score * 0.4)
-    final_recommendation = max(scores, key=scores.get)
+    final_recommendation, _ = session_recommendation(st.session_state)
 
 st.divider()
 
@@ -204,19 +203,51 @@ def generate_excel():
         ('ROI %', 'roi_pct'),
         ('Payback (months)', 'payback_months'),
         ('Fit Score', None),
+        ('NPV of Savings', 'cash_flow.npv'),
+        ('IRR %', 'cash_flow.irr_pct'),
+        ('Discounted Payback (months)', 'cash_flow.discounted_payback_months'),
     ]
     for row_idx, (label, key) in enumerate(metrics):
         ws2.cell(row=2+row_idx, column=1, value=label).font = Font(bold=True)
         for col_idx, platform in enumerate(selected_platforms):
             r = scenario_results[platform]
-            value = r['fit']['fit_score'] if key is None else r.get(key, '')
+            if key is None:
+                value = r['fit']['fit_score']
+            elif key.startswith('cash_flow.'):
+                value = r.get('cash_flow', {}).get(key.split('.', 1)[1])
+            else:
+                value = r.get(key, '')
             cell = ws2.cell(row=2+row_idx, column=2+col_idx, value=value)
-            if key not in ['roi_pct', 'payback_months', None]:
+            if key in ['total', 'annual_average', 'licensing', 'hardware_refresh', 'fte',
+                       'implementation', 'savings', 'cash_flow.npv']:
                 cell.number_format = currency_format
 
     for i in range(len(selected_platforms)+1):
         ws2.column_dimensions[get_column_letter(i+1)].width = 22
 
+    # Cash Flow sheet — net savings vs current state by year
+    ws3 = wb.create_sheet("Cash Flow")
+    for col, h in enumerate(['Year'] + selected_platforms, 1):
+        style_header(ws3.cell(row=1, column=col, value=h))
+    annual = {p: scenario_results[p].get('cash_flow', {}).get('annual_net', []) for p in selected_platforms}
+    n_years = max((len(v) for v in annual.values()), default=0)
+    for year in range(n_years):
+        ws3.cell(row=2+year, column=1, value=f"Year {year + 1}").font = Font(bold=True)
+        for col_idx, platform in enumerate(selected_platforms):
+            values = annual[platform]
+            cell = ws3.cell(row=2+year, column=2+col_idx, value=values[year] if year < len(values) else None)
+            cell.number_format = currency_format
+    total_row = 2 + n_years
+    ws3.cell(row=total_row, column=1, value="TOTAL").font = Font(bold=True)
+    for col_idx, platform in enumerate(selected_platforms):
+        cell = ws3.cell(row=total_row, column=2+col_idx, value=round(sum(annual[platform]), 2))
+        cell.number_format = currency_format
+        cell.font = Font(bold=True)
+        cell.fill = highlight_fill
+    ws3.cell(row=total_row, column=1).fill = highlight_fill
+    for i in range(len(selected_platforms)+1):
+        ws3.column_dimensions[get_column_letter(i+1)].width = 22
+
     buffer = io.BytesIO()
     wb.save(buffer)
     buffer.seek(0)
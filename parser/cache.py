@@ -0,0 +1,107 @@
+import hashlib
+import os
+import pickle
+import tempfile
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'cache', 'parsed')
+
+# Bump whenever parser output changes so stale entries are never served
+PARSER_VERSION = '9'
+
+# Total on-disk budget before least-recently-used entries are evicted
+MAX_CACHE_BYTES = 512 * 1024 * 1024
+
+
+def ensure_cache_dir():
+    os.makedirs(CACHE_DIR, exist_ok=True)
+
+
+def cache_key(file_bytes, source):
+    """SHA-256 of the uploaded bytes, salted with the source type and parser version.
+
+    file_bytes may be any bytes-like object, e.g. an upload's getbuffer() view.
+    """
+    digest = hashlib.sha256()
+    digest.update(f"{source}:{PARSER_VERSION}:".encode())
+    digest.update(file_bytes)
+    return digest.hexdigest()
+
+
+def get_cached(key):
+    """Return the cached parse result for a key, or None on a miss."""
+    filepath = os.path.join(CACHE_DIR, f"{key}.pkl")
+    try:
+        with open(filepath, 'rb') as f:
+            parsed = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError):
+        return None
+    # Touch the entry so eviction treats it as recently used
+    os.utime(filepath)
+    return parsed
+
+
+def put_cached(key, parsed, max_bytes=MAX_CACHE_BYTES):
+    """Store a parse result and evict old entries beyond the size budget."""
+    ensure_cache_dir()
+    filepath = os.path.join(CACHE_DIR, f"{key}.pkl")
+    # Write to a temp file first so concurrent readers never see a partial entry
+    fd, tmp_path = tempfile.mkstemp(dir=CACHE_DIR, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump(parsed, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, filepath)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    evict(max_bytes)
+
+
+def evict(max_bytes=MAX_CACHE_BYTES):
+    """Delete least-recently-used entries until the cache fits in max_bytes."""
+    ensure_cache_dir()
+    entries = []
+    for filename in os.listdir(CACHE_DIR):
+        if filename.endswith('.pkl'):
+            filepath = os.path.join(CACHE_DIR, filename)
+            try:
+                stat = os.stat(filepath)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, filepath))
+
+    total = sum(size for _, size, _ in entries)
+    for _, size, filepath in sorted(entries):
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(filepath)
+            total -= size
+        except OSError:
+            pass
+    return total
+
+
+def clear_cache():
+    """Remove every cached parse result."""
+    return evict(0) == 0
+
+
+def cached_parse(file_bytes, source, parse_func):
+    """Return parse_func(file_bytes), served from the cache when the same export was seen before.
+
+    Error results are never cached so a fixed parser can retry the same upload.
+    """
+    key = cache_key(file_bytes, source)
+    parsed = get_cached(key)
+    if parsed is not None:
+        return parsed
+
+    parsed = parse_func(file_bytes)
+    if 'error' not in parsed:
+        try:
+            put_cached(key, parsed)
+        except OSError:
+            # A read-only or full disk should not break parsing
+            pass
+    return parsed
@@ -0,0 +1,170 @@
+from array import array
+
+import numpy as np
+import pandas as pd
+
+from parser.os_classify import classify_os
+
+# Compact per-VM column store kept alongside the parsed summary.
+# Low-cardinality text columns are categorical; numbers use 32-bit types.
+INVENTORY_COLUMNS = ['vm', 'uuid', 'power_state', 'cpus', 'memory_gb', 'os', 'os_family', 'cluster', 'host']
+CATEGORY_COLUMNS = ['power_state', 'os', 'cluster', 'host']
+STRING_COLUMNS = ['vm', 'uuid']
+HOST_COLUMNS = ['host', 'cluster', 'datacenter', 'cpu_sockets', 'cores', 'memory_gb']
+# Optional per-VM utilization (percent) — kept only when the export provides it
+UTILIZATION_COLUMNS = ['cpu_avg_pct', 'cpu_peak_pct', 'mem_avg_pct', 'mem_peak_pct']
+# Optional per-VM provisioned and consumed storage (GB) — summed from RVTools vPartition rows
+STORAGE_COLUMNS = ['storage_gb', 'storage_consumed_gb']
+
+
+def normalize_power_state(value):
+    """Map RVTools/LiveOptics power values onto poweredOn / poweredOff."""
+    if value is None:
+        return None
+    text = str(value).strip().lower()
+    if text in ('poweredon', 'on', 'true'):
+        return 'poweredOn'
+    if text in ('poweredoff', 'off', 'false'):
+        return 'poweredOff'
+    if text in ('suspended',):
+        return 'suspended'
+    return None
+
+
+class VMInventoryBuilder:
+    """Accumulate per-VM rows into typed arrays without holding a DataFrame.
+
+    Used by the streaming parser — text values are dictionary-encoded as they
+    arrive, so memory per VM is a few integers regardless of string length.
+    """
+
+    def __init__(self):
+        self.names = []
+        self.uuids = []
+        self.cpus = array('i')
+        self.memory_gb = array('f')
+        self._codes = {c: array('i') for c in CATEGORY_COLUMNS}
+        self._categories = {c: {} for c in CATEGORY_COLUMNS}
+
+    def add(self, vm, power_state, cpus, memory_gb, os_name, cluster, host, uuid=None):
+        self.names.append(None if vm is None else str(vm))
+        self.uuids.append(None if uuid is None else str(uuid))
+        self.cpus.append(int(cpus) if cpus is not None else 0)
+        self.memory_gb.append(float(memory_gb) if memory_gb is not None else 0.0)
+        values = {
+            'power_state': normalize_power_state(power_state),
+            'os': os_name,
+            'cluster': cluster,
+            'host': host,
+        }
+        for column, value in values.items():
+            if value is None or value != value:
+                self._codes[column].append(-1)
+                continue
+            value = str(value)
+            categories = self._categories[column]
+            code = categories.get(value)
+            if code is None:
+                code = categories[value] = len(categories)
+            self._codes[column].append(code)
+
+    def build(self):
+        columns = {
+            'vm': pd.array(self.names, dtype='string'),
+            'uuid': pd.array(self.uuids, dtype='string'),
+            'cpus': pd.array(self.cpus, dtype='int32'),
+            'memory_gb': pd.array(self.memory_gb, dtype='float32'),
+        }
+        for column in CATEGORY_COLUMNS:
+            columns[column] = pd.Categorical.from_codes(
+                list(self._codes[column]), categories=list(self._categories[column]))
+        columns['os_family'] = classify_os(columns['os'])['family'].values
+        return pd.DataFrame(columns)[INVENTORY_COLUMNS]
+
+
+def compact_inventory(df):
+    """Coerce a raw per-VM frame holding any subset of INVENTORY_COLUMNS to the compact schema.
+
+    Missing columns are filled with nulls so every inventory has the same
+    schema whichever parser produced it. UTILIZATION_COLUMNS and
+    STORAGE_COLUMNS are appended only when present in the input.
+    """
+    df = df.reset_index(drop=True)
+    missing = pd.Series([None] * len(df), dtype='object')
+    columns = {}
+    for column in INVENTORY_COLUMNS:
+        values = df[column] if column in df.columns else missing
+        if column == 'os_family':
+            continue
+        if column == 'cpus':
+            columns[column] = pd.to_numeric(values, errors='coerce').fillna(0).astype('int32')
+        elif column == 'memory_gb':
+            columns[column] = pd.to_numeric(values, errors='coerce').fillna(0).astype('float32')
+        elif column in STRING_COLUMNS:
+            columns[column] = values.astype('string')
+        else:
+            if column == 'power_state':
+                values = values.map(normalize_power_state)
+            values = values.where(values.isna(), values.astype(str))
+            columns[column] = values.astype('category')
+    # Derived from the OS categories, never taken from the input
+    columns['os_family'] = classify_os(columns['os']).set_index(columns['os'].index)['family']
+    optional = [c for c in UTILIZATION_COLUMNS + STORAGE_COLUMNS if c in df.columns]
+    for column in optional:
+        columns[column] = pd.to_numeric(df[column], errors='coerce').astype('float32')
+    return pd.DataFrame(columns)[INVENTORY_COLUMNS + optional]
+
+
+def attach_storage(inventory, partitions):
+    """inventory with STORAGE_COLUMNS summed from per-partition rows.
+
+    partitions holds one row per guest partition with 'vm', 'uuid',
+    'capacity_mb' and 'consumed_mb'. A partition belongs to the VM with its
+    UUID, failing that to the first VM of its name; partitions matching no
+    VM are left out.
+    """
+    partitions = partitions.reset_index(drop=True)
+    row = _first_row(inventory['uuid'], partitions['uuid']).fillna(_first_row(inventory['vm'], partitions['vm']))
+    matched = row.notna().to_numpy()
+    rows = row[matched].to_numpy(dtype='int64')
+    storage = {}
+    for column, source in zip(STORAGE_COLUMNS, ['capacity_mb', 'consumed_mb']):
+        mb = pd.to_numeric(partitions[source], errors='coerce').fillna(0).to_numpy(dtype='float64')[matched]
+        storage[column] = (np.bincount(rows, weights=mb, minlength=len(inventory)) / 1024).astype('float32')
+    return inventory.assign(**storage)
+
+
+def _first_row(keys, lookup):
+    """Position of the first entry of keys equal to each value of lookup, NaN where none."""
+    positions = pd.Series(np.arange(len(keys)), index=pd.Index(keys.astype(object)))
+    positions = positions[positions.index.notna() & ~positions.index.duplicated()]
+    return lookup.astype(object).map(positions)
+
+
+def compact_hosts(df):
+    """Coerce a raw per-host frame holding any subset of HOST_COLUMNS to the compact schema."""
+    df = df.reset_index(drop=True)
+    missing = pd.Series([None] * len(df), dtype='object')
+    columns = {}
+    for column in HOST_COLUMNS:
+        values = df[column] if column in df.columns else missing
+        if column in ('cpu_sockets', 'cores'):
+            columns[column] = pd.to_numeric(values, errors='coerce').fillna(0).astype('int32')
+        elif column == 'memory_gb':
+            columns[column] = pd.to_numeric(values, errors='coerce').fillna(0).astype('float32')
+        elif column == 'host':
+            columns[column] = values.astype('string')
+        else:
+            values = values.where(values.isna(), values.astype(str))
+            columns[column] = values.astype('category')
+    return pd.DataFrame(columns)[HOST_COLUMNS]
+
+
+def save_inventory(df, filepath):
+    """Persist a per-VM or per-host inventory as Parquet (categoricals and dtypes round-trip)."""
+    df.to_parquet(filepath, index=False)
+
+
+def load_inventory(filepath):
+    """Load an inventory written by save_inventory."""
+    return pd.read_parquet(filepath)
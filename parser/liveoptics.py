@@ -1,26 +1,25 @@
 import pandas as pd
 
+from parser.inventory import compact_inventory, compact_hosts
+from parser.os_classify import summarize_os
+from parser.reader import open_excel
+from parser.schema import load_table
 
-def parse_liveoptics(filepath):
-    """Parse a real LiveOptics VMware xlsx export."""
+
+def parse_liveoptics(filepath, engine=None):
+    """Parse a real LiveOptics VMware xlsx export (path, file object or bytes)."""
     try:
-        xl = pd.ExcelFile(filepath, engine='openpyxl')
-        sheets = xl.sheet_names
-        sheets_lower = {s.lower().strip(): s for s in sheets}
+        xl = open_excel(filepath, engine)
         data = {}
 
         # ── VMs Sheet ─────────────────────────────────────────────
-        vm_sheet = _find_sheet(sheets_lower, ['vms', 'virtual machines', 'vm inventory'])
-        if vm_sheet:
-            vms = xl.parse(vm_sheet)
-            vms.columns = vms.columns.str.strip()
-
+        vms, vm_cols = load_table(xl, 'vms')
+        if vms is not None:
             data['total_vms'] = len(vms)
 
             # Power state — real LiveOptics uses poweredOn/poweredOff
-            power_col = _find_col(vms, ['power state', 'powerstate', 'isrunning'])
-            if power_col:
-                col_lower = vms[power_col].astype(str).str.lower()
+            if 'power_state' in vm_cols:
+                col_lower = vms['power_state'].astype(str).str.lower()
                 data['powered_on_vms'] = int(col_lower.isin(['poweredon', 'on', 'true']).sum())
                 data['powered_off_vms'] = int(col_lower.isin(['poweredoff', 'off', 'false']).sum())
             else:
@@ -28,99 +27,56 @@ def parse_liveoptics(filepath):
                 data['powered_off_vms'] = 0
 
             # vCPU — real column is 'Virtual CPU'
-            cpu_col = _find_col(vms, ['virtual cpu', 'vcpus', 'cpus', 'cpu count', 'num cpu', 'vcpu'])
-            if cpu_col:
-                data['total_vcpu'] = int(pd.to_numeric(vms[cpu_col], errors='coerce').fillna(0).sum())
-
-            # Memory — real column is 'Provisioned Memory (MiB)'
-            mem_col = _find_col(vms, ['provisioned memory (mib)', 'memory (mib)', 'provisioned memory',
-                                       'memory (mb)', 'memory(mb)', 'memory mb', 'ram (mb)', 'memory'])
-            if mem_col:
-                mem_values = pd.to_numeric(vms[mem_col], errors='coerce').fillna(0)
-                # Convert MiB to GB
-                if mem_values.mean() > 1000:
-                    data['total_vram_gb'] = round(mem_values.sum() / 1024, 2)
-                else:
-                    data['total_vram_gb'] = round(mem_values.sum(), 2)
-
-            # OS — real column is 'VM OS'
-            os_col = _find_col(vms, ['vm os', 'operating system', 'guest os', 'os type'])
-            if os_col:
-                os_counts = vms[os_col].value_counts().to_dict()
-                data['os_breakdown'] = os_counts
-                windows_vms = sum(v for k, v in os_counts.items()
-                                  if 'windows' in str(k).lower())
-                linux_vms = sum(v for k, v in os_counts.items()
-                                if any(x in str(k).lower()
-                                       for x in ['linux', 'red hat', 'ubuntu',
-                                                  'centos', 'suse', 'rhel']))
-                data['windows_vms'] = windows_vms
-                data['linux_vms'] = linux_vms
-                data['windows_ratio'] = round(windows_vms / max(data['total_vms'], 1), 2)
-
-                # Old OS detection
-                old_keywords = ['2008', '2003', '2012', 'windows 7', 'centos 6',
-                                 'rhel 6', 'rhel6', 'windows 10']
-                old_os = vms[vms[os_col].astype(str).str.lower().str.contains(
-                    '|'.join(old_keywords), na=False)]
-                data['old_os_vms'] = len(old_os)
-                data['old_os_list'] = old_os[os_col].value_counts().to_dict() if len(old_os) > 0 else {}
+            if 'cpus' in vm_cols:
+                data['total_vcpu'] = int(pd.to_numeric(vms['cpus'], errors='coerce').fillna(0).sum())
+
+            # Memory — real column is 'Provisioned Memory (MiB)', converted to GB by the schema
+            if 'memory_gb' in vm_cols:
+                data['total_vram_gb'] = round(vms['memory_gb'].sum(), 2)
+
+            # OS breakdown and old OS detection — real column is 'VM OS'
+            if 'os' in vm_cols:
+                data.update(summarize_os(vms['os'], data['total_vms']))
 
             # Large VMs
-            if cpu_col:
-                cpu_numeric = pd.to_numeric(vms[cpu_col], errors='coerce')
+            if 'cpus' in vm_cols:
+                cpu_numeric = pd.to_numeric(vms['cpus'], errors='coerce')
                 data['large_vms'] = int((cpu_numeric >= 8).sum())
                 data['oversized_candidates'] = int((cpu_numeric >= 16).sum())
 
             # Cluster count from VM data
-            cluster_col = _find_col(vms, ['cluster'])
-            if cluster_col:
-                data['total_clusters'] = vms[cluster_col].nunique()
+            if 'cluster' in vm_cols:
+                data['total_clusters'] = vms['cluster'].nunique()
 
-        # ── ESX Hosts Sheet ───────────────────────────────────────
-        host_sheet = _find_sheet(sheets_lower, ['esx hosts', 'esxi hosts', 'hosts',
-                                                  'host inventory'])
-        if host_sheet:
-            hosts = xl.parse(host_sheet)
-            hosts.columns = hosts.columns.str.strip()
+            # Per-VM column store for drill-downs
+            data['vm_inventory'] = compact_inventory(vms.rename(columns={'name': 'vm'}))
 
+        # ── ESX Hosts Sheet ───────────────────────────────────────
+        hosts, host_cols = load_table(xl, 'hosts')
+        if hosts is not None:
             data['total_hosts'] = len(hosts)
 
             # CPU Sockets
-            socket_col = _find_col(hosts, ['cpu sockets', 'sockets', 'num sockets'])
-            if socket_col:
+            if 'cpu_sockets' in host_cols:
                 data['total_physical_cpu'] = int(
-                    pd.to_numeric(hosts[socket_col], errors='coerce').fillna(0).sum())
+                    pd.to_numeric(hosts['cpu_sockets'], errors='coerce').fillna(0).sum())
 
             # CPU Cores — real column is 'CPU Cores'
-            cores_col = _find_col(hosts, ['cpu cores', 'total cores', 'cores',
-                                           'num cores', 'cores per socket'])
-            if cores_col:
+            if 'cores' in host_cols:
                 data['total_physical_cores'] = int(
-                    pd.to_numeric(hosts[cores_col], errors='coerce').fillna(0).sum())
-
-            # Memory — real column is 'Memory (KiB)' — convert to GB
-            mem_col = _find_col(hosts, ['memory (kib)', 'memory(kib)', 'memory (kb)',
-                                         'memory (gb)', 'memory(gb)', 'memory gb',
-                                         'ram (gb)', 'total memory', 'memory'])
-            if mem_col:
-                mem_vals = pd.to_numeric(hosts[mem_col], errors='coerce').fillna(0)
-                avg = mem_vals.mean()
-                if avg > 1000000:
-                    # KiB to GB
-                    data['total_host_ram_gb'] = round(mem_vals.sum() / (1024 * 1024), 2)
-                elif avg > 1000:
-                    # MiB or MB to GB
-                    data['total_host_ram_gb'] = round(mem_vals.sum() / 1024, 2)
-                else:
-                    data['total_host_ram_gb'] = round(mem_vals.sum(), 2)
+                    pd.to_numeric(hosts['cores'], errors='coerce').fillna(0).sum())
+
+            # Memory — real column is 'Memory (KiB)', converted to GB by the schema
+            if 'memory_gb' in host_cols:
+                data['total_host_ram_gb'] = round(hosts['memory_gb'].sum(), 2)
+
+            # Per-host column store
+            data['host_inventory'] = compact_hosts(hosts.rename(columns={'name': 'host'}))
 
             # VM density from host data
-            vm_count_col = _find_col(hosts, ['guest vm count', 'number of vms',
-                                              'vm count', 'vms'])
-            if vm_count_col:
+            if 'vm_count' in host_cols:
                 total_vms_from_hosts = pd.to_numeric(
-                    hosts[vm_count_col], errors='coerce').fillna(0).sum()
+                    hosts['vm_count'], errors='coerce').fillna(0).sum()
                 if total_vms_from_hosts > 0:
                     data['vm_density'] = round(
                         total_vms_from_hosts / data['total_hosts'], 1)
@@ -135,27 +91,13 @@ def parse_liveoptics(filepath):
                 data['vm_density'] = round(data['total_vms'] / data['total_hosts'], 1)
 
         # ── Host Devices / Storage Sheet ─────────────────────────
-        storage_sheet = _find_sheet(sheets_lower, ['host devices', 'datastores',
-                                                     'datastore inventory', 'storage'])
-        if storage_sheet:
-            ds = xl.parse(storage_sheet)
-            ds.columns = ds.columns.str.strip()
-
-            cap_col = _find_col(ds, ['capacity (gib)', 'capacity(gib)', 'capacity (gb)',
-                                      'capacity(gb)', 'capacity gb', 'total capacity',
-                                      'capacity'])
-            used_col = _find_col(ds, ['used capacity (gib)', 'used (gib)',
-                                       'used capacity (gb)', 'used (gb)',
-                                       'used gb', 'used space', 'used'])
-
-            if cap_col:
-                cap_vals = pd.to_numeric(ds[cap_col], errors='coerce').fillna(0)
-                # Check if GiB (values typically large) vs GB
-                data['total_storage_gb'] = round(cap_vals.sum(), 2)
-
-            if used_col:
-                used_vals = pd.to_numeric(ds[used_col], errors='coerce').fillna(0)
-                data['consumed_storage_gb'] = round(used_vals.sum(), 2)
+        ds, ds_cols = load_table(xl, 'storage')
+        if ds is not None:
+            if 'capacity_gb' in ds_cols:
+                data['total_storage_gb'] = round(ds['capacity_gb'].sum(), 2)
+
+            if 'used_gb' in ds_cols:
+                data['consumed_storage_gb'] = round(ds['used_gb'].sum(), 2)
 
             if data.get('total_storage_gb', 0) > 0 and data.get('consumed_storage_gb'):
                 data['storage_utilization'] = round(
@@ -171,24 +113,3 @@ def parse_liveoptics(filepath):
     except Exception as e:
         return {"error": str(e)}
 
-
-def _find_sheet(sheets_lower, candidates):
-    for candidate in candidates:
-        if candidate.lower() in sheets_lower:
-            return sheets_lower[candidate.lower()]
-    return None
-
-
-def _find_col(df, candidates):
-    cols_lower = {c.lower().strip(): c for c in df.columns}
-    # Exact match first
-    for candidate in candidates:
-        if candidate.lower() in cols_lower:
-            return cols_lower[candidate.lower()]
-    # Partial match — only if candidate is 4+ characters to avoid false matches
-    for candidate in candidates:
-        if len(candidate) >= 4:
-            for col_lower, col_orig in cols_lower.items():
-                if candidate.lower() in col_lower:
-                    return col_orig
-    return None
\ No newline at end of file
@@ -0,0 +1,188 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from parser.inventory import compact_inventory, compact_hosts
+from parser.os_classify import summarize_os_counts
+from parser.reader import prefers_streaming
+from parser.rvtools import parse_rvtools, calculate_health_score
+
+
+def parse_rvtools_many(sources, max_workers=None, engine=None):
+    """Parse several RVTools exports (one per vCenter) in parallel and merge them.
+
+    sources is a list of (source_name, filepath_or_bytes) pairs. Each export is parsed
+    in its own process, so wall time tracks the slowest file rather than the
+    sum. engine picks the xlsx reader, by default the fastest installed; the
+    streaming parser is only used when that is openpyxl.
+    """
+    sources = list(sources)
+    if not sources:
+        return {"error": "No RVTools exports supplied."}
+
+    workers = max_workers or min(len(sources), os.cpu_count() or 1)
+    if workers <= 1 or len(sources) == 1:
+        results = [_parse_one(source, engine) for source in sources]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_parse_one, sources, [engine] * len(sources)))
+
+    return merge_parsed(results)
+
+
+def _parse_one(source, engine=None):
+    name, filepath = source
+    start = time.perf_counter()
+    parsed = parse_rvtools(filepath, streaming=prefers_streaming(engine), engine=engine, inventory=True)
+    return name, parsed, round(time.perf_counter() - start, 3)
+
+
+def merge_parsed(results):
+    """Merge (source_name, parsed, seconds) results into one environment.
+
+    Repeated source names (several exports left as RVTools_export_all.xlsx)
+    are numbered name#2, name#3, ... so every export stays distinct. VMs
+    are deduplicated by VM UUID. A VM without a UUID is only merged with a
+    UUID-less VM of the same name from an earlier export, and those merges
+    are counted in vms_merged_by_name for the user to check. Hosts are
+    deduplicated by host name, keeping the first export that reported them.
+
+    Storage is summed over the deduplicated VMs' partitions. Partitions that
+    matched no VM in their own export are added per export.
+    """
+    stats = []
+    vm_frames = []
+    host_frames = []
+    # Storage of partitions not attributed to any VM
+    unmatched_storage = unmatched_consumed = 0
+
+    names = _unique_names([name for name, _, _ in results])
+    for name, (_, parsed, seconds) in zip(names, results):
+        stat = {
+            'source': name,
+            'seconds': seconds,
+            'total_vms': parsed.get('total_vms', 0),
+            'total_hosts': parsed.get('total_hosts', 0),
+            'duplicate_vms': 0,
+            'vms_merged_by_name': 0,
+            'duplicate_hosts': 0,
+        }
+        stats.append(stat)
+        if 'error' in parsed:
+            stat['error'] = parsed['error']
+            continue
+        vms = parsed.get('vm_inventory')
+        if vms is not None:
+            vm_frames.append(vms.astype({'power_state': object, 'os': object, 'cluster': object, 'host': object})
+                             .assign(source=name))
+        if parsed.get('host_inventory') is not None:
+            host_frames.append(parsed['host_inventory'].astype({'cluster': object, 'datacenter': object})
+                               .assign(source=name))
+        unmatched_storage += parsed.get('total_storage_gb', 0) - _column_sum(vms, 'storage_gb')
+        unmatched_consumed += parsed.get('consumed_storage_gb', 0) - _column_sum(vms, 'storage_consumed_gb')
+
+    if not vm_frames and not host_frames:
+        errors = '; '.join(f"{s['source']}: {s['error']}" for s in stats if 'error' in s)
+        return {"error": f"None of the exports could be parsed — {errors}", 'sources': stats}
+
+    by_source = {s['source']: s for s in stats}
+    data = {}
+
+    # ── VMs — dedupe by UUID, or by name across exports ──────────
+    if vm_frames:
+        vms = pd.concat(vm_frames, ignore_index=True)
+        has_uuid = vms['uuid'].notna()
+        by_uuid = has_uuid & vms['uuid'].duplicated()
+        # Names repeat within one vCenter, so only a name from an earlier export counts
+        named = ~has_uuid & vms['vm'].notna()
+        position = vms['source'].map({name: i for i, name in enumerate(names)})
+        first_export = position[named].groupby(vms.loc[named, 'vm']).transform('min')
+        by_name = pd.Series(False, index=vms.index)
+        by_name[named] = position[named] > first_export
+        for column, duplicated in (('duplicate_vms', by_uuid), ('vms_merged_by_name', by_name)):
+            for source, count in vms.loc[duplicated, 'source'].value_counts().items():
+                by_source[source][column] = int(count)
+        vms = vms[~(by_uuid | by_name)]
+        inventory = compact_inventory(vms)
+        inventory['source'] = pd.Categorical(vms['source'].values, categories=names)
+        data.update(_summarize_vms(inventory))
+        data['vms_merged_by_name'] = int(by_name.sum())
+        data['vm_inventory'] = inventory
+
+    # ── Hosts — dedupe by host name ──────────────────────────────
+    if host_frames:
+        hosts = pd.concat(host_frames, ignore_index=True)
+        key = hosts['host'].str.lower()
+        duplicated = key.notna() & key.duplicated()
+        for source, count in hosts.loc[duplicated, 'source'].value_counts().items():
+            by_source[source]['duplicate_hosts'] = int(count)
+        hosts = hosts[~duplicated]
+        host_inventory = compact_hosts(hosts)
+        host_inventory['source'] = pd.Categorical(hosts['source'].values)
+
+        data['total_hosts'] = len(host_inventory)
+        data['total_physical_cores'] = int(host_inventory['cores'].sum())
+        data['total_physical_cpu'] = int(host_inventory['cpu_sockets'].sum())
+        data['total_host_ram_gb'] = round(float(host_inventory['memory_gb'].astype('float64').sum()), 2)
+        data['host_inventory'] = host_inventory
+
+        # Cluster names repeat across vCenters, so count them per source
+        clustered = hosts.dropna(subset=['cluster'])
+        data['total_clusters'] = int(len(clustered[['source', 'cluster']].drop_duplicates()))
+
+        if data.get('total_vcpu') and data.get('total_physical_cores'):
+            data['vcpu_pcpu_ratio'] = round(data['total_vcpu'] / data['total_physical_cores'], 2)
+        if data.get('total_vms') and data.get('total_hosts'):
+            data['vm_density'] = round(data['total_vms'] / data['total_hosts'], 1)
+
+    # ── Storage — each deduplicated VM's partitions once ─────────
+    vms = data.get('vm_inventory')
+    data['total_storage_gb'] = round(unmatched_storage + _column_sum(vms, 'storage_gb'), 2)
+    data['consumed_storage_gb'] = round(unmatched_consumed + _column_sum(vms, 'storage_consumed_gb'), 2)
+    if data['total_storage_gb'] > 0:
+        data['storage_utilization'] = round(data['consumed_storage_gb'] / data['total_storage_gb'] * 100, 1)
+
+    data['sources'] = stats
+    data['health'] = calculate_health_score(data)
+
+    return data
+
+
+def _unique_names(names):
+    """names with repeats numbered name#2, name#3, ..."""
+    used = set()
+    unique = []
+    for name in names:
+        candidate, n = name, 1
+        while candidate in used:
+            n += 1
+            candidate = f"{name}#{n}"
+        used.add(candidate)
+        unique.append(candidate)
+    return unique
+
+
+def _column_sum(frame, column):
+    if frame is None or column not in frame:
+        return 0.0
+    return float(frame[column].astype('float64').sum())
+
+
+def _summarize_vms(vms):
+    """Recompute the vInfo-derived summary fields from a merged per-VM inventory."""
+    data = {}
+    total_vms = len(vms)
+    data['total_vms'] = total_vms
+    data['powered_on_vms'] = int((vms['power_state'] == 'poweredOn').sum())
+    data['powered_off_vms'] = int((vms['power_state'] == 'poweredOff').sum())
+    data['total_vcpu'] = int(vms['cpus'].sum())
+    data['total_vram_gb'] = round(float(vms['memory_gb'].astype('float64').sum()), 2)
+
+    data.update(summarize_os_counts(vms['os'].value_counts().to_dict(), total_vms))
+
+    data['large_vms'] = int((vms['cpus'] >= 8).sum())
+    data['oversized_candidates'] = int((vms['cpus'] >= 16).sum())
+
+    return data
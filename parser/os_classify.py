@@ -0,0 +1,122 @@
+import re
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+FAMILIES = ['Windows', 'Linux', 'Other']
+
+# Guest OS pattern table — first match wins, so specific versions come before
+# the generic family fallbacks. Columns: pattern, family, version, vendor
+# end-of-support date, and whether the VM counts as legacy/old OS for
+# health scoring.
+OS_TABLE = [
+    (r'windows.*2003', 'Windows', 'Windows Server 2003', '2015-07-14', True),
+    (r'windows.*2008', 'Windows', 'Windows Server 2008', '2020-01-14', True),
+    (r'windows.*2012', 'Windows', 'Windows Server 2012', '2023-10-10', True),
+    (r'windows.*2016', 'Windows', 'Windows Server 2016', '2027-01-12', False),
+    (r'windows.*2019', 'Windows', 'Windows Server 2019', '2029-01-09', False),
+    (r'windows.*2022', 'Windows', 'Windows Server 2022', '2031-10-14', False),
+    (r'windows.*2025', 'Windows', 'Windows Server 2025', '2034-11-14', False),
+    (r'windows xp', 'Windows', 'Windows XP', '2014-04-08', True),
+    (r'windows 7', 'Windows', 'Windows 7', '2020-01-14', True),
+    (r'windows 8', 'Windows', 'Windows 8', '2023-01-10', False),
+    (r'windows 10', 'Windows', 'Windows 10', '2025-10-14', True),
+    (r'windows 11', 'Windows', 'Windows 11', None, False),
+    (r'windows', 'Windows', None, None, False),
+    (r'(?:rhel|red hat enterprise linux)\s*-?\s*4\b', 'Linux', 'RHEL 4', '2012-02-29', True),
+    (r'(?:rhel|red hat enterprise linux)\s*-?\s*5\b', 'Linux', 'RHEL 5', '2017-03-31', True),
+    (r'(?:rhel|red hat enterprise linux)\s*-?\s*6\b', 'Linux', 'RHEL 6', '2020-11-30', True),
+    (r'(?:rhel|red hat enterprise linux)\s*-?\s*7\b', 'Linux', 'RHEL 7', '2024-06-30', False),
+    (r'(?:rhel|red hat enterprise linux)\s*-?\s*8\b', 'Linux', 'RHEL 8', '2029-05-31', False),
+    (r'(?:rhel|red hat enterprise linux)\s*-?\s*9\b', 'Linux', 'RHEL 9', '2032-05-31', False),
+    (r'centos\s*-?\s*5\b', 'Linux', 'CentOS 5', '2017-03-31', True),
+    (r'centos\s*-?\s*6\b', 'Linux', 'CentOS 6', '2020-11-30', True),
+    (r'centos\s*-?\s*7\b', 'Linux', 'CentOS 7', '2024-06-30', False),
+    (r'centos\s*-?\s*8\b', 'Linux', 'CentOS 8', '2021-12-31', False),
+    (r'ubuntu\D*16\.04', 'Linux', 'Ubuntu 16.04', '2021-04-30', False),
+    (r'ubuntu\D*18\.04', 'Linux', 'Ubuntu 18.04', '2023-05-31', False),
+    (r'ubuntu\D*20\.04', 'Linux', 'Ubuntu 20.04', '2025-05-31', False),
+    (r'ubuntu\D*22\.04', 'Linux', 'Ubuntu 22.04', '2027-06-01', False),
+    (r'ubuntu\D*24\.04', 'Linux', 'Ubuntu 24.04', '2029-05-31', False),
+    (r'rhel|red hat', 'Linux', None, None, False),
+    (r'centos|ubuntu|suse|debian|linux', 'Linux', None, None, False),
+]
+
+UNCLASSIFIED = ('Other', None, None, False)
+
+# One alternation for the whole table. Each branch is anchored at the start
+# with a lazy prefix, so the earliest table entry wins rather than the
+# leftmost match position in the string.
+_OS_PATTERN = re.compile(
+    '|'.join(f'(?P<os{i}>.*?(?:{pattern}))' for i, (pattern, *_) in enumerate(OS_TABLE)),
+    re.IGNORECASE | re.DOTALL,
+)
+
+
+@lru_cache(maxsize=8192)
+def classify_os_name(name):
+    """Return (family, version, eol, legacy) for a single guest OS string."""
+    if name is None or name != name:
+        return UNCLASSIFIED
+    match = _OS_PATTERN.match(str(name))
+    if not match:
+        return UNCLASSIFIED
+    _, family, version, eol, legacy = OS_TABLE[int(match.lastgroup[2:])]
+    return family, version, eol, legacy
+
+
+def classify_os(values):
+    """Classify a column of OS strings, returning family/version/eol/legacy per row.
+
+    Each distinct OS string is matched once; results are broadcast back to
+    the rows through the categorical codes, so cost scales with the number
+    of distinct OS names rather than the number of VMs.
+    """
+    cat = pd.Categorical(values)
+    results = [classify_os_name(c) for c in cat.categories]
+    codes = cat.codes
+
+    def _broadcast(labels, categories=None):
+        column = pd.Categorical(labels, categories=categories)
+        # Code -1 (missing OS) indexes the trailing -1 sentinel
+        lookup = np.append(column.codes, -1)
+        return pd.Categorical.from_codes(lookup[codes], categories=column.categories)
+
+    index = values.index if isinstance(values, pd.Series) else None
+    legacy_lookup = np.append(np.array([r[3] for r in results], dtype=bool), False)
+    return pd.DataFrame({
+        'family': _broadcast([r[0] for r in results], FAMILIES),
+        'version': _broadcast([r[1] for r in results]),
+        'eol': _broadcast([r[2] for r in results]),
+        'legacy': legacy_lookup[codes],
+    }, index=index)
+
+
+def summarize_os_counts(os_counts, total_vms):
+    """Build the parser OS summary fields from a {os_name: vm_count} mapping."""
+    os_counts = {k: int(v) for k, v in sorted(os_counts.items(), key=lambda kv: -kv[1]) if v > 0}
+    windows_vms = linux_vms = 0
+    old_os = {}
+    for name, count in os_counts.items():
+        family, _, _, legacy = classify_os_name(name)
+        if family == 'Windows':
+            windows_vms += count
+        elif family == 'Linux':
+            linux_vms += count
+        if legacy:
+            old_os[name] = count
+
+    return {
+        'os_breakdown': os_counts,
+        'windows_vms': windows_vms,
+        'linux_vms': linux_vms,
+        'windows_ratio': round(windows_vms / max(total_vms, 1), 2),
+        'old_os_vms': sum(old_os.values()),
+        'old_os_list': old_os,
+    }
+
+
+def summarize_os(values, total_vms):
+    """Build the parser OS summary fields from a column of OS strings."""
+    return summarize_os_counts(pd.Series(values).value_counts().to_dict(), total_vms)
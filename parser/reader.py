@@ -0,0 +1,178 @@
+import importlib.util
+import io
+import os
+
+import pandas as pd
+from openpyxl.reader.excel import ExcelReader
+from openpyxl.worksheet._read_only import ReadOnlyWorksheet
+from openpyxl.worksheet._reader import DATA_TAG, ROW_TAG, WorkSheetParser
+from openpyxl.xml.functions import iterparse
+
+# Fastest first — python-calamine is a Rust xlsx reader, several times faster
+# than openpyxl. openpyxl is always installed and is the fallback.
+ENGINE_PREFERENCE = ['calamine', 'openpyxl']
+
+_ENGINE_MODULES = {
+    'calamine': 'python_calamine',
+    'openpyxl': 'openpyxl',
+}
+
+
+def available_engines():
+    """Engines from ENGINE_PREFERENCE whose reader package is importable."""
+    return [e for e in ENGINE_PREFERENCE if importlib.util.find_spec(_ENGINE_MODULES[e]) is not None]
+
+
+def default_engine():
+    engines = available_engines()
+    return engines[0] if engines else 'openpyxl'
+
+
+def prefers_streaming(engine=None):
+    """Whether uploads should go through the streaming parser for this engine.
+
+    Only with openpyxl, where read-only streaming is slightly faster than
+    loading each sheet as a DataFrame. With calamine the DataFrame path is
+    several times faster than either, and when the per-VM inventory is kept
+    peak memory is similar on both paths.
+    """
+    return (engine or default_engine()) == 'openpyxl'
+
+
+def as_source(source):
+    """Normalize a workbook source — a path, a binary file object, or raw bytes.
+
+    bytes / bytearray / memoryview are wrapped in a BytesIO; file objects
+    (including Streamlit uploads, which are BytesIO) are rewound and read
+    in place, so uploads never touch disk.
+    """
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return io.BytesIO(source)
+    _rewind(source)
+    return source
+
+
+def open_excel(source, engine=None):
+    """Open a workbook as a pandas ExcelFile with the preferred engine.
+
+    Falls back to openpyxl when the preferred engine is missing, too old for
+    the installed pandas, or cannot read this particular file.
+    """
+    source = as_source(source)
+    engine = engine or default_engine()
+    try:
+        return pd.ExcelFile(source, engine=engine)
+    except Exception:
+        if engine == 'openpyxl':
+            raise
+        _rewind(source)
+        return pd.ExcelFile(source, engine='openpyxl')
+
+
+class RowReader:
+    """Row-at-a-time access to a workbook for the streaming parsers.
+
+    openpyxl read-only mode, with the row parser below, keeps memory flat
+    regardless of sheet size. calamine is much faster but materializes each sheet (compactly, in Rust)
+    before iterating, so it trades memory for speed.
+    """
+
+    def __init__(self, source, engine='openpyxl'):
+        source = as_source(source)
+        self.engine = engine
+        if engine == 'calamine':
+            try:
+                from python_calamine import CalamineWorkbook
+                if isinstance(source, (str, os.PathLike)):
+                    self._wb = CalamineWorkbook.from_path(os.fspath(source))
+                else:
+                    self._wb = CalamineWorkbook.from_filelike(source)
+                self.sheet_names = list(self._wb.sheet_names)
+                return
+            except Exception:
+                _rewind(source)
+                self.engine = 'openpyxl'
+        reader = _StreamingExcelReader(source, read_only=True, data_only=True)
+        reader.read()
+        self._wb = reader.wb
+        self.sheet_names = self._wb.sheetnames
+
+    def iter_rows(self, sheet):
+        """Yield each row of a sheet as a tuple, with empty cells as None."""
+        if self.engine == 'calamine':
+            for row in self._wb.get_sheet_by_name(sheet).iter_rows():
+                yield tuple(None if v == '' else v for v in row)
+        else:
+            # Rows are read to the real end, whatever dimension tag the exporter wrote
+            yield from self._wb[sheet].iter_values()
+
+    def close(self):
+        if self.engine == 'openpyxl':
+            self._wb.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class _RowParser(WorkSheetParser):
+    """openpyxl's worksheet parser, reduced to rows and detaching each row once read.
+
+    WorkSheetParser.parse clears each row but leaves it attached to
+    <sheetData>, so the tree still grows by one element per row.
+    """
+
+    def parse(self):
+        sheet_data = None
+        for event, element in iterparse(self.source, events=('start', 'end')):
+            if event == 'start':
+                if element.tag == DATA_TAG:
+                    sheet_data = element
+            elif element.tag == ROW_TAG:
+                row = self.parse_row(element)
+                sheet_data.clear()
+                yield row
+
+
+class _StreamingWorksheet(ReadOnlyWorksheet):
+    """A read-only worksheet whose rows stream in constant memory."""
+
+    def _get_size(self):
+        # ReadOnlyWorksheet scans for a <dimension> tag on open, parsing a
+        # sheet without one end to end; iter_values never uses dimensions
+        pass
+
+    def iter_values(self):
+        """Yield each row's values as a tuple, with () for rows missing from the sheet."""
+        parent = self.parent
+        with self._get_source() as src:
+            parser = _RowParser(src, self._shared_strings, data_only=parent.data_only, epoch=parent.epoch,
+                                date_formats=parent._date_formats, timedelta_formats=parent._timedelta_formats)
+            expected = 1
+            for idx, cells in parser.parse():
+                for _ in range(expected, idx):
+                    yield ()
+                expected = idx + 1
+                yield self._get_row(cells, values_only=True)
+
+
+class _StreamingExcelReader(ExcelReader):
+    """openpyxl's read-only workbook loader, opening worksheets as _StreamingWorksheet."""
+
+    def read_worksheets(self):
+        for sheet, rel in self.parser.find_sheets():
+            if rel.target not in self.valid_files:
+                continue
+            if "chartsheet" in rel.Type:
+                self.read_chartsheet(sheet, rel)
+                continue
+            ws = _StreamingWorksheet(self.wb, sheet.name, rel.target, self.shared_strings)
+            ws.sheet_state = sheet.state
+            self.wb._sheets.append(ws)
+
+
+def _rewind(source):
+    if hasattr(source, 'seek'):
+        source.seek(0)
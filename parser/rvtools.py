@@ -1,9 +1,39 @@
+from collections import Counter
+
 import pandas as pd
 
-def parse_rvtools(filepath):
-    """Parse RVTools xlsx and extract infrastructure data with health scoring."""
+from parser.reader import open_excel, RowReader
+from parser.inventory import VMInventoryBuilder, attach_storage, compact_inventory, compact_hosts
+from parser.os_classify import summarize_os, summarize_os_counts
+
+# Only the columns the aggregations below actually read
+STREAM_COLUMNS = {
+    'vInfo': ['Powerstate', 'CPUs', 'Memory', 'OS', 'VM', 'Cluster', 'Host', 'VM UUID'],
+    'vHost': ['# Cores', '# CPU', 'Memory', 'Host', 'Name', 'Cluster', 'Datacenter'],
+    'vCluster': [],
+    'vPartition': ['Capacity MB', 'Consumed MB', 'VM', 'VM UUID'],
+}
+
+
+def parse_rvtools(filepath, streaming=False, engine=None, inventory=False):
+    """Parse RVTools xlsx and extract infrastructure data with health scoring.
+
+    filepath may also be a binary file object or bytes-like upload buffer.
+
+    With streaming=True the workbook is read row by row in read-only mode and
+    folded into running totals instead of loading each sheet as a DataFrame.
+    engine picks the xlsx reader (see parser.reader); by default the fastest
+    installed one, or openpyxl for streaming.
+
+    inventory=True also returns the per-VM and per-host column stores
+    (vm_inventory, host_inventory) that consolidation, right-sizing and the
+    breakdowns need. They grow with VM count, so leave it off when only the
+    totals are wanted.
+    """
+    if streaming:
+        return parse_rvtools_streaming(filepath, engine=engine or 'openpyxl', inventory=inventory)
     try:
-        xl = pd.ExcelFile(filepath, engine="openpyxl")
+        xl = open_excel(filepath, engine)
         sheets = xl.sheet_names
         data = {}
 
@@ -16,27 +46,27 @@ def parse_rvtools(filepath):
             data['total_vcpu'] = int(vinfo['CPUs'].sum()) if 'CPUs' in vinfo.columns else 0
             data['total_vram_gb'] = round(vinfo['Memory'].sum() / 1024, 2) if 'Memory' in vinfo.columns else 0
 
-            # OS breakdown
+            # OS breakdown and old OS detection
             if 'OS' in vinfo.columns:
-                os_counts = vinfo['OS'].value_counts().to_dict()
-                data['os_breakdown'] = os_counts
-                windows_vms = sum(v for k, v in os_counts.items() if 'windows' in str(k).lower())
-                linux_vms = sum(v for k, v in os_counts.items() if any(x in str(k).lower() for x in ['linux', 'red hat', 'ubuntu', 'centos', 'suse']))
-                data['windows_vms'] = windows_vms
-                data['linux_vms'] = linux_vms
-                data['windows_ratio'] = round(windows_vms / max(data['total_vms'], 1), 2)
+                data.update(summarize_os(vinfo['OS'], data['total_vms']))
 
             # Oversized VM detection (more than 8 vCPU or 32GB RAM with low utilization proxy)
             if 'CPUs' in vinfo.columns:
                 data['large_vms'] = int(len(vinfo[vinfo['CPUs'] >= 8]))
                 data['oversized_candidates'] = int(len(vinfo[vinfo['CPUs'] >= 16]))
 
-            # Old OS detection
-            if 'OS' in vinfo.columns:
-                old_os_keywords = ['2008', '2003', '2012', 'windows 7', 'centos 6', 'rhel 6']
-                old_os = vinfo[vinfo['OS'].str.lower().str.contains('|'.join(old_os_keywords), na=False)]
-                data['old_os_vms'] = len(old_os)
-                data['old_os_list'] = old_os['OS'].value_counts().to_dict() if len(old_os) > 0 else {}
+            # Per-VM column store for drill-downs (memory in GB)
+            if inventory:
+                data['vm_inventory'] = compact_inventory(pd.DataFrame({
+                    'vm': vinfo.get('VM'),
+                    'uuid': vinfo.get('VM UUID'),
+                    'power_state': vinfo.get('Powerstate'),
+                    'cpus': vinfo.get('CPUs'),
+                    'memory_gb': pd.to_numeric(vinfo['Memory'], errors='coerce') / 1024 if 'Memory' in vinfo.columns else None,
+                    'os': vinfo.get('OS'),
+                    'cluster': vinfo.get('Cluster'),
+                    'host': vinfo.get('Host'),
+                }, index=vinfo.index))
 
         # vHost sheet - host details
         if 'vHost' in sheets:
@@ -46,6 +76,17 @@ def parse_rvtools(filepath):
             data['total_physical_cpu'] = int(vhost['# CPU'].sum()) if '# CPU' in vhost.columns else 0
             data['total_host_ram_gb'] = round(vhost['Memory'].sum() / 1024, 2) if 'Memory' in vhost.columns else 0
 
+            # Per-host column store — older RVTools versions call the host column 'Name'
+            if inventory:
+                data['host_inventory'] = compact_hosts(pd.DataFrame({
+                    'host': vhost['Host'] if 'Host' in vhost.columns else vhost.get('Name'),
+                    'cluster': vhost.get('Cluster'),
+                    'datacenter': vhost.get('Datacenter'),
+                    'cpu_sockets': vhost.get('# CPU'),
+                    'cores': vhost.get('# Cores'),
+                    'memory_gb': pd.to_numeric(vhost['Memory'], errors='coerce') / 1024 if 'Memory' in vhost.columns else None,
+                }, index=vhost.index))
+
             # vCPU to pCPU ratio
             if data.get('total_vcpu') and data.get('total_physical_cores'):
                 data['vcpu_pcpu_ratio'] = round(data['total_vcpu'] / data['total_physical_cores'], 2)
@@ -67,6 +108,146 @@ def parse_rvtools(filepath):
             if data.get('total_storage_gb', 0) > 0:
                 data['storage_utilization'] = round(data['consumed_storage_gb'] / data['total_storage_gb'] * 100, 1)
 
+            # Per-VM storage, so merged exports can count each VM's disks once
+            if data.get('vm_inventory') is not None:
+                data['vm_inventory'] = attach_storage(data['vm_inventory'], pd.DataFrame({
+                    'vm': vpart.get('VM'),
+                    'uuid': vpart.get('VM UUID'),
+                    'capacity_mb': vpart.get('Capacity MB'),
+                    'consumed_mb': vpart.get('Consumed MB'),
+                }, index=vpart.index))
+
+        # Health scoring
+        data['health'] = calculate_health_score(data)
+
+        return data
+
+    except Exception as e:
+        return {"error": str(e)}
+
+
+def parse_rvtools_streaming(filepath, engine='openpyxl', inventory=False):
+    """Parse RVTools xlsx row by row, folding rows into running totals.
+
+    No sheet is held as a DataFrame. Without inventory, memory does not grow
+    with VM count. With inventory=True the per-VM and per-host inventories
+    are built as well, at one compact row per VM and per host.
+    """
+    try:
+        wb = RowReader(filepath, engine)
+        try:
+            sheets = wb.sheet_names
+            data = {}
+
+            # vInfo sheet - VM details
+            if 'vInfo' in sheets:
+                present, rows = _stream_rows(wb.iter_rows('vInfo'), STREAM_COLUMNS['vInfo'])
+                total_vms = powered_on = powered_off = 0
+                total_vcpu = total_mem = 0
+                large_vms = oversized = 0
+                os_counts = Counter()
+                builder = VMInventoryBuilder() if inventory else None
+                for power, cpus, memory, os_name, vm, cluster, host, uuid in rows:
+                    total_vms += 1
+                    if power == 'poweredOn':
+                        powered_on += 1
+                    elif power == 'poweredOff':
+                        powered_off += 1
+                    cpus = _to_number(cpus)
+                    if cpus is not None:
+                        total_vcpu += cpus
+                        if cpus >= 8:
+                            large_vms += 1
+                        if cpus >= 16:
+                            oversized += 1
+                    memory = _to_number(memory)
+                    if memory is not None:
+                        total_mem += memory
+                    if os_name is not None:
+                        os_counts[os_name] += 1
+                    if builder is not None:
+                        builder.add(vm, power, cpus, memory / 1024 if memory is not None else None,
+                                    os_name, cluster, host, uuid)
+
+                data['total_vms'] = total_vms
+                data['powered_on_vms'] = powered_on if 'Powerstate' in present else 0
+                data['powered_off_vms'] = powered_off if 'Powerstate' in present else 0
+                data['total_vcpu'] = int(total_vcpu) if 'CPUs' in present else 0
+                data['total_vram_gb'] = round(total_mem / 1024, 2) if 'Memory' in present else 0
+
+                # OS breakdown and old OS detection - classified once per distinct OS string
+                if 'OS' in present:
+                    data.update(summarize_os_counts(os_counts, total_vms))
+
+                if 'CPUs' in present:
+                    data['large_vms'] = large_vms
+                    data['oversized_candidates'] = oversized
+
+                if builder is not None:
+                    data['vm_inventory'] = builder.build()
+
+            # vHost sheet - host details
+            if 'vHost' in sheets:
+                present, rows = _stream_rows(wb.iter_rows('vHost'), STREAM_COLUMNS['vHost'])
+                total_hosts = total_cores = total_sockets = host_mem = 0
+                host_rows = []
+                for cores, sockets, memory, host, name, cluster, datacenter in rows:
+                    total_hosts += 1
+                    cores, sockets, memory = _to_number(cores), _to_number(sockets), _to_number(memory)
+                    if cores is not None:
+                        total_cores += cores
+                    if sockets is not None:
+                        total_sockets += sockets
+                    if memory is not None:
+                        host_mem += memory
+                    if inventory:
+                        host_rows.append((host if 'Host' in present else name, cluster, datacenter,
+                                          sockets, cores, memory / 1024 if memory is not None else None))
+                data['total_hosts'] = total_hosts
+                data['total_physical_cores'] = int(total_cores) if '# Cores' in present else 0
+                data['total_physical_cpu'] = int(total_sockets) if '# CPU' in present else 0
+                data['total_host_ram_gb'] = round(host_mem / 1024, 2) if 'Memory' in present else 0
+                if inventory:
+                    data['host_inventory'] = compact_hosts(pd.DataFrame(
+                        host_rows, columns=['host', 'cluster', 'datacenter', 'cpu_sockets', 'cores', 'memory_gb']))
+
+                # vCPU to pCPU ratio
+                if data.get('total_vcpu') and data.get('total_physical_cores'):
+                    data['vcpu_pcpu_ratio'] = round(data['total_vcpu'] / data['total_physical_cores'], 2)
+
+                # VM density per host
+                if data.get('total_vms') and data.get('total_hosts'):
+                    data['vm_density'] = round(data['total_vms'] / data['total_hosts'], 1)
+
+            # vCluster sheet
+            if 'vCluster' in sheets:
+                _, rows = _stream_rows(wb.iter_rows('vCluster'), STREAM_COLUMNS['vCluster'])
+                data['total_clusters'] = sum(1 for _ in rows)
+
+            # vPartition sheet - storage
+            if 'vPartition' in sheets:
+                present, rows = _stream_rows(wb.iter_rows('vPartition'), STREAM_COLUMNS['vPartition'])
+                capacity = consumed = 0
+                partitions = [] if data.get('vm_inventory') is not None else None
+                for cap, used, vm, uuid in rows:
+                    cap = _to_number(cap)
+                    used = _to_number(used)
+                    if cap is not None:
+                        capacity += cap
+                    if used is not None:
+                        consumed += used
+                    if partitions is not None:
+                        partitions.append((vm, uuid, cap, used))
+                data['total_storage_gb'] = round(capacity / 1024, 2) if 'Capacity MB' in present else 0
+                data['consumed_storage_gb'] = round(consumed / 1024, 2) if 'Consumed MB' in present else 0
+                if data.get('total_storage_gb', 0) > 0:
+                    data['storage_utilization'] = round(data['consumed_storage_gb'] / data['total_storage_gb'] * 100, 1)
+                if partitions is not None:
+                    data['vm_inventory'] = attach_storage(data['vm_inventory'], pd.DataFrame(
+                        partitions, columns=['vm', 'uuid', 'capacity_mb', 'consumed_mb']))
+        finally:
+            wb.close()
+
         # Health scoring
         data['health'] = calculate_health_score(data)
 
@@ -76,6 +257,37 @@ def parse_rvtools(filepath):
         return {"error": str(e)}
 
 
+def _stream_rows(rows, columns):
+    """Resolve `columns` against the header row of a row iterator.
+
+    Returns the set of columns found and a generator yielding one tuple per
+    non-empty data row, holding only the requested values (None if missing).
+    """
+    header = [str(h).strip() if h is not None else '' for h in next(rows, ())]
+    positions = [header.index(c) if c in header else None for c in columns]
+    present = {c for c, i in zip(columns, positions) if i is not None}
+
+    def _generate():
+        for row in rows:
+            if all(v is None for v in row):
+                continue
+            yield tuple(row[i] if i is not None and i < len(row) else None
+                        for i in positions)
+
+    return present, _generate()
+
+
+def _to_number(value):
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return value if value == value else None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
 def calculate_health_score(data):
     """Generate a health scorecard from parsed data."""
     scores = {}
@@ -0,0 +1,157 @@
+import re
+
+import pandas as pd
+
+# Declarative LiveOptics layout: which sheet holds each table, which header
+# aliases map to each field, and the unit the parser wants the field in.
+#
+# Aliases are tried in order — exact (case-insensitive) matches first, then
+# substring matches for aliases of 4+ characters. Unit conversion uses the
+# unit written in the matched header when there is one, otherwise the
+# 'guess' list of (mean above, assumed source unit) thresholds.
+LIVEOPTICS_SCHEMA = {
+    'vms': {
+        'sheets': ['vms', 'virtual machines', 'vm inventory'],
+        'columns': {
+            'name': {'aliases': ['vm name', 'name', 'vm']},
+            'uuid': {'aliases': ['vm uuid', 'instance uuid', 'uuid']},
+            'power_state': {'aliases': ['power state', 'powerstate', 'isrunning']},
+            'cpus': {'aliases': ['virtual cpu', 'vcpus', 'cpus', 'cpu count', 'num cpu', 'vcpu']},
+            'memory_gb': {
+                'aliases': ['provisioned memory (mib)', 'memory (mib)', 'provisioned memory',
+                            'memory (mb)', 'memory(mb)', 'memory mb', 'ram (mb)', 'memory'],
+                'unit': 'GB',
+                'guess': [(1000, 'MB')],
+            },
+            'os': {'aliases': ['vm os', 'operating system', 'guest os', 'os type']},
+            'cluster': {'aliases': ['cluster']},
+            'host': {'aliases': ['host name', 'esx host', 'host']},
+            # Utilization percentages — drive calculator.rightsizing
+            'cpu_avg_pct': {'aliases': ['cpu average (%)', 'avg cpu (%)', 'cpu average', 'cpu avg', 'average cpu']},
+            'cpu_peak_pct': {'aliases': ['cpu peak (%)', 'peak cpu (%)', 'cpu peak', 'peak cpu', 'cpu max']},
+            'mem_avg_pct': {'aliases': ['memory average (%)', 'avg memory (%)', 'memory average', 'memory avg',
+                                        'average memory']},
+            'mem_peak_pct': {'aliases': ['memory peak (%)', 'peak memory (%)', 'memory peak', 'peak memory',
+                                         'memory max']},
+        },
+    },
+    'hosts': {
+        'sheets': ['esx hosts', 'esxi hosts', 'hosts', 'host inventory'],
+        'columns': {
+            'name': {'aliases': ['host name', 'hostname', 'name', 'host']},
+            'cluster': {'aliases': ['cluster']},
+            'datacenter': {'aliases': ['datacenter', 'data center', 'site']},
+            'cpu_sockets': {'aliases': ['cpu sockets', 'sockets', 'num sockets']},
+            'cores': {'aliases': ['cpu cores', 'total cores', 'cores', 'num cores', 'cores per socket']},
+            'memory_gb': {
+                'aliases': ['memory (kib)', 'memory(kib)', 'memory (kb)', 'memory (gb)', 'memory(gb)',
+                            'memory gb', 'ram (gb)', 'total memory', 'memory'],
+                'unit': 'GB',
+                'guess': [(1000000, 'KB'), (1000, 'MB')],
+            },
+            'vm_count': {'aliases': ['guest vm count', 'number of vms', 'vm count', 'vms']},
+        },
+    },
+    'storage': {
+        'sheets': ['host devices', 'datastores', 'datastore inventory', 'storage'],
+        'columns': {
+            'capacity_gb': {
+                'aliases': ['capacity (gib)', 'capacity(gib)', 'capacity (gb)', 'capacity(gb)',
+                            'capacity gb', 'total capacity', 'capacity'],
+                'unit': 'GB',
+            },
+            'used_gb': {
+                'aliases': ['used capacity (gib)', 'used (gib)', 'used capacity (gb)', 'used (gb)',
+                            'used gb', 'used space', 'used'],
+                'unit': 'GB',
+            },
+        },
+    },
+}
+
+# Binary steps throughout — the app reports GiB as "GB"
+UNIT_FACTORS = {'KB': 1024 ** -2, 'MB': 1024 ** -1, 'GB': 1, 'TB': 1024}
+
+_HEADER_UNIT = re.compile(r'\b([kmgt])i?b\b', re.IGNORECASE)
+
+
+def resolve_sheet(sheet_names, aliases):
+    """Return the workbook sheet matching the first alias, or None."""
+    sheets_lower = {s.lower().strip(): s for s in sheet_names}
+    for alias in aliases:
+        if alias.lower() in sheets_lower:
+            return sheets_lower[alias.lower()]
+    return None
+
+
+def resolve_column(headers, aliases):
+    """Return the header matching the first alias, or None."""
+    cols_lower = {str(c).lower().strip(): c for c in headers}
+    # Exact match first
+    for alias in aliases:
+        if alias.lower() in cols_lower:
+            return cols_lower[alias.lower()]
+    # Partial match — only if alias is 4+ characters to avoid false matches
+    for alias in aliases:
+        if len(alias) >= 4:
+            for col_lower, col_orig in cols_lower.items():
+                if alias.lower() in col_lower:
+                    return col_orig
+    return None
+
+
+def header_unit(header):
+    """Unit written in a header such as 'Memory (KiB)', normalized to KB/MB/GB/TB."""
+    match = _HEADER_UNIT.search(str(header))
+    return f"{match.group(1).upper()}B" if match else None
+
+
+def convert_units(values, header, spec):
+    """Convert a numeric column to spec['unit'] using the header unit or the magnitude guess."""
+    values = pd.to_numeric(values, errors='coerce').fillna(0)
+    target = spec.get('unit')
+    if not target:
+        return values
+    source = header_unit(header)
+    if source is None:
+        source = target
+        mean = values.mean() if len(values) else 0
+        for threshold, unit in spec.get('guess', []):
+            if mean > threshold:
+                source = unit
+                break
+    return values * (UNIT_FACTORS[source] / UNIT_FACTORS[target])
+
+
+def load_table(xl, table, schema=LIVEOPTICS_SCHEMA):
+    """Load one schema table, keeping only the matched columns.
+
+    Returns (df, headers) where df columns are the schema field names and
+    headers maps each resolved field to its original header, or
+    (None, {}) when the sheet is absent.
+
+    The sheet is read once, whole: neither engine skips cells for usecols,
+    and a separate header-only read makes calamine load the sheet twice
+    (see benchmarks/bench_schema.py).
+    """
+    spec = schema[table]
+    sheet = resolve_sheet(xl.sheet_names, spec['sheets'])
+    if sheet is None:
+        return None, {}
+
+    raw = xl.parse(sheet)
+    header_row = list(raw.columns)
+    headers = {}
+    for field, column_spec in spec['columns'].items():
+        header = resolve_column(header_row, column_spec['aliases'])
+        if header is not None:
+            headers[field] = header
+
+    df = pd.DataFrame(index=raw.index)
+    for field, header in headers.items():
+        column_spec = spec['columns'][field]
+        if 'unit' in column_spec:
+            df[field] = convert_units(raw[header], header, column_spec)
+        else:
+            df[field] = raw[header]
+    return df, headers
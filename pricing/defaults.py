@@ -43,6 +43,27 @@ HARDWARE = {
     "datacenter_cost_per_host": 2000, # Rack space, cooling per host per year
 }
 
+# Target host for bin-packing consolidation (calculator.consolidation)
+TARGET_HOST = {
+    "cores": 64,                    # 2 x 32-core sockets
+    "memory_gb": 1024,
+    "vcpu_per_core": 4.0,           # Target vCPU:pCPU overcommit
+    "memory_overcommit": 1.0,       # vRAM:pRAM — 1.0 means no memory overcommit
+    "max_utilization": 0.85,        # Usable fraction after hypervisor/storage overhead
+    "ha_hosts_per_cluster": 1,      # N+1 failover capacity per cluster
+    "max_cluster_hosts": 16,
+}
+
+# Right-sizing from per-VM utilization (calculator.rightsizing)
+RIGHTSIZING = {
+    "basis": "peak",                # Size to 'peak' or 'average' utilization
+    "cpu_target_pct": 70,           # Resize so the basis CPU lands at this utilization
+    "mem_target_pct": 80,
+    "min_vcpu": 1,
+    "min_memory_gb": 1,
+    "memory_step_gb": 1,            # Round recommended vRAM up to this step
+}
+
 # FTE assumptions
 FTE = {
     "avg_fully_loaded_cost": 150000,  # Annual fully loaded FTE cost
@@ -50,6 +71,12 @@ FTE = {
     "toil_percentage": 0.40,          # % of time spent on toil/undifferentiated work
 }
 
+# Cash-flow assumptions
+FINANCE = {
+    "discount_rate": 0.08,            # Annual rate for NPV / discounted payback
+    "billing": "annual",              # Licensing and support invoiced annually in advance
+}
+
 # Soft benefit multipliers
 SOFT_BENEFITS = {
     "deployment_speed_improvement": 0.75,  # 75% faster VM provisioning
@@ -64,4 +91,17 @@ SCORING_WEIGHTS = {
     "container_readiness": 0.20, # Workload types suited for containers
     "budget_sensitivity": 0.20,  # TCO sensitivity
     "operational_complexity": 0.25, # FTE count, skill set
-}
\ No newline at end of file
+}
+
+# Input uncertainty for Monte Carlo analysis — (low, high) multipliers on
+# the point estimate, sampled from a triangular distribution peaking at 1.0
+UNCERTAINTY = {
+    "hardware.avg_host_cost": (0.85, 1.30),            # Street price vs quote, spec creep
+    "hardware.power_cost_per_kwh": (0.80, 1.50),       # Utility rate volatility
+    "hardware.datacenter_cost_per_host": (0.80, 1.25),
+    "fte.avg_fully_loaded_cost": (0.85, 1.20),
+    "pricing.unit_price": (0.70, 1.10),                # Negotiated discount off list
+    "pricing.support_percentage": (0.90, 1.10),
+    "fte_reduction": (0.50, 1.25),                     # Automation benefit rarely lands in full
+    "hardware_efficiency": (0.90, 1.15),
+}
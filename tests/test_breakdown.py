@@ -0,0 +1,42 @@
+import pandas as pd
+
+from calculator.breakdown import MIN_GROUP_HOSTS, allocate, group_sizes, grouped_tco
+
+
+def estate():
+    clusters = ['Edge'] + ['Prod'] * 20
+    return {
+        'total_hosts': len(clusters),
+        'total_physical_cores': 32 * len(clusters),
+        'host_inventory': pd.DataFrame({
+            'host': [f"esx{i:02d}" for i in range(len(clusters))],
+            'cluster': clusters,
+            'cores': [32] * len(clusters),
+        }),
+        'vm_inventory': pd.DataFrame({'cluster': ['Edge'] * 4 + ['Prod'] * 200, 'host': None}),
+    }
+
+
+def test_group_sizes():
+    sizes = group_sizes(estate()).set_index('group')
+    assert sizes.loc['Edge'].tolist() == [1, 32, 4]
+    assert sizes.loc['Prod'].tolist() == [20, 640, 200]
+
+
+def test_allocate_preserves_total():
+    shares = allocate(10, [1, 20, 3])
+    assert shares.sum() == 10
+    assert shares.tolist() == [1, 8, 1]
+
+
+def test_one_host_cluster_is_priced_with_the_host_minimum():
+    for overrides in ({}, {'effective_hosts': 10}):
+        result = grouped_tco(estate(), overrides=overrides)
+        edge = result[result['cluster'] == 'Edge']
+        assert (edge['effective_hosts'] == MIN_GROUP_HOSTS).all()
+        assert (edge['hardware_refresh'] > 0).all()
+        assert (edge['facilities'] > 0).all()
+
+    result = grouped_tco(estate(), overrides={'effective_hosts': 10})
+    prod = result[result['cluster'] == 'Prod']
+    assert (prod['effective_hosts'] == 10).all()
@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+from calculator.cashflow import cash_flow_analysis, cumulative, discounted_payback, irr, npv, spread
+from calculator.tco import current_cost_components
+
+PARSED = {'total_hosts': 12, 'total_physical_cores': 240, 'total_vms': 300}
+
+
+def test_npv_of_known_flows():
+    flows = np.array([-1000.0] + [0.0] * 11 + [1100.0])
+    assert npv(flows, 0) == pytest.approx(100.0)
+    # Month 12 is discounted by exactly one year
+    assert npv(flows, 0.10) == pytest.approx(0.0, abs=1e-9)
+    stacked = np.stack([flows, 2 * flows])
+    np.testing.assert_allclose(npv(stacked, 0.05), [npv(flows, 0.05), 2 * npv(flows, 0.05)])
+
+
+@pytest.mark.parametrize('rate', [-0.5, 0.0, 0.08, 0.35, 2.5])
+def test_irr_recovers_the_discount_rate(rate):
+    months = 36
+    inflows = np.full(months, 100.0)
+    inflows[0] = 0.0
+    flows = inflows.copy()
+    flows[0] = -npv(inflows, rate)
+    assert irr(flows) == pytest.approx(rate, abs=1e-7)
+    assert npv(flows, irr(flows)) == pytest.approx(0.0, abs=1e-4)
+
+
+def test_irr_needs_a_sign_change():
+    assert irr(np.full(12, 100.0)) is None
+    assert irr(np.full(12, -100.0)) is None
+
+
+def test_discounted_payback():
+    flows = np.array([-300.0, 100.0, 100.0, 100.0, 100.0])
+    assert discounted_payback(flows, 0) == pytest.approx(3.0)
+    assert discounted_payback(flows, 0.10) > 3.0
+    assert discounted_payback(np.array([50.0, 10.0]), 0.1) == 0.0
+    assert discounted_payback(np.array([-300.0, 100.0]), 0) is None
+
+
+@pytest.mark.parametrize('billing', ['annual', 'monthly'])
+@pytest.mark.parametrize('years', [1, 2.5, 3, 5])
+def test_spread_preserves_period_totals(billing, years):
+    components = current_cost_components(PARSED, {'years': years})
+    flows = spread(components, years, billing)
+    assert len(flows['total']) == round(years * 12)
+    for line, values in flows.items():
+        if line != 'total':
+            assert values.sum() == pytest.approx(components[line])
+    assert cumulative(flows['total'])[-1] == pytest.approx(flows['total'].sum())
+
+
+def test_cash_flow_analysis_matches_its_own_metrics():
+    analysis = cash_flow_analysis(PARSED, 'VMware VCF', {'years': 3}, discount_rate=0.08)
+    net = analysis['net']
+    assert analysis['months'] == 36
+    np.testing.assert_allclose(net, analysis['current']['total'] - analysis['platform_flows']['total'])
+    assert analysis['npv'] == pytest.approx(npv(net, 0.08))
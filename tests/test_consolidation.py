@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+
+from calculator.consolidation import MEMORY_STEP_GB, consolidate, host_capacity, pack
+
+
+def naive_ffd(cpus, memory_gb, capacity):
+    """Item-by-item first-fit decreasing, in the same order pack() sorts shapes."""
+    cap_cpu, cap_mem = capacity
+    memory = np.ceil(np.asarray(memory_gb, dtype='float64') / MEMORY_STEP_GB) * MEMORY_STEP_GB
+    items = sorted(zip(np.asarray(cpus, dtype='float64'), memory),
+                   key=lambda vm: (-max(vm[0] / cap_cpu, vm[1] / cap_mem), vm[0], vm[1]))
+    used_cpu, used_mem, closed = [], [], []
+    oversized = 0
+    for c, m in items:
+        if c <= 0 and m <= 0:
+            continue
+        if c > cap_cpu or m > cap_mem:
+            oversized += 1
+            used_cpu.append(c)
+            used_mem.append(m)
+            closed.append(True)
+            continue
+        for i in range(len(used_cpu)):
+            if not closed[i] and used_cpu[i] + c <= cap_cpu and used_mem[i] + m <= cap_mem:
+                used_cpu[i] += c
+                used_mem[i] += m
+                break
+        else:
+            used_cpu.append(c)
+            used_mem.append(m)
+            closed.append(False)
+    return np.array(used_cpu), np.array(used_mem), oversized
+
+
+def test_pack_matches_item_by_item_ffd():
+    rng = np.random.default_rng(7)
+    capacity = (64.0, 512.0)
+    for _ in range(20):
+        n = int(rng.integers(1, 400))
+        cpus = rng.choice([1, 2, 4, 8, 16, 24, 96], n)
+        memory = rng.choice([0.5, 1, 2.3, 4, 8, 16, 48, 128, 600], n)
+        got = pack(cpus, memory, capacity)
+        want = naive_ffd(cpus, memory, capacity)
+        np.testing.assert_array_equal(got[0], want[0])
+        np.testing.assert_array_equal(got[1], want[1])
+        assert got[2] == want[2]
+
+
+def test_pack_respects_capacity_and_places_all_demand():
+    rng = np.random.default_rng(1)
+    capacity = host_capacity()
+    cpus = rng.integers(1, 17, 2000)
+    memory = rng.integers(1, 129, 2000).astype(float)
+    used_cpu, used_mem, oversized = pack(cpus, memory, capacity)
+    assert oversized == 0
+    assert (used_cpu <= capacity[0]).all() and (used_mem <= capacity[1]).all()
+    assert used_cpu.sum() == cpus.sum()
+    assert used_mem.sum() == memory.sum()
+
+
+def test_consolidate_skips_powered_off_vms():
+    vms = pd.DataFrame({
+        'cpus': [4, 4, 4],
+        'memory_gb': [16.0, 16.0, 16.0],
+        'power_state': ['poweredOn', 'poweredOff', 'poweredOn'],
+    })
+    assert consolidate(vms)['vms_placed'] == 2
+    assert consolidate(vms, include_powered_off=True)['vms_placed'] == 3
@@ -0,0 +1,53 @@
+import pytest
+
+from calculator.goalseek import _apply, _residual, _totals, goal_seek
+from pricing.defaults import PLATFORMS
+
+PARSED = {'total_hosts': 12, 'total_physical_cores': 240, 'total_vms': 300}
+
+
+def metric_at(key, value, metric, platform_name='VMware VCF', compare_to=None, target=0.0):
+    """metric - target with input key set to value, evaluated independently of the solver."""
+    data, overrides = _apply(PARSED, key, value, {}, PLATFORMS[platform_name])
+    compare_overrides = {} if key.startswith('pricing.') else overrides
+    return _residual(metric, target, *_totals(data, platform_name, overrides, compare_to, compare_overrides))
+
+
+@pytest.mark.parametrize('key, metric, target', [
+    ('pricing.unit_price', 'savings', 0.0),
+    ('pricing.unit_price', 'roi_pct', 25.0),
+    ('pricing.unit_price', 'total', 500000.0),
+    ('hardware.avg_host_cost', 'savings', 100000.0),
+    ('fte.avg_fully_loaded_cost', 'savings', 0.0),
+    ('years', 'savings', 0.0),
+])
+def test_closed_form_hits_target(key, metric, target):
+    result = goal_seek(PARSED, 'VMware VCF', key, metric=metric, target=target)
+    assert result['method'] == 'closed_form'
+    assert result['value'] is not None
+    assert metric_at(key, result['value'], metric, target=target) == pytest.approx(0, abs=1e-6)
+
+
+def test_break_even_against_another_platform():
+    result = goal_seek(PARSED, 'VMware VCF', 'pricing.unit_price', compare_to='Nutanix')
+    assert result['feasible']
+    assert metric_at('pricing.unit_price', result['value'], 'savings',
+                     compare_to='Nutanix') == pytest.approx(0, abs=1e-6)
+
+
+def test_bracket_solves_a_nonlinear_input():
+    target = metric_at('hardware_efficiency', 0.5, 'savings')
+    result = goal_seek(PARSED, 'VMware VCF', 'hardware_efficiency', metric='savings', target=target)
+    assert result['method'] == 'bracket'
+    assert result['feasible']
+    assert abs(metric_at('hardware_efficiency', result['value'], 'savings', target=target)) <= abs(target) * 1e-3
+
+
+def test_unreachable_target_is_infeasible():
+    result = goal_seek(PARSED, 'VMware VCF', 'fte_reduction', metric='savings', target=0.0)
+    assert result['value'] < 0
+    assert not result['feasible']
+
+    result = goal_seek(PARSED, 'VMware VCF', 'parsed.total_hosts', metric='savings', target=0.0)
+    assert result['value'] is None
+    assert not result['feasible']
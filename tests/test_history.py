@@ -0,0 +1,67 @@
+import copy
+import json
+
+import pytest
+
+from calculator.history import apply_delta, diff_sessions, flatten, json_delta
+
+
+def round_trip(old, new):
+    delta = json.loads(json.dumps(json_delta(old, new)))
+    result = apply_delta(copy.deepcopy(old), delta)
+    assert result == new
+    assert json.dumps(result) == json.dumps(new)
+    return delta
+
+
+@pytest.mark.parametrize('old, new', [
+    ({'a': 1, 'b': {'c': 2, 'd': 3}}, {'a': 1, 'b': {'c': 5, 'd': 3}}),
+    ({'a': 1, 'b': {'c': 2, 'd': 3}}, {'a': 1, 'b': {'c': 2}}),
+    ({'a': 1}, {'a': 1, 'b': {'new': [1, 2]}}),
+    ({'a': 1, 'b': 2, 'c': 3}, {'c': 3, 'a': 1, 'b': 2}),
+    ({'a': 1, 'b': 2}, {'a': 1, 'x': 0, 'b': 2}),
+    ({'a': 1}, {'a': 1.0}),
+    ({'a': True}, {'a': 1}),
+    ({'a': [1, 2, 3]}, {'a': [1, 3]}),
+    ({'a': {'b': 1}}, {'a': None}),
+    ({'a': None}, {'a': {'b': 1}}),
+    ({'a': 1}, [1, 2]),
+    (None, {'a': 1}),
+    ({}, {}),
+])
+def test_delta_round_trip(old, new):
+    round_trip(old, new)
+
+
+def test_delta_records_only_changed_leaves():
+    old = {'rate': 0.1, 'hosts': {'h1': {'cores': 32, 'ram': 512}, 'h2': {'cores': 16, 'ram': 256}}}
+    new = {'rate': 0.1, 'hosts': {'h1': {'cores': 32, 'ram': 1024}}}
+    delta = round_trip(old, new)
+    assert delta == {'set': [[['hosts', 'h1', 'ram'], 1024]], 'unset': [['hosts', 'h2']]}
+
+
+def test_unchanged_value_has_empty_delta():
+    value = {'a': {'b': [1, {'c': 2}]}}
+    assert json_delta(value, copy.deepcopy(value)) == {'set': [], 'unset': []}
+
+
+def test_reordered_dict_is_replaced_whole():
+    delta = round_trip({'x': {'a': 1, 'b': 2}}, {'x': {'b': 2, 'a': 1}})
+    assert delta == {'set': [[['x'], {'b': 2, 'a': 1}]], 'unset': []}
+
+
+def test_flatten_keeps_empty_dicts_as_leaves():
+    assert flatten({'a': {'b': 1, 'c': {}}, 'd': 2}) == {('a', 'b'): 1, ('a', 'c'): {}, ('d',): 2}
+
+
+def test_diff_sessions():
+    old = {'assumptions': {'rate': 0.1, 'years': 3}, 'quotes': None}
+    new = {'assumptions': {'rate': 0.12, 'term': 5}, 'quotes': {'vcf': 100}}
+    changes = diff_sessions(old, new)
+    assert changes == [
+        {'section': 'assumptions', 'path': 'rate', 'change': 'changed', 'old': 0.1, 'new': 0.12},
+        {'section': 'assumptions', 'path': 'years', 'change': 'removed', 'old': 3, 'new': None},
+        {'section': 'assumptions', 'path': 'term', 'change': 'added', 'old': None, 'new': 5},
+        {'section': 'quotes', 'path': 'vcf', 'change': 'added', 'old': None, 'new': 100},
+    ]
+    assert diff_sessions(new, new) == []
@@ -0,0 +1,88 @@
+import os
+
+import pandas as pd
+import pytest
+
+from benchmarks.synthetic import generate_rvtools
+from parser.inventory import compact_hosts, compact_inventory
+from parser.multi import _unique_names, merge_parsed, parse_rvtools_many
+from parser.rvtools import parse_rvtools
+
+SAMPLE = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'sample_rvtools.xlsx')
+EXPORT = 'RVTools_export_all.xlsx'
+
+
+@pytest.fixture(scope='module')
+def vcenters(tmp_path_factory):
+    """Two synthetic vCenters whose VM names collide but whose UUIDs differ."""
+    tmp = tmp_path_factory.mktemp('vcenters')
+    return [generate_rvtools(str(tmp / f"vc{seed}.xlsx"), 300, seed=seed) for seed in (0, 1)]
+
+
+def parsed(vms, hosts=None, storage_gb=0.0):
+    return {
+        'total_vms': len(vms),
+        'total_storage_gb': storage_gb,
+        'consumed_storage_gb': 0.0,
+        'vm_inventory': compact_inventory(pd.DataFrame(vms)),
+        'host_inventory': compact_hosts(pd.DataFrame(hosts or {'host': []})),
+    }
+
+
+def test_overlapping_exports_count_storage_once():
+    single = parse_rvtools(SAMPLE, inventory=True)
+    with open(SAMPLE, 'rb') as f:
+        export = f.read()
+    merged = parse_rvtools_many([(EXPORT, export), (EXPORT, export)], max_workers=1)
+
+    for key in ('total_vms', 'total_hosts', 'total_clusters', 'total_storage_gb', 'consumed_storage_gb',
+                'storage_utilization', 'health'):
+        assert merged[key] == single[key], key
+    # The sample has no VM UUID column, so the second copy merges by name
+    assert merged['vms_merged_by_name'] == single['total_vms']
+    assert [s['source'] for s in merged['sources']] == [EXPORT, f"{EXPORT}#2"]
+    assert merged['sources'][1]['duplicate_hosts'] == single['total_hosts']
+
+
+def test_same_export_twice_dedupes_by_uuid(vcenters):
+    single = parse_rvtools(vcenters[0], inventory=True)
+    merged = parse_rvtools_many([(EXPORT, vcenters[0]), (EXPORT, vcenters[0])], max_workers=1)
+    assert merged['total_vms'] == single['total_vms']
+    assert merged['total_storage_gb'] == single['total_storage_gb']
+    assert merged['sources'][1]['duplicate_vms'] == single['total_vms']
+    assert merged['vms_merged_by_name'] == 0
+
+
+def test_distinct_vcenters_sharing_vm_names(vcenters):
+    singles = [parse_rvtools(path, inventory=True) for path in vcenters]
+    merged = parse_rvtools_many([(EXPORT, path) for path in vcenters], max_workers=1)
+    assert merged['total_vms'] == sum(s['total_vms'] for s in singles)
+    assert merged['total_storage_gb'] == pytest.approx(sum(s['total_storage_gb'] for s in singles))
+    assert merged['vms_merged_by_name'] == 0
+    assert merged['vm_inventory']['source'].value_counts().tolist() == [300, 300]
+
+
+def test_uuidless_names_merge_only_across_exports():
+    first = parsed({'vm': ['vcsa', 'vcsa', 'app01'], 'uuid': [None, None, 'u1'], 'storage_gb': [100.0, 50.0, 10.0]},
+                   storage_gb=160.0)
+    second = parsed({'vm': ['vcsa', 'app01'], 'uuid': [None, 'u2'], 'storage_gb': [100.0, 10.0]},
+                    storage_gb=125.0)
+    merged = merge_parsed([('a.xlsx', first, 0.1), ('b.xlsx', second, 0.1)])
+    assert merged['total_vms'] == 4
+    assert merged['vms_merged_by_name'] == 1
+    assert merged['sources'][1]['vms_merged_by_name'] == 1
+    # Deduplicated VMs' storage plus each export's unattributed 5 GB
+    assert merged['total_storage_gb'] == 160.0 + 10.0 + 15.0
+
+
+def test_same_named_clusters_in_same_named_exports():
+    hosts = {'host': ['esx1', 'esx2'], 'cluster': ['Prod', 'Prod'], 'cores': [32, 32]}
+    other = {'host': ['esx3'], 'cluster': ['Prod'], 'cores': [32]}
+    vms = {'vm': ['a'], 'uuid': [None]}
+    merged = merge_parsed([(EXPORT, parsed(vms, hosts), 0.1), (EXPORT, parsed({'vm': ['b'], 'uuid': [None]}, other), 0.1)])
+    assert merged['total_clusters'] == 2
+    assert merged['total_hosts'] == 3
+
+
+def test_unique_names():
+    assert _unique_names(['a', 'b', 'a', 'a#2', 'a']) == ['a', 'b', 'a#2', 'a#2#2', 'a#3']
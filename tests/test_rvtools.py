@@ -0,0 +1,61 @@
+import datetime
+import os
+
+import pandas as pd
+import pytest
+from openpyxl import Workbook, load_workbook
+
+from parser.reader import RowReader
+from parser.rvtools import parse_rvtools
+
+SAMPLE = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'sample_rvtools.xlsx')
+
+
+def test_inventory_is_opt_in():
+    for streaming in (False, True):
+        parsed = parse_rvtools(SAMPLE, streaming=streaming)
+        assert 'vm_inventory' not in parsed and 'host_inventory' not in parsed
+        parsed = parse_rvtools(SAMPLE, streaming=streaming, inventory=True)
+        assert len(parsed['vm_inventory']) == parsed['total_vms']
+        assert len(parsed['host_inventory']) == parsed['total_hosts']
+
+
+def test_streaming_matches_dataframe_path():
+    frames = parse_rvtools(SAMPLE, inventory=True)
+    streamed = parse_rvtools(SAMPLE, streaming=True, inventory=True)
+    for key, value in frames.items():
+        if key.endswith('_inventory'):
+            pd.testing.assert_frame_equal(streamed[key], value, check_dtype=False, check_categorical=False)
+        else:
+            assert streamed[key] == value, key
+
+
+@pytest.fixture
+def gappy_workbook(tmp_path):
+    wb = Workbook()
+    ws = wb.active
+    ws.title = 'Gaps'
+    ws['B2'] = 'header'
+    ws['A4'] = 1
+    ws['C4'] = datetime.datetime(2024, 1, 2)
+    ws['A7'] = 'last'
+    other = wb.create_sheet('Plain')
+    other.append(['a', 'b'])
+    other.append([1.5, None])
+    other['A6'] = True
+    path = tmp_path / 'gaps.xlsx'
+    wb.save(path)
+    return path
+
+
+@pytest.mark.parametrize('path', [SAMPLE, 'gappy'])
+def test_row_reader_matches_openpyxl(path, gappy_workbook):
+    path = gappy_workbook if path == 'gappy' else path
+    reader = RowReader(path)
+    stock = load_workbook(path, read_only=True, data_only=True)
+    for sheet in reader.sheet_names:
+        ws = stock[sheet]
+        ws.reset_dimensions()
+        expected = [tuple(row) for row in ws.iter_rows(values_only=True)]
+        assert list(reader.iter_rows(sheet)) == expected
+    reader.close()
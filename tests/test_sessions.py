@@ -0,0 +1,137 @@
+from contextlib import closing
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+from calculator import sessions
+
+
+@pytest.fixture(autouse=True)
+def sessions_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(sessions, 'SESSIONS_DIR', str(tmp_path))
+    monkeypatch.setattr(sessions, 'INDEX_PATH', str(tmp_path / 'index.sqlite3'))
+    return tmp_path
+
+
+def session_data(version=0):
+    vms = pd.DataFrame({
+        'vm': [f"vm{i}" for i in range(5)],
+        'power_state': pd.Categorical(['poweredOn'] * 4 + ['poweredOff']),
+        'cpus': pd.array([2, 4, 4, 8, 16], dtype='int32'),
+        'memory_gb': pd.array([4.0, 8.0, 16.0, 32.0, 64.0], dtype='float32'),
+    })
+    return {
+        'parsed_data': {'total_vms': 5, 'total_hosts': 2, 'vm_inventory': vms},
+        'current_tco': {'total': 1000.0 + version},
+        'scenario_results': {'VCF': {'fit': {'fit_score': 80}, 'total': 900.0}},
+        'assumptions': {'discount_rate': 0.08, 'years': 3, 'note': f"version {version}",
+                        'hosts': {f"h{i}": {'cores': 32, 'ram': 512 + (i == version % 50) * 256}
+                                  for i in range(50)}},
+        'quotes': None,
+    }
+
+
+def blob_count():
+    with closing(sessions._connect()) as conn:
+        return conn.execute("SELECT COUNT(*) FROM session_blobs").fetchone()[0]
+
+
+@pytest.mark.parametrize('backend', ['sqlite', 'json'])
+def test_save_load_round_trip(backend):
+    data = session_data()
+    session_id = sessions.save_session('Acme Corp', data, backend=backend)
+    assert session_id.endswith('.json') == (backend == 'json')
+
+    loaded = sessions.load_session(session_id)
+    assert loaded['customer_name'] == 'Acme Corp'
+    assert loaded['assumptions'] == data['assumptions']
+    assert loaded['current_tco'] == data['current_tco']
+    assert loaded['quotes'] is None
+    pd.testing.assert_frame_equal(loaded['parsed_data']['vm_inventory'], data['parsed_data']['vm_inventory'])
+    assert loaded['parsed_data']['total_vms'] == 5
+
+    [row] = sessions.list_sessions()
+    assert row['filename'] == session_id
+    assert row['recommendation'] == 'VCF'
+    assert row['total_vms'] == 5
+
+
+def test_sqlite_sections_load_lazily():
+    session_id = sessions.save_session('Acme', session_data())
+    loaded = sessions.load_session(session_id)
+    assert set(loaded._loaded) == {'customer_name', 'saved_at'}
+    assert loaded['current_tco'] == {'total': 1000.0}
+    assert set(loaded._loaded) == {'customer_name', 'saved_at', 'current_tco'}
+
+    eager = sessions.load_session(session_id, sections=sessions.SECTIONS)
+    assert set(sessions.SECTIONS) <= set(eager._loaded)
+
+
+def test_load_missing_session():
+    assert sessions.load_session('nobody_20240101_000000_000000') is None
+    assert sessions.load_session('nobody.json') is None
+
+
+def test_delta_chain_rebuilds_every_version():
+    versions = 2 * sessions.MAX_DELTA_CHAIN + 5
+    ids = [sessions.save_session('Acme', session_data(v)) for v in range(versions)]
+    with closing(sessions._connect()) as conn:
+        depths = [row[0] for row in conn.execute("SELECT depth FROM session_blobs")]
+    assert max(depths) == sessions.MAX_DELTA_CHAIN
+    for v, session_id in enumerate(ids):
+        assert sessions.load_session(session_id)['assumptions'] == session_data(v)['assumptions']
+    assert [h['filename'] for h in sessions.session_history('acme')] == ids
+
+
+def test_delete_keeps_later_versions_and_collects_garbage():
+    ids = [sessions.save_session('Acme', session_data(v)) for v in range(10)]
+    for session_id in ids[:5]:
+        assert sessions.delete_session(session_id)
+    for v, session_id in enumerate(ids[5:], 5):
+        loaded = sessions.load_session(session_id, sections=sessions.SECTIONS)
+        assert loaded['assumptions'] == session_data(v)['assumptions']
+        assert len(loaded['parsed_data']['vm_inventory']) == 5
+
+    for session_id in ids[5:]:
+        assert sessions.delete_session(session_id)
+    assert not sessions.delete_session(ids[0])
+    assert sessions.list_sessions() == []
+    assert blob_count() == 0
+
+
+def test_delete_json_session_removes_sidecars(sessions_dir):
+    session_id = sessions.save_session('Acme', session_data(), backend='json')
+    assert any(p.suffix == '.parquet' for p in sessions_dir.iterdir())
+    assert sessions.delete_session(session_id)
+    assert not any(p.suffix in ('.json', '.parquet') for p in sessions_dir.iterdir())
+    assert sessions.load_session(session_id) is None
+
+
+@pytest.mark.parametrize('backend', ['sqlite', 'json'])
+def test_same_timestamp_never_overwrites(monkeypatch, backend):
+    class FrozenDatetime(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return cls(2024, 5, 1, 12, 0, 0, 123456)
+
+    monkeypatch.setattr(sessions, 'datetime', FrozenDatetime)
+    ids = [sessions.save_session('Acme', session_data(v), backend=backend) for v in range(3)]
+    assert len(set(ids)) == 3
+    for v, session_id in enumerate(ids):
+        assert sessions.load_session(session_id)['current_tco'] == {'total': 1000.0 + v}
+    assert [h['filename'] for h in sessions.session_history('Acme')] == ids
+
+    monkeypatch.setattr(sessions, 'MAX_ID_ATTEMPTS', 3)
+    with pytest.raises(FileExistsError):
+        sessions.save_session('Acme', session_data(), backend=backend)
+
+
+def test_restore_version_saves_a_new_latest():
+    first = sessions.save_session('Acme', session_data(0))
+    sessions.save_session('Acme', session_data(1))
+    restored = sessions.restore_version(first)
+    history = sessions.session_history('Acme')
+    assert history[-1]['filename'] == restored
+    assert len(history) == 3
+    assert sessions.load_session(restored)['assumptions'] == session_data(0)['assumptions']